@@ -1,49 +1,306 @@
 import requests
 import json
 import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
 from datetime import datetime
+from functools import lru_cache
+
+from provider_client import ProviderClient
 
 # ----------------- API Configuration -----------------
-OLLAMA_URL = "http://localhost:11434/api/generate"
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434/api/generate")
 OLLAMA_MODEL = "phi3:mini"
 
-CLAUDE_URL = "https://api.anthropic.com/v1/messages"
+CLAUDE_URL = os.getenv("CLAUDE_URL", "https://api.anthropic.com/v1/messages")
 CLAUDE_MODEL = "claude-sonnet-4-20250514"
 CLAUDE_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
 
-HISTORY_FILE = "chat_history.json"
-SAVED_CONVOS_FILE = "saved_conversations.json"
+# One keep-alive connection pool per endpoint, with timeouts and retries
+# (connect, read) seconds: read is the longest wait for the next streamed chunk,
+# so a local model that is still loading gets longer than the API
+OLLAMA_TIMEOUT = (3, 300)
+CLAUDE_TIMEOUT = (10, 120)
+MAX_RETRIES = 3
+
+OLLAMA_CLIENT = ProviderClient("Ollama", connect_timeout=OLLAMA_TIMEOUT[0],
+                               read_timeout=OLLAMA_TIMEOUT[1], max_retries=MAX_RETRIES)
+CLAUDE_CLIENT = ProviderClient("Claude", headers={"anthropic-version": "2023-06-01",
+                                                  "content-type": "application/json"},
+                               connect_timeout=CLAUDE_TIMEOUT[0],
+                               read_timeout=CLAUDE_TIMEOUT[1], max_retries=MAX_RETRIES)
 
-MAX_HISTORY_LENGTH = 20
+HISTORY_FILE = "chat_history.jsonl"      # append-only log, one JSON record per line
+LEGACY_HISTORY_FILE = "chat_history.json"  # old format, migrated on first load
+SAVED_CONVOS_DB = "saved_conversations.db"
+SAVED_CONVOS_FILE = "saved_conversations.json"  # old format, migrated once into the database
+LIST_PAGE_SIZE = 10
+
+# Token budget: system message + history + new message sent to the model
+MAX_PROMPT_TOKENS = int(os.getenv("MAX_PROMPT_TOKENS", "3000"))
+SUMMARY_TRIGGER = 0.75  # start a background summary at this share of the budget
 KEEP_RECENT_MESSAGES = 5
 
+# Rewrite the history log once this many records no longer describe live messages
+HISTORY_COMPACT_THRESHOLD = 1000
+HISTORY_FSYNC = True  # fsync every record, so a finished turn survives a crash
+
 CURRENT_PROVIDER = "ollama"
 
+# Send Ollama the `context` it returned last turn (the conversation it has already
+# evaluated) plus the new message, instead of the whole transcript every turn
+OLLAMA_REUSE_CONTEXT = True
+
+# ----------------- Token Counting -----------------
+# Tokens are counted with tiktoken's cl100k_base encoding - an estimate for
+# phi3 and Claude, which is all a budget needs - or 4 characters per token
+# when tiktoken or its encoding file is unavailable. Counts are cached per
+# text, and history_tokens is kept up to date as records are replayed, so
+# checking the budget never re-tokenizes the history.
+
+@lru_cache(maxsize=1)
+def get_tokenizer():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        print("ℹ️  tiktoken unavailable - estimating 4 characters per token")
+        return None
+
+@lru_cache(maxsize=4096)
+def count_tokens(text):
+    tokenizer = get_tokenizer()
+    if tokenizer is None:
+        return (len(text) + 3) // 4
+    return len(tokenizer.encode(text, disallowed_special=()))
+
+def message_tokens(message):
+    """Tokens one history message adds to a prompt ("User: ...\nAI: ...\n")."""
+    return count_tokens(message.get("user", "")) + count_tokens(message.get("assistant", "")) + 4
+
+history_tokens = 0  # running total of message_tokens over the live history
+
 # ----------------- Load or Create History -----------------
+# The history is an append-only JSON-lines log instead of a JSON file that is
+# rewritten every turn. Records:
+#   {"op": "turn", "message": {...}}                 a message was appended
+#   {"op": "summary", "keep": N, "message": {...}}   all but the last N messages
+#                                                    were replaced by the summary
+#   {"op": "clear"}                                  the history was cleared
+# Replaying the records in order rebuilds the in-memory history list.
+
+_dead_records = 0  # records in the log that no longer describe live messages
+
+def _replay(history, record):
+    """Apply one log record to the history list (in place)."""
+    global _dead_records, history_tokens
+    op = record.get("op")
+    if op == "turn":
+        history.append(record["message"])
+        history_tokens += message_tokens(record["message"])
+    elif op == "summary":
+        keep = record["keep"]
+        _dead_records += len(history) - keep + 1
+        history[:] = [record["message"]] + history[len(history) - keep:]
+        history_tokens = sum(message_tokens(m) for m in history)  # cached counts
+    elif op == "clear":
+        _dead_records += len(history) + 1
+        history.clear()
+        history_tokens = 0
+
 def load_history():
-    if os.path.exists(HISTORY_FILE):
-        with open(HISTORY_FILE, "r") as f:
-            return json.load(f)
-    return []
+    global _dead_records, history_tokens
+    _dead_records = 0
+    history_tokens = 0
+    history = []
+    
+    if not os.path.exists(HISTORY_FILE):
+        if os.path.exists(LEGACY_HISTORY_FILE):
+            with open(LEGACY_HISTORY_FILE, "r") as f:
+                history = json.load(f)
+            history_tokens = sum(message_tokens(m) for m in history)
+            save_history(history)
+            print(f"✅ Moved {len(history)} messages from {LEGACY_HISTORY_FILE} to {HISTORY_FILE}")
+        return history
+    
+    with open(HISTORY_FILE, "rb") as f:
+        data = f.read()
+    
+    valid_end = 0
+    for line in data.splitlines(keepends=True):
+        try:
+            if not line.endswith(b"\n"):
+                raise ValueError("unterminated record")
+            record = json.loads(line)
+        except ValueError:
+            # A write cut short by a crash - drop it so new records start on a clean line
+            print(f"⚠️  Ignoring a damaged record at the end of {HISTORY_FILE}")
+            with open(HISTORY_FILE, "r+b") as f:
+                f.truncate(valid_end)
+            break
+        _replay(history, record)
+        valid_end += len(line)
+    
+    if _dead_records > HISTORY_COMPACT_THRESHOLD:
+        save_history(history)
+    return history
 
 def save_history(history):
-    with open(HISTORY_FILE, "w") as f:
-        json.dump(history, f, indent=4)
+    """Compact the log: rewrite it as one record per live message (atomic replace)."""
+    global _dead_records, history_tokens
+    history_tokens = sum(message_tokens(m) for m in history)
+    temp_file = HISTORY_FILE + ".tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        f.write("".join(json.dumps({"op": "turn", "message": m}) + "\n" for m in history))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_file, HISTORY_FILE)
+    _dead_records = 0
 
-def clear_history():
-    if os.path.exists(HISTORY_FILE):
-        os.remove(HISTORY_FILE)
+def log_history(history, record):
+    """Apply a record to the history and append it to the log (one line, fsynced)."""
+    _replay(history, record)
+    with open(HISTORY_FILE, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+        f.flush()
+        if HISTORY_FSYNC:
+            os.fsync(f.fileno())
+    
+    if _dead_records > HISTORY_COMPACT_THRESHOLD:
+        save_history(history)
+
+def append_turn(history, message):
+    """Add one message to the history - costs one appended line, not a rewrite."""
+    log_history(history, {"op": "turn", "message": message})
+
+def clear_history(history):
+    if history:
+        log_history(history, {"op": "clear"})
         print("✅ Conversation history cleared!")
     else:
         print("ℹ️  No history to clear.")
-    return []
+    return history
 
 # ----------------- Save Conversations -----------------
-def load_saved_conversations():
-    if os.path.exists(SAVED_CONVOS_FILE):
+# Saved conversations live in SQLite: a conversations table, one row per
+# message, and an FTS5 index over the message text for /search. Saving one
+# conversation, listing a page or viewing one conversation only touches
+# those rows, however large the archive is.
+_conversation_store = None
+
+def get_conversation_store():
+    """Open (once) the saved-conversations database, migrating the old JSON file."""
+    global _conversation_store
+    if _conversation_store is not None:
+        return _conversation_store
+    
+    db = sqlite3.connect(SAVED_CONVOS_DB)
+    db.row_factory = sqlite3.Row
+    db.executescript("""
+        CREATE TABLE IF NOT EXISTS conversations (
+            id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            saved_at TEXT NOT NULL,
+            provider TEXT,
+            message_count INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS messages (
+            id INTEGER PRIMARY KEY,
+            conversation_id INTEGER NOT NULL REFERENCES conversations(id),
+            position INTEGER NOT NULL,
+            user TEXT,
+            assistant TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS messages_by_conversation
+            ON messages(conversation_id, position);
+        CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+            user, assistant, content='messages', content_rowid='id'
+        );
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+    """)
+    _conversation_store = db
+    
+    migrated = db.execute("SELECT value FROM meta WHERE key = 'migrated_json'").fetchone()
+    if migrated is None and os.path.exists(SAVED_CONVOS_FILE):
         with open(SAVED_CONVOS_FILE, "r") as f:
-            return json.load(f)
-    return []
+            saved = json.load(f)
+        with db:
+            for convo in saved:
+                _insert_conversation(db, convo['messages'], convo['title'],
+                                     convo.get('provider', 'unknown'), convo['saved_at'])
+            db.execute("INSERT INTO meta VALUES ('migrated_json', ?)", (str(datetime.now()),))
+        print(f"✅ Moved {len(saved)} saved conversations from {SAVED_CONVOS_FILE} to {SAVED_CONVOS_DB}")
+    return db
+
+def _insert_conversation(db, messages, title, provider, saved_at):
+    cursor = db.execute(
+        "INSERT INTO conversations (title, saved_at, provider, message_count) VALUES (?, ?, ?, ?)",
+        (title, saved_at, provider, len(messages))
+    )
+    convo_id = cursor.lastrowid
+    for position, msg in enumerate(messages):
+        row = db.execute(
+            "INSERT INTO messages (conversation_id, position, user, assistant, data) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (convo_id, position, msg.get('user', ''), msg.get('assistant', ''), json.dumps(msg))
+        )
+        db.execute("INSERT INTO messages_fts (rowid, user, assistant) VALUES (?, ?, ?)",
+                   (row.lastrowid, msg.get('user', ''), msg.get('assistant', '')))
+    return convo_id
+
+def store_conversation(messages, title, provider):
+    """Save a conversation in one transaction; returns its number."""
+    db = get_conversation_store()
+    with db:
+        return _insert_conversation(db, messages, title, provider, str(datetime.now()))
+
+def count_saved_conversations():
+    return get_conversation_store().execute("SELECT COUNT(*) FROM conversations").fetchone()[0]
+
+def list_conversations(page=1, page_size=LIST_PAGE_SIZE):
+    """One page of saved conversations (oldest first), without their messages."""
+    return get_conversation_store().execute(
+        "SELECT id, title, saved_at, provider, message_count FROM conversations "
+        "ORDER BY id LIMIT ? OFFSET ?",
+        (page_size, (page - 1) * page_size)
+    ).fetchall()
+
+def get_conversation(convo_id):
+    """A saved conversation with its messages, or None."""
+    db = get_conversation_store()
+    convo = db.execute("SELECT * FROM conversations WHERE id = ?", (convo_id,)).fetchone()
+    if convo is None:
+        return None
+    rows = db.execute("SELECT data FROM messages WHERE conversation_id = ? ORDER BY position",
+                      (convo_id,))
+    return {**dict(convo), 'messages': [json.loads(row['data']) for row in rows]}
+
+def search_conversations(terms, limit=10):
+    """
+    Saved conversations matching every term, best first (FTS5 bm25), with
+    the best matching message of each as a snippet.
+    """
+    words = re.findall(r"\w+", terms)
+    if not words:
+        return []
+    query = " ".join('"' + word + '"' for word in words)
+    return get_conversation_store().execute("""
+        WITH hit AS MATERIALIZED (
+            SELECT rowid, rank, snippet(messages_fts, -1, '[', ']', '...', 12) AS snippet
+            FROM messages_fts WHERE messages_fts MATCH ?
+        )
+        SELECT m.conversation_id AS id, c.title, c.saved_at, MIN(hit.rank) AS rank, hit.snippet
+        FROM hit
+        JOIN messages m ON m.id = hit.rowid
+        JOIN conversations c ON c.id = m.conversation_id
+        GROUP BY m.conversation_id
+        ORDER BY rank
+        LIMIT ?
+    """, (query, limit)).fetchall()
 
 def save_conversation(history, title=None):
     if not history:
@@ -55,54 +312,49 @@ def save_conversation(history, title=None):
         if not title:
             title = f"Conversation {datetime.now().strftime('%Y-%m-%d %H:%M')}"
     
-    saved = load_saved_conversations()
-    saved.append({
-        "title": title,
-        "saved_at": str(datetime.now()),
-        "messages": history.copy(),
-        "provider": CURRENT_PROVIDER
-    })
-    
-    with open(SAVED_CONVOS_FILE, "w") as f:
-        json.dump(saved, f, indent=4)
-    
-    print(f"✅ Conversation saved as: '{title}'")
+    convo_id = store_conversation(history, title, CURRENT_PROVIDER)
+    print(f"✅ Conversation saved as: '{title}' (#{convo_id})")
 
-def list_saved_conversations():
-    saved = load_saved_conversations()
+def list_saved_conversations(page=1):
+    total = count_saved_conversations()
     
-    if not saved:
+    if not total:
         print("📭 No saved conversations yet.")
         return
     
+    pages = (total + LIST_PAGE_SIZE - 1) // LIST_PAGE_SIZE
+    page = min(max(page, 1), pages)
+    
     print(f"\n{'='*60}")
-    print(f"📚 Saved Conversations ({len(saved)} total)")
+    print(f"📚 Saved Conversations ({total} total, page {page}/{pages})")
     print(f"{'='*60}")
     
-    for i, convo in enumerate(saved, 1):
-        provider = convo.get('provider', 'unknown')
-        print(f"{i}. {convo['title']} [{provider}]")
+    for convo in list_conversations(page):
+        provider = convo['provider'] or 'unknown'
+        print(f"{convo['id']}. {convo['title']} [{provider}]")
         print(f"   Saved: {convo['saved_at']}")
-        print(f"   Messages: {len(convo['messages'])}")
+        print(f"   Messages: {convo['message_count']}")
         print()
+    
+    if page < pages:
+        print(f"ℹ️  Type /list {page + 1} for the next page")
 
-def view_saved_conversation():
+def view_saved_conversation(choice=None):
     """View a specific saved conversation"""
-    saved = load_saved_conversations()
-    
-    if not saved:
+    if not count_saved_conversations():
         print("📭 No saved conversations to view.")
         return
     
-    list_saved_conversations()
-    
     try:
-        choice = int(input("Enter conversation number to view (0 to cancel): "))
+        if choice is None:
+            list_saved_conversations()
+            choice = input("Enter conversation number to view (0 to cancel): ")
+        choice = int(choice)
         if choice == 0:
             return
         
-        if 1 <= choice <= len(saved):
-            convo = saved[choice - 1]
+        convo = get_conversation(choice)
+        if convo is not None:
             print(f"\n{'='*60}")
             print(f"📖 {convo['title']}")
             print(f"{'='*60}\n")
@@ -116,10 +368,24 @@ def view_saved_conversation():
     except ValueError:
         print("❌ Invalid input.")
 
+def search_saved_conversations(terms):
+    """Print the saved conversations that best match the search terms."""
+    start = time.perf_counter()
+    matches = search_conversations(terms)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    if not matches:
+        print(f"🔍 No saved conversations match '{terms}'")
+        return
+    
+    print(f"\n🔍 {len(matches)} conversations match '{terms}' ({elapsed_ms:.1f} ms)")
+    for convo in matches:
+        print(f"{convo['id']}. {convo['title']}  ({convo['saved_at']})")
+        print(f"   {convo['snippet']}")
+    print("ℹ️  Type /view <number> to open one")
+
 # ----------------- Summarization -----------------
 def generate_summary(messages, system_msg):
-    print("\n🔄 Generating summary...")
-    
     convo_text = ""
     for msg in messages:
         convo_text += f"User: {msg['user']}\nAI: {msg['assistant']}\n\n"
@@ -137,8 +403,8 @@ Summary:"""
             "stream": False
         }
         try:
-            response = requests.post(OLLAMA_URL, json=payload)
-            data = response.json()
+            with OLLAMA_CLIENT.post(OLLAMA_URL, json=payload) as response:
+                data = response.json()
             return data.get("response", "Summary unavailable")
         except Exception as e:
             return f"Summary unavailable: {e}"
@@ -148,48 +414,141 @@ Summary:"""
             return "Summary unavailable (no API key)"
         
         try:
-            response = requests.post(
+            with CLAUDE_CLIENT.post(
                 CLAUDE_URL,
-                headers={
-                    "x-api-key": CLAUDE_API_KEY,
-                    "anthropic-version": "2023-06-01",
-                    "content-type": "application/json"
-                },
+                headers={"x-api-key": CLAUDE_API_KEY},
                 json={
                     "model": CLAUDE_MODEL,
                     "max_tokens": 500,
                     "messages": [{"role": "user", "content": summary_prompt}]
                 }
-            )
-            data = response.json()
+            ) as response:
+                data = response.json()
             return data["content"][0]["text"]
         except Exception as e:
             return f"Summary unavailable: {e}"
 
-def should_summarize(history):
-    return len(history) > MAX_HISTORY_LENGTH
+# Summaries are computed on a background thread from a snapshot of the older
+# messages, while the chat goes on. When one is ready it is swapped in at the
+# next turn boundary as one summary record - unless the history was cleared or
+# summarized in the meantime, in which case it is dropped. Until then,
+# ask_ai sends only the most recent messages that fit MAX_PROMPT_TOKENS.
+_summary_job = None  # {"future", "messages", "started"} of the running summary
 
-def summarize_history(history, system_msg):
-    if not should_summarize(history):
-        return history
-    
-    print(f"\n⚠️  History: {len(history)} messages (max: {MAX_HISTORY_LENGTH})")
+def prompt_tokens(system_msg, history_total=None):
+    """Tokens of the system message plus the history (running total by default)."""
+    return count_tokens(system_msg) + (history_tokens if history_total is None else history_total)
+
+def _messages_to_summarize(history):
+    """All but the recent messages: at most KEEP_RECENT_MESSAGES, within half the budget."""
+    keep, kept_tokens = 0, 0
+    for m in reversed(history[1:]):
+        kept_tokens += message_tokens(m)
+        if keep == KEEP_RECENT_MESSAGES or (keep and kept_tokens > MAX_PROMPT_TOKENS // 2):
+            break
+        keep += 1
+    old_messages = history[:len(history) - keep]
+    # A lone earlier summary has nothing left to compress
+    if len(old_messages) == 1 and old_messages[0].get("user") == "[Summary]":
+        return []
+    return old_messages
+
+def should_summarize(history, system_msg):
+    return (prompt_tokens(system_msg) > SUMMARY_TRIGGER * MAX_PROMPT_TOKENS
+            and bool(_messages_to_summarize(history)))
+
+def summarize_history(history, system_msg, wait=False):
+    """
+    Start summarizing all but the recent messages on a background thread.
+    
+    Args:
+        history: The live history list
+        system_msg: Current persona
+        wait: Block until the summary is swapped in (benchmarks)
+    
+    Returns:
+        True if a summary was started (False if one is already running)
+    """
+    global _summary_job
+    old_messages = _messages_to_summarize(history)
+    if _summary_job is not None or not old_messages:
+        return False
+    
+    future = Future()
+    
+    def work():
+        try:
+            future.set_result(generate_summary(old_messages, system_msg))
+        except Exception as e:
+            future.set_exception(e)
     
-    old_messages = history[:-KEEP_RECENT_MESSAGES]
-    recent_messages = history[-KEEP_RECENT_MESSAGES:]
+    _summary_job = {"future": future, "messages": old_messages, "started": time.perf_counter()}
+    # Daemon thread: exiting the chat never waits for a summary
+    threading.Thread(target=work, name="history-summary", daemon=True).start()
+    print(f"🔄 Summarizing {len(old_messages)} older messages in the background "
+          f"(history: {prompt_tokens(system_msg):,} of {MAX_PROMPT_TOKENS:,} tokens)")
     
-    summary = generate_summary(old_messages, system_msg)
+    if wait:
+        apply_summary(history, wait=True)
+    return True
+
+def apply_summary(history, wait=False):
+    """
+    Swap a finished background summary into the history (one log record).
+    
+    Returns:
+        True if the history was compressed
+    """
+    global _summary_job
+    job = _summary_job
+    if job is None or not (wait or job["future"].done()):
+        return False
+    _summary_job = None
     
-    new_history = [
-        {
-            "user": "[Summary]",
-            "assistant": summary,
-            "time": str(datetime.now())
-        }
-    ] + recent_messages
+    try:
+        summary = job["future"].result()
+    except Exception as e:
+        summary = f"Summary unavailable: {e}"
+    if summary.startswith("Summary unavailable"):
+        print(f"⚠️  {summary}")
+        return False
+    
+    # The summarized messages must still be the start of the history
+    old_messages = job["messages"]
+    if len(history) < len(old_messages) or any(
+            a is not b for a, b in zip(history, old_messages)):
+        return False
+    
+    old_length, old_tokens = len(history), history_tokens
+    summary_message = {
+        "user": "[Summary]",
+        "assistant": summary,
+        "time": str(datetime.now())
+    }
+    log_history(history, {"op": "summary", "keep": len(history) - len(old_messages),
+                          "message": summary_message})
+    reset_ollama_context()  # the summary is new text Ollama has not seen
+    
+    print(f"✅ Compressed: {old_length} → {len(history)} messages, "
+          f"{old_tokens:,} → {history_tokens:,} tokens "
+          f"(summary took {time.perf_counter() - job['started']:.1f}s in the background)")
+    return True
+
+def fit_history(prompt, system_msg, history):
+    """The most recent messages that keep the prompt under MAX_PROMPT_TOKENS."""
+    budget = MAX_PROMPT_TOKENS - count_tokens(system_msg) - count_tokens(prompt)
+    if history_tokens <= budget:
+        return history
     
-    print(f"✅ Compressed: {len(history)} → {len(new_history)} messages\n")
-    return new_history
+    fitted = 0
+    for m in reversed(history):
+        budget -= message_tokens(m)
+        if budget < 0:
+            break
+        fitted += 1
+    print(f"✂️  Sending the last {fitted} of {len(history)} messages "
+          f"to stay under {MAX_PROMPT_TOKENS:,} tokens")
+    return history[len(history) - fitted:]
 
 # ----------------- Personas -----------------
 PERSONAS = {
@@ -229,32 +588,102 @@ def choose_persona():
     return PERSONAS["assistant"]
 
 # ----------------- AI Providers -----------------
+# Ollama's /api/generate returns `context`: the tokens of the prompt and reply
+# it just evaluated. Sending it back with only the new message continues the
+# conversation without re-processing the transcript. It is only valid for the
+# exact history it was built from - the same model and persona, and the turn
+# it produced as the last message - so anything else (a summary, /clear, a new
+# persona, a Claude turn) falls back to sending the full transcript once.
+_ollama_context = {}
+ollama_metrics = {"turns": 0, "reused": 0, "prompt_tokens": 0, "ttft_ms": 0.0, "last": None}
+
+def reset_ollama_context():
+    _ollama_context.clear()
+
+def _reusable_ollama_context(prompt, system_msg, history):
+    if not OLLAMA_REUSE_CONTEXT or not _ollama_context or not history:
+        return None
+    last = history[-1]
+    if (len(_ollama_context["context"]) + count_tokens(prompt) > MAX_PROMPT_TOKENS
+            or _ollama_context["model"] != OLLAMA_MODEL
+            or _ollama_context["system"] != system_msg
+            or _ollama_context["turns"] != len(history)
+            or _ollama_context["last_turn"] != (last.get("user"), last.get("assistant"))):
+        return None
+    return _ollama_context["context"]
+
 def ask_ollama(prompt, system_msg, history):
-    messages_text = system_msg + "\n\n"
-    
-    for m in history:
-        messages_text += f"User: {m['user']}\n AI: {m['assistant']}\n"
-    
-    messages_text += f"User: {prompt}\nAI:"
+    context = _reusable_ollama_context(prompt, system_msg, history)
     
-    payload = {
-        "model": OLLAMA_MODEL,
-        "prompt": messages_text,
-        "stream": True
-    }
-    
-    response = requests.post(OLLAMA_URL, json=payload, stream=True)
+    if context is not None:
+        payload = {
+            "model": OLLAMA_MODEL,
+            "prompt": prompt,
+            "context": context,
+            "stream": True
+        }
+    else:
+        messages_text = system_msg + "\n\n"
+        
+        for m in history:
+            messages_text += f"User: {m['user']}\n AI: {m['assistant']}\n"
+        
+        messages_text += f"User: {prompt}\nAI:"
+        
+        payload = {
+            "model": OLLAMA_MODEL,
+            "prompt": messages_text,
+            "stream": True
+        }
+    reset_ollama_context()
     
     full_reply = ""
-    for line in response.iter_lines():
-        if not line:
-            continue
-        data = json.loads(line.decode("utf-8"))
-        chunk = data.get("response", "")
-        print(chunk, end="", flush=True)
-        full_reply += chunk
+    final = {}
+    start = time.perf_counter()
+    ttft_ms = None
+    try:
+        with OLLAMA_CLIENT.post(OLLAMA_URL, json=payload, stream=True) as response:
+            if response.status_code != 200:
+                print(f"❌ Ollama error: HTTP {response.status_code} {response.text[:200]}")
+                return f"Error: HTTP {response.status_code}"
+            
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line.decode("utf-8"))
+                chunk = data.get("response", "")
+                if chunk and ttft_ms is None:
+                    ttft_ms = (time.perf_counter() - start) * 1000
+                print(chunk, end="", flush=True)
+                full_reply += chunk
+                if data.get("done"):
+                    final = data
+    
+    except requests.RequestException as e:
+        print(f"\n❌ Error: {e}")
+        return full_reply or f"Error: {e}"
     
     print()
+    
+    if final.get("context") and OLLAMA_REUSE_CONTEXT:
+        _ollama_context.update({
+            "context": final["context"],
+            "model": OLLAMA_MODEL,
+            "system": system_msg,
+            "turns": len(history) + 1,  # once the caller appends this turn
+            "last_turn": (prompt, full_reply)
+        })
+    
+    last = {
+        "reused_context": context is not None,
+        "prompt_tokens": final.get("prompt_eval_count", 0),
+        "ttft_ms": ttft_ms or 0.0
+    }
+    ollama_metrics["turns"] += 1
+    ollama_metrics["reused"] += last["reused_context"]
+    ollama_metrics["prompt_tokens"] += last["prompt_tokens"]
+    ollama_metrics["ttft_ms"] += last["ttft_ms"]
+    ollama_metrics["last"] = last
     return full_reply
 
 def ask_claude(prompt, system_msg, history):
@@ -278,39 +707,38 @@ def ask_claude(prompt, system_msg, history):
     }
     
     try:
-        response = requests.post(
+        full_reply = ""
+        with CLAUDE_CLIENT.post(
             CLAUDE_URL,
-            headers={
-                "x-api-key": CLAUDE_API_KEY,
-                "anthropic-version": "2023-06-01",
-                "content-type": "application/json"
-            },
+            headers={"x-api-key": CLAUDE_API_KEY},
             json=payload,
             stream=True
-        )
-        
-        full_reply = ""
-        for line in response.iter_lines():
-            if not line:
-                continue
-            
-            line_text = line.decode("utf-8")
-            if not line_text.startswith("data: "):
-                continue
-            
-            data_str = line_text[6:]
-            
-            if data_str == "[DONE]":
-                break
+        ) as response:
+            if response.status_code != 200:
+                print(f"❌ Claude error: HTTP {response.status_code} {response.text[:200]}")
+                return f"Error: HTTP {response.status_code}"
             
-            try:
-                data = json.loads(data_str)
-                if data.get("type") == "content_block_delta":
-                    chunk = data.get("delta", {}).get("text", "")
-                    print(chunk, end="", flush=True)
-                    full_reply += chunk
-            except json.JSONDecodeError:
-                continue
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                
+                line_text = line.decode("utf-8")
+                if not line_text.startswith("data: "):
+                    continue
+                
+                data_str = line_text[6:]
+                
+                if data_str == "[DONE]":
+                    break
+                
+                try:
+                    data = json.loads(data_str)
+                    if data.get("type") == "content_block_delta":
+                        chunk = data.get("delta", {}).get("text", "")
+                        print(chunk, end="", flush=True)
+                        full_reply += chunk
+                except json.JSONDecodeError:
+                    continue
         
         print()
         return full_reply
@@ -320,6 +748,7 @@ def ask_claude(prompt, system_msg, history):
         return f"Error: {e}"
 
 def ask_ai(prompt, system_msg, history):
+    history = fit_history(prompt, system_msg, history)
     if CURRENT_PROVIDER == "ollama":
         return ask_ollama(prompt, system_msg, history)
     elif CURRENT_PROVIDER == "claude":
@@ -357,9 +786,10 @@ def show_help():
     print("  /help      - Show this help menu")
     print("  /clear     - Clear conversation history")
     print("  /save      - Save current conversation")
-    print("  /list      - List all saved conversations")
-    print("  /view      - View a saved conversation")
-    print("  /summarize - Summarize conversation now")
+    print("  /list [n]  - List saved conversations (page n)")
+    print("  /view [n]  - View a saved conversation")
+    print("  /search    - Search saved conversations: /search <terms>")
+    print("  /summarize - Summarize conversation now (in the background)")
     print("  /stats     - Show conversation statistics")
     print("\n⚙️  SETTINGS:")
     print("  /persona   - Change AI persona")
@@ -383,6 +813,7 @@ def show_stats(history):
     
     total_chars = sum(len(m.get('user', '')) + len(m.get('assistant', '')) for m in history)
     print(f"Total characters: {total_chars:,}")
+    print(f"Estimated tokens: {history_tokens:,} (budget {MAX_PROMPT_TOKENS:,})")
     print(f"Average message length: {total_chars // max(len(history), 1)} chars")
     
     if history:
@@ -400,18 +831,34 @@ def show_config():
     print("="*60)
     print(f"Provider: {CURRENT_PROVIDER}")
     print(f"Model: {OLLAMA_MODEL if CURRENT_PROVIDER == 'ollama' else CLAUDE_MODEL}")
-    print(f"Max history: {MAX_HISTORY_LENGTH} messages")
-    print(f"Keep recent: {KEEP_RECENT_MESSAGES} messages")
+    print(f"Prompt budget: {MAX_PROMPT_TOKENS:,} tokens "
+          f"(summarize in the background at {SUMMARY_TRIGGER:.0%})")
+    print(f"Keep recent: up to {KEEP_RECENT_MESSAGES} messages")
     print(f"History file: {HISTORY_FILE}")
-    print(f"Saved conversations: {SAVED_CONVOS_FILE}")
-    
-    saved = load_saved_conversations()
-    print(f"Total saved: {len(saved)} conversations")
+    print(f"Saved conversations: {SAVED_CONVOS_DB}")
+    print(f"Total saved: {count_saved_conversations()} conversations")
     
     if CURRENT_PROVIDER == "claude":
         api_status = "✅ Set" if CLAUDE_API_KEY else "❌ Not set"
         print(f"Claude API key: {api_status}")
     
+    if ollama_metrics["turns"]:
+        turns = ollama_metrics["turns"]
+        print(f"Ollama context reuse: {'on' if OLLAMA_REUSE_CONTEXT else 'off'} "
+              f"({ollama_metrics['reused']}/{turns} turns reused it)")
+        print(f"Ollama input tokens: {ollama_metrics['prompt_tokens'] / turns:.0f} per turn, "
+              f"last turn {ollama_metrics['last']['prompt_tokens']}")
+        print(f"Ollama time to first token: {ollama_metrics['ttft_ms'] / turns:.0f} ms average, "
+              f"last turn {ollama_metrics['last']['ttft_ms']:.0f} ms")
+    
+    for client in (OLLAMA_CLIENT, CLAUDE_CLIENT):
+        stats = client.stats()
+        if stats['requests']:
+            print(f"{client.name} HTTP: {stats['requests']} requests, "
+                  f"{stats['connections_opened']} connections opened, "
+                  f"{stats['connections_reused']} reused, {stats['retries']} retries, "
+                  f"{stats['errors']} failed")
+    
     print("="*60 + "\n")
 
 # ----------------- Main Loop with Menu -----------------
@@ -448,7 +895,7 @@ def main():
         
         # Clear history
         if user_msg.lower() == "/clear":
-            history = clear_history()
+            history = clear_history(history)
             continue
         
         # Save conversation
@@ -456,22 +903,31 @@ def main():
             save_conversation(history)
             continue
         
-        # List saved conversations
-        if user_msg.lower() == "/list":
-            list_saved_conversations()
+        # List saved conversations (one page)
+        if user_msg.lower() == "/list" or user_msg.lower().startswith("/list "):
+            page = user_msg[5:].strip()
+            list_saved_conversations(int(page) if page.isdigit() else 1)
             continue
         
         # View saved conversation
-        if user_msg.lower() == "/view":
-            view_saved_conversation()
+        if user_msg.lower() == "/view" or user_msg.lower().startswith("/view "):
+            view_saved_conversation(user_msg[5:].strip() or None)
+            continue
+        
+        # Search saved conversations
+        if user_msg.lower().startswith("/search"):
+            terms = user_msg[7:].strip()
+            if terms:
+                search_saved_conversations(terms)
+            else:
+                print("ℹ️  Usage: /search <terms>")
             continue
         
         # Force summarization
         if user_msg.lower() == "/summarize":
-            if len(history) > KEEP_RECENT_MESSAGES:
-                history = summarize_history(history, system_msg)
-                save_history(history)
-            else:
+            if _summary_job is not None:
+                print("ℹ️  A summary is already being generated.")
+            elif not summarize_history(history, system_msg):
                 print("ℹ️  Not enough messages to summarize.")
             continue
         
@@ -483,6 +939,7 @@ def main():
         # Change persona
         if user_msg.lower() == "/persona":
             system_msg = choose_persona()
+            reset_ollama_context()
             continue
         
         # Switch provider
@@ -496,20 +953,20 @@ def main():
             continue
         
         # Regular chat message
+        apply_summary(history)  # swap in a summary that finished meanwhile
         reply = ask_ai(user_msg, system_msg, history)
         
-        history.append({
+        append_turn(history, {
             "user": user_msg,
             "assistant": reply,
             "time": str(datetime.now()),
             "provider": CURRENT_PROVIDER
         })
         
-        # Auto-summarize if needed
-        if should_summarize(history):
-            history = summarize_history(history, system_msg)
-        
-        save_history(history)
+        # Summarize in the background once the history nears the token budget
+        apply_summary(history)
+        if should_summarize(history, system_msg):
+            summarize_history(history, system_msg)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
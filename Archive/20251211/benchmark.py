@@ -0,0 +1,501 @@
+"""
+Benchmarks for ChatBot_V2.
+Runs offline - no Ollama or Anthropic calls are made.
+
+Usage:
+    python benchmark.py history [--turns 10 1000 100000] [--saves 50]
+    python benchmark.py conversations [--count 5000] [--messages 20]
+    python benchmark.py connections [--turns 30] [--handshake-ms 60]
+    python benchmark.py context [--turns 40] [--prompt-ms-per-token 1.0]
+    python benchmark.py summary [--turns 60] [--budget 3000] [--think-ms 300]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List
+
+import requests
+
+import ChatBot_V2 as chatbot
+from provider_client import ProviderClient
+from stand_in_server import StandInServer
+
+
+def make_turns(n_turns: int) -> List[Dict]:
+    """Synthetic conversation turns of realistic length."""
+    return [
+        {
+            "user": f"Question {i}: can you explain how attention works in transformer models?",
+            "assistant": f"Answer {i}: " + "Attention lets every token weigh every other token. " * 6,
+            "time": str(datetime.now()),
+            "provider": "ollama"
+        }
+        for i in range(n_turns)
+    ]
+
+
+def legacy_save_history(history: List[Dict], path: str):
+    """What save_history did before the JSON-lines log: rewrite the whole file."""
+    with open(path, "w") as f:
+        json.dump(history, f, indent=4)
+
+
+def bench_history(turn_counts: List[int], saves: int):
+    """Per-turn save latency: full JSON rewrite vs one appended (fsynced) log line."""
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        chatbot.HISTORY_FILE = os.path.join(directory, "chat_history.jsonl")
+        chatbot.LEGACY_HISTORY_FILE = os.path.join(directory, "chat_history.json")
+
+        for n_turns in turn_counts:
+            history = make_turns(n_turns)
+            new_turns = make_turns(saves)
+
+            # Before: every turn appends to the list and rewrites the file
+            legacy_ms = []
+            legacy_history = list(history)
+            for turn in new_turns[:max(1, min(saves, 2_000_000 // max(n_turns, 1)))]:
+                legacy_history.append(turn)
+                start = time.perf_counter()
+                legacy_save_history(legacy_history, chatbot.LEGACY_HISTORY_FILE)
+                legacy_ms.append((time.perf_counter() - start) * 1000)
+            os.remove(chatbot.LEGACY_HISTORY_FILE)
+
+            # After: one appended, fsynced line per turn
+            chatbot.save_history(history)
+            log_history = list(history)
+            log_ms = []
+            for turn in new_turns:
+                start = time.perf_counter()
+                chatbot.append_turn(log_history, turn)
+                log_ms.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            replayed = chatbot.load_history()
+            replay_ms = (time.perf_counter() - start) * 1000
+            assert replayed == history + new_turns, "replayed history differs"
+            rows.append((n_turns, statistics.median(legacy_ms), statistics.median(log_ms),
+                         replay_ms, os.path.getsize(chatbot.HISTORY_FILE) / 1e6))
+
+        # Summaries and /clear are records too; compaction keeps the log bounded
+        chatbot.HISTORY_COMPACT_THRESHOLD = 50
+        chatbot.save_history([])
+        history = chatbot.load_history()
+        expected = []
+        for i, turn in enumerate(make_turns(400)):
+            chatbot.append_turn(history, turn)
+            expected.append(turn)
+            if i % 30 == 29:
+                summary = {"user": "[Summary]", "assistant": f"summary {i}", "time": ""}
+                chatbot.log_history(history, {"op": "summary", "keep": 5, "message": summary})
+                expected = [summary] + expected[-5:]
+            if i == 250:
+                chatbot.clear_history(history)
+                expected = []
+        with open(chatbot.HISTORY_FILE, encoding="utf-8") as f:
+            records = sum(1 for _ in f)
+        assert chatbot.load_history() == history == expected, "replay after summaries differs"
+
+    print(f"\n🔬 History saves: median per turn (fsync {'on' if chatbot.HISTORY_FSYNC else 'off'})")
+    print(f"   {'turns':>9}{'rewrite ms':>12}{'append ms':>11}{'speedup':>9}{'replay ms':>11}{'log MB':>8}")
+    for n_turns, legacy, appended, replay, size_mb in rows:
+        print(f"   {n_turns:>9,}{legacy:>12.2f}{appended:>11.2f}{legacy / appended:>8.1f}x"
+              f"{replay:>11.1f}{size_mb:>8.1f}")
+    print(f"   ✅ replay matches; 400 turns with summaries and a /clear left {records} log records "
+          f"({len(expected)} live messages)")
+
+
+TOPICS = ["python", "transformers", "attention", "gradient", "database", "kubernetes", "recipe",
+          "travel", "budget", "fitness", "guitar", "poetry", "quantum", "history", "tokenizer"]
+
+
+def make_conversations(count: int, n_messages: int, seed: int = 0) -> List[Dict]:
+    """Synthetic saved conversations, each mostly about two topics."""
+    rng = random.Random(seed)
+    filler = "please explain the idea step by step with a short example".split()
+    conversations = []
+    for i in range(count):
+        topics = rng.sample(TOPICS, 2)
+        messages = [
+            {
+                "user": " ".join(rng.choices(filler, k=8) + [rng.choice(topics), f"item{rng.randrange(10000)}"]),
+                "assistant": " ".join(rng.choices(filler + topics, k=60)),
+                "time": str(datetime.now()),
+                "provider": "ollama"
+            }
+            for _ in range(n_messages)
+        ]
+        conversations.append({"title": f"Chat {i} about {topics[0]}", "saved_at": str(datetime.now()),
+                              "messages": messages, "provider": "ollama"})
+    return conversations
+
+
+def timed_ms(function, repeat: int = 5) -> float:
+    """Median milliseconds of calling function() `repeat` times."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def bench_conversations(count: int, n_messages: int):
+    """Saved conversations: whole-JSON-file commands vs the SQLite/FTS5 store."""
+    conversations = make_conversations(count, n_messages)
+    new_conversation = make_conversations(1, n_messages, seed=1)[0]
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "saved_conversations.json")
+        chatbot.SAVED_CONVOS_FILE = json_path
+        chatbot.SAVED_CONVOS_DB = os.path.join(directory, "saved_conversations.db")
+        chatbot._conversation_store = None
+        with open(json_path, "w") as f:
+            json.dump(conversations, f, indent=4)
+        json_mb = os.path.getsize(json_path) / 1e6
+
+        # Before: every command loads the whole file; saving also rewrites it
+        def load_all():
+            with open(json_path, "r") as f:
+                return json.load(f)
+
+        def legacy_save():
+            saved = load_all()
+            saved.append(new_conversation)
+            with open(json_path, "w") as f:
+                json.dump(saved, f, indent=4)
+
+        def legacy_search():
+            return [c for c in load_all()
+                    if any("quantum" in m["user"] and "guitar" in m["assistant"] for m in c["messages"])]
+
+        legacy = {
+            'save': timed_ms(legacy_save, 3),
+            'list': timed_ms(lambda: [(c["title"], len(c["messages"])) for c in load_all()[:10]], 3),
+            'view': timed_ms(lambda: load_all()[count // 2], 3),
+            'search': timed_ms(legacy_search, 3),
+        }
+
+        # One-time migration into SQLite (the first command after upgrading)
+        start = time.perf_counter()
+        chatbot.get_conversation_store()
+        migrate_s = time.perf_counter() - start
+        assert chatbot.count_saved_conversations() == count + 3  # + the legacy saves
+        assert chatbot.get_conversation(count // 2)["messages"] == conversations[count // 2 - 1]["messages"]
+
+        store = {
+            'save': timed_ms(lambda: chatbot.store_conversation(new_conversation["messages"], "new", "ollama")),
+            'list': timed_ms(lambda: chatbot.list_conversations(page=count // 20)),
+            'view': timed_ms(lambda: chatbot.get_conversation(count // 2)),
+            'search': timed_ms(lambda: chatbot.search_conversations("quantum guitar")),
+        }
+        assert chatbot.search_conversations("quantum guitar"), "search found nothing"
+        db_mb = os.path.getsize(chatbot.SAVED_CONVOS_DB) / 1e6
+        chatbot._conversation_store.close()
+        chatbot._conversation_store = None
+
+    print(f"\n🔬 Saved conversations: {count:,} conversations x {n_messages} messages "
+          f"(JSON {json_mb:.0f} MB, SQLite {db_mb:.0f} MB, migrated in {migrate_s:.1f} s)")
+    print(f"   {'command':<10}{'JSON ms':>10}{'SQLite ms':>11}{'speedup':>9}")
+    for command in ('save', 'list', 'view', 'search'):
+        print(f"   {command:<10}{legacy[command]:>10.1f}{store[command]:>11.2f}"
+              f"{legacy[command] / store[command]:>8.0f}x")
+
+
+def legacy_stream(url: str, payload: Dict, headers: Dict = None) -> str:
+    """What ask_ollama/ask_claude did before ProviderClient: requests.post per turn."""
+    reply = ""
+    response = requests.post(url, json=payload, headers=headers, stream=True)
+    for line in response.iter_lines():
+        if not line:
+            continue
+        text = line.decode("utf-8")
+        if text.startswith("{"):
+            reply += json.loads(text).get("response", "")
+        elif text.startswith("data: "):
+            data = json.loads(text[6:])
+            if data.get("type") == "content_block_delta":
+                reply += data["delta"]["text"]
+    return reply
+
+
+def bench_connections(turns: int, handshake_ms: float):
+    """Per-turn latency against stand-in servers: a new connection per turn vs pooled sessions."""
+    history = make_turns(6)
+    system_msg = chatbot.PERSONAS["assistant"]
+    prompt = "And how does that relate to recurrent networks?"
+    chatbot.CLAUDE_API_KEY = chatbot.CLAUDE_API_KEY or "stand-in-key"
+    quiet = contextlib.redirect_stdout(io.StringIO())
+
+    # Ollama runs locally (loopback connect only); the API pays handshake round trips
+    ollama_server = StandInServer(first_token_ms=20, token_ms=0.2).start()
+    claude_server = StandInServer(handshake_ms=handshake_ms, first_token_ms=20, token_ms=0.2).start()
+    chatbot.OLLAMA_URL = ollama_server.ollama_url
+    chatbot.CLAUDE_URL = claude_server.claude_url
+    chatbot.OLLAMA_CLIENT = ProviderClient("Ollama", backoff_base=0.05)
+    chatbot.CLAUDE_CLIENT = ProviderClient("Claude", headers={"anthropic-version": "2023-06-01"},
+                                           backoff_base=0.05)
+
+    providers = [
+        ("ollama", ollama_server, chatbot.OLLAMA_CLIENT, chatbot.ask_ollama,
+         lambda: legacy_stream(chatbot.OLLAMA_URL, {"model": chatbot.OLLAMA_MODEL, "stream": True,
+                                                    "prompt": prompt})),
+        ("claude", claude_server, chatbot.CLAUDE_CLIENT, chatbot.ask_claude,
+         lambda: legacy_stream(chatbot.CLAUDE_URL, {"model": chatbot.CLAUDE_MODEL, "stream": True,
+                                                    "max_tokens": 100,
+                                                    "messages": [{"role": "user", "content": prompt}]},
+                               headers={"x-api-key": chatbot.CLAUDE_API_KEY,
+                                        "anthropic-version": "2023-06-01"})),
+    ]
+
+    rows = []
+    try:
+        for name, server, client, ask, legacy in providers:
+            legacy_ms, pooled_ms = [], []
+            connections = server.connections
+            for _ in range(turns):
+                start = time.perf_counter()
+                assert legacy()
+                legacy_ms.append((time.perf_counter() - start) * 1000)
+            legacy_connections = server.connections - connections
+
+            connections = server.connections
+            for _ in range(turns):
+                start = time.perf_counter()
+                with quiet:
+                    assert ask(prompt, system_msg, history)
+                pooled_ms.append((time.perf_counter() - start) * 1000)
+            rows.append((name, statistics.median(legacy_ms), legacy_connections,
+                         statistics.median(pooled_ms), server.connections - connections, client.stats()))
+
+        # Retries: injected 503s and a 429 with Retry-After are absorbed
+        ollama_server.fail_next(2, status=503)
+        claude_server.fail_next(1, status=429, retry_after=0.05)
+        with quiet:
+            assert not chatbot.ask_ollama(prompt, system_msg, history).startswith("Error")
+            assert not chatbot.ask_claude(prompt, system_msg, history).startswith("Error")
+        retries = chatbot.OLLAMA_CLIENT.retries + chatbot.CLAUDE_CLIENT.retries
+
+        # ... but only a bounded number of times
+        ollama_server.fail_next(chatbot.OLLAMA_CLIENT.max_retries + 1, status=500)
+        with quiet:
+            assert chatbot.ask_ollama(prompt, system_msg, history) == "Error: HTTP 500"
+
+        # Read timeout: a stalled server no longer hangs the chat
+        stalled = StandInServer(first_token_ms=3000).start()
+        chatbot.OLLAMA_URL = stalled.ollama_url
+        chatbot.OLLAMA_CLIENT = ProviderClient("Ollama", read_timeout=0.5)
+        start = time.perf_counter()
+        with quiet:
+            assert chatbot.ask_ollama(prompt, system_msg, history).startswith("Error")
+        timeout_s = time.perf_counter() - start
+        stalled.stop()
+    finally:
+        ollama_server.stop()
+        claude_server.stop()
+
+    print(f"\n🔬 Provider HTTP: median per turn over {turns} turns "
+          f"(stand-in servers, {handshake_ms:.0f} ms simulated handshake for claude)")
+    print(f"   {'provider':<10}{'new conn ms':>12}{'conns':>7}{'pooled ms':>11}{'conns':>7}{'saved ms':>10}")
+    for name, legacy, legacy_conns, pooled, pooled_conns, stats in rows:
+        print(f"   {name:<10}{legacy:>12.1f}{legacy_conns:>7}{pooled:>11.1f}{pooled_conns:>7}"
+              f"{legacy - pooled:>10.1f}")
+    for name, *_, stats in rows:
+        print(f"   {name}: {stats['requests']} requests, {stats['connections_opened']} opened, "
+              f"{stats['connections_reused']} reused")
+    print(f"   ✅ {retries} retries absorbed injected 503/429s; persistent 500s fail after "
+          f"{chatbot.MAX_RETRIES} retries; a stalled server times out in {timeout_s:.1f} s")
+
+
+def run_session(turns: int, persona_change_at: int) -> List[Dict]:
+    """One Ollama chat session like main(): auto-summaries and a persona change; per-turn metrics."""
+    history = chatbot.load_history()
+    system_msg = chatbot.PERSONAS["assistant"]
+    chatbot.reset_ollama_context()
+    rows = []
+    for i, turn in enumerate(make_turns(turns)):
+        if i == persona_change_at:
+            system_msg = chatbot.PERSONAS["teacher"]
+            chatbot.reset_ollama_context()
+        reply = chatbot.ask_ollama(turn["user"], system_msg, history)
+        rows.append(dict(chatbot.ollama_metrics["last"]))
+        chatbot.append_turn(history, {"user": turn["user"], "assistant": reply,
+                                      "time": str(datetime.now()), "provider": "ollama"})
+        chatbot.apply_summary(history)
+        if chatbot.should_summarize(history, system_msg):
+            chatbot.summarize_history(history, system_msg, wait=True)
+    return rows
+
+
+def bench_context(turns: int, prompt_ms_per_token: float):
+    """Ollama prompt size and time to first token: full transcript per turn vs returned context."""
+    persona_change_at = turns * 3 // 4
+    results = {}
+    with tempfile.TemporaryDirectory() as directory, \
+            StandInServer(first_token_ms=10, token_ms=0.2, prompt_ms_per_token=prompt_ms_per_token) as server:
+        chatbot.HISTORY_FILE = os.path.join(directory, "chat_history.jsonl")
+        chatbot.LEGACY_HISTORY_FILE = os.path.join(directory, "chat_history.json")
+        chatbot.OLLAMA_URL = server.ollama_url
+        for reuse in (False, True):
+            chatbot.OLLAMA_REUSE_CONTEXT = reuse
+            chatbot.save_history([])
+            with contextlib.redirect_stdout(io.StringIO()):
+                results[reuse] = run_session(turns, persona_change_at)
+
+    rebuilds = [i + 1 for i, row in enumerate(results[True]) if not row["reused_context"]]
+    assert not any(row["reused_context"] for row in results[False])
+    assert rebuilds[0] == 1 and persona_change_at + 1 in rebuilds, rebuilds
+
+    print(f"\n🔬 Ollama context reuse: {turns} turns, summaries at {chatbot.SUMMARY_TRIGGER:.0%} of "
+          f"{chatbot.MAX_PROMPT_TOKENS:,} tokens, persona change at turn {persona_change_at + 1} "
+          f"(stand-in, {prompt_ms_per_token} ms per prompt token)")
+    print(f"   {'turn':>6}{'full tokens':>13}{'reuse tokens':>14}{'full TTFT ms':>14}{'reuse TTFT ms':>15}")
+    shown = {1, 5, 10, 20, persona_change_at, persona_change_at + 1, turns}
+    for turn in sorted(t for t in shown if 1 <= t <= turns):
+        full, reuse = results[False][turn - 1], results[True][turn - 1]
+        print(f"   {turn:>6}{full['prompt_tokens']:>13}{reuse['prompt_tokens']:>14}"
+              f"{full['ttft_ms']:>14.1f}{reuse['ttft_ms']:>15.1f}")
+    full_tokens = sum(row["prompt_tokens"] for row in results[False])
+    reuse_tokens = sum(row["prompt_tokens"] for row in results[True])
+    full_ttft = statistics.mean(row["ttft_ms"] for row in results[False])
+    reuse_ttft = statistics.mean(row["ttft_ms"] for row in results[True])
+    print(f"   {'total':>6}{full_tokens:>13,}{reuse_tokens:>14,}{full_ttft:>14.1f}{reuse_ttft:>15.1f}  (TTFT: mean)")
+    print(f"   ✅ {full_tokens / reuse_tokens:.1f}x fewer input tokens; full rebuilds only on turns {rebuilds} "
+          f"(first turn, after each summary, after the persona change)")
+
+
+class RecordingClient(ProviderClient):
+    """ProviderClient that keeps the payload of every streamed (chat) request."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sent = []
+
+    def post(self, url, json, stream=False, headers=None):
+        if stream:
+            self.sent.append(json)
+        return super().post(url, json, stream=stream, headers=headers)
+
+
+def make_long_turns(n_turns: int, seed: int = 0) -> List[str]:
+    """User messages of very different lengths (questions, pasted paragraphs)."""
+    rng = random.Random(seed)
+    sentence = "The quarterly report shows revenue grew while support costs stayed flat. "
+    return [f"Question {i}: what do you make of this? " + sentence * rng.choice([0, 1, 2, 8, 20])
+            for i in range(n_turns)]
+
+
+def bench_summary(turns: int, budget: int, think_ms: float):
+    """Wait per turn and prompt size: blocking count-based summaries vs background token-based ones."""
+    system_msg = chatbot.PERSONAS["assistant"]
+    messages = make_long_turns(turns)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory, \
+            StandInServer(first_token_ms=10, token_ms=0.2, prompt_ms_per_token=1.0) as server:
+        chatbot.HISTORY_FILE = os.path.join(directory, "chat_history.jsonl")
+        chatbot.LEGACY_HISTORY_FILE = os.path.join(directory, "chat_history.json")
+        chatbot.OLLAMA_URL = server.ollama_url
+        chatbot.OLLAMA_REUSE_CONTEXT = False  # measure the full prompt sent each turn
+
+        for mode in ("blocking", "background"):
+            chatbot.OLLAMA_CLIENT = RecordingClient("Ollama")
+            chatbot.MAX_PROMPT_TOKENS = budget if mode == "background" else 10 ** 9
+            chatbot.save_history([])
+            history = chatbot.load_history()
+            waits, summaries = [], 0
+            with contextlib.redirect_stdout(io.StringIO()):
+                for message in messages:
+                    start = time.perf_counter()
+                    if mode == "blocking":
+                        # Before: 20 messages, then a synchronous summary call
+                        reply = chatbot.ask_ai(message, system_msg, history)
+                        chatbot.append_turn(history, {"user": message, "assistant": reply, "time": ""})
+                        if len(history) > 20:
+                            summaries += chatbot.summarize_history(history, system_msg, wait=True)
+                    else:
+                        chatbot.apply_summary(history)
+                        reply = chatbot.ask_ai(message, system_msg, history)
+                        chatbot.append_turn(history, {"user": message, "assistant": reply, "time": ""})
+                        summaries += chatbot.apply_summary(history)
+                        if chatbot.should_summarize(history, system_msg):
+                            chatbot.summarize_history(history, system_msg)
+                    waits.append((time.perf_counter() - start) * 1000)
+                    time.sleep(think_ms / 1000)  # the user reads and types
+                while chatbot._summary_job is not None:
+                    summaries += chatbot.apply_summary(history, wait=True)
+            prompts = [chatbot.count_tokens(payload["prompt"]) for payload in chatbot.OLLAMA_CLIENT.sent]
+            results[mode] = (waits, prompts, summaries)
+
+        # Budget check: running total vs re-tokenizing the history every turn
+        history = chatbot.load_history()
+        start = time.perf_counter()
+        for _ in range(1000):
+            chatbot.should_summarize(history, system_msg)
+        running_us = (time.perf_counter() - start) * 1000
+        uncached = chatbot.count_tokens.__wrapped__
+        start = time.perf_counter()
+        sum(uncached(message) + 40 for message in messages)  # the whole unsummarized session
+        recount_ms = (time.perf_counter() - start) * 1000
+
+    print(f"\n🔬 History summaries: {turns} turns of mixed length, {think_ms:.0f} ms think time "
+          f"(stand-in, 1 ms per prompt token; tokenizer: "
+          f"{'tiktoken' if chatbot.get_tokenizer() else '4 chars/token estimate'})")
+    print(f"   {'mode':<12}{'p50 wait ms':>12}{'max wait ms':>13}{'max prompt':>12}{'summaries':>11}")
+    for mode, (waits, prompts, summaries) in results.items():
+        print(f"   {mode:<12}{statistics.median(waits):>12.0f}{max(waits):>13.0f}"
+              f"{max(prompts):>12,}{summaries:>11}")
+    assert max(results["background"][1]) <= budget, "a prompt exceeded the budget"
+    print(f"   ✅ every background-mode prompt stayed under {budget:,} tokens; budget check "
+          f"{running_us:.1f} µs (running total) vs {recount_ms:.2f} ms re-tokenizing {turns} turns")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ChatBot_V2 benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    history = sub.add_parser("history", help="per-turn save latency: JSON rewrite vs append-only log")
+    history.add_argument("--turns", type=int, nargs="+", default=[10, 1000, 100000])
+    history.add_argument("--saves", type=int, default=50, help="turns saved per measurement")
+
+    conversations = sub.add_parser("conversations", help="saved conversations: JSON file vs SQLite/FTS5")
+    conversations.add_argument("--count", type=int, default=5000)
+    conversations.add_argument("--messages", type=int, default=20, help="messages per conversation")
+
+    connections = sub.add_parser("connections", help="provider HTTP: new connection per turn vs pooled")
+    connections.add_argument("--turns", type=int, default=30)
+    connections.add_argument("--handshake-ms", type=float, default=60,
+                             help="simulated TCP+TLS handshake per new connection to the API")
+
+    context = sub.add_parser("context", help="Ollama: resend the transcript vs reuse the returned context")
+    context.add_argument("--turns", type=int, default=40)
+    context.add_argument("--prompt-ms-per-token", type=float, default=1.0,
+                         help="stand-in prompt evaluation time per input token")
+
+    summary = sub.add_parser("summary", help="blocking count-based vs background token-based summaries")
+    summary.add_argument("--turns", type=int, default=60)
+    summary.add_argument("--budget", type=int, default=3000, help="MAX_PROMPT_TOKENS")
+    summary.add_argument("--think-ms", type=float, default=300, help="pause between turns")
+
+    args = parser.parse_args()
+    if args.command == "history":
+        bench_history(args.turns, args.saves)
+    elif args.command == "conversations":
+        bench_conversations(args.count, args.messages)
+    elif args.command == "connections":
+        bench_connections(args.turns, args.handshake_ms)
+    elif args.command == "context":
+        bench_context(args.turns, args.prompt_ms_per_token)
+    elif args.command == "summary":
+        bench_summary(args.turns, args.budget, args.think_ms)
+
+
+if __name__ == "__main__":
+    main()
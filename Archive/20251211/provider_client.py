@@ -0,0 +1,147 @@
+"""
+HTTP clients for the chatbot's AI providers (Ollama, Claude).
+
+requests.post() opens a new connection for every call - a TCP handshake
+each turn, plus a TLS handshake for api.anthropic.com - and waits forever
+if the server stops answering. A ProviderClient instead keeps one
+requests.Session per endpoint, so its keep-alive connection is reused from
+turn to turn, and every request has a connect and a read timeout.
+
+Requests that fail with 429 or a 5xx status, or that cannot connect, are
+retried a bounded number of times with jittered exponential backoff
+(honouring Retry-After). Read timeouts are not retried: the server got the
+request and may still be generating.
+
+Each client counts requests, retries, errors and the connections it had to
+open, so connection reuse can be checked (/config shows it).
+"""
+
+import random
+import time
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = {429, 500, 502, 503, 504, 529}  # 529: Anthropic "overloaded"
+
+
+class _PoolTrackingAdapter(HTTPAdapter):
+    """HTTPAdapter that remembers the urllib3 pools it sends through (they count new connections)."""
+
+    def __init__(self, *args, **kwargs):
+        self.pools = {}
+        super().__init__(*args, **kwargs)
+
+    def get_connection_with_tls_context(self, *args, **kwargs):
+        pool = super().get_connection_with_tls_context(*args, **kwargs)
+        self.pools[id(pool)] = pool
+        return pool
+
+
+class ProviderClient:
+    """A pooled, keep-alive HTTP session for one provider endpoint."""
+
+    def __init__(self, name: str, headers: Dict = None, connect_timeout: float = 5.0,
+                 read_timeout: float = 120.0, max_retries: int = 3, backoff_base: float = 0.5,
+                 backoff_max: float = 8.0, pool_size: int = 2):
+        """
+        Args:
+            name: Provider name, for messages and metrics
+            headers: Headers sent with every request
+            connect_timeout: Seconds to wait for a connection
+            read_timeout: Seconds to wait for each chunk of the response
+            max_retries: Retries after the first attempt (429/5xx/connection errors)
+            backoff_base: First backoff ceiling in seconds, doubled per retry
+            backoff_max: Longest backoff (and longest Retry-After honoured)
+            pool_size: Connections kept open to the endpoint
+        """
+        self.name = name
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        # Retries are handled here (with metrics), not by urllib3
+        self._adapter = _PoolTrackingAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+
+    def _backoff(self, attempt: int, response: requests.Response = None) -> float:
+        """Seconds to wait before retry number `attempt` (0-based): full jitter or Retry-After."""
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass  # an HTTP date; fall back to the backoff
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def post(self, url: str, json: Dict, stream: bool = False, headers: Dict = None) -> requests.Response:
+        """
+        POST with timeouts and retries.
+
+        Args:
+            url: Endpoint URL
+            json: Request body
+            stream: Stream the response body (read it with iter_lines)
+            headers: Extra headers for this request
+
+        Returns:
+            The response (the last one if every retry failed with 429/5xx).
+            Use it in a with block, or read it fully, so its connection
+            returns to the pool.
+
+        Raises:
+            requests.RequestException: Connection failed after all retries, or a read timed out
+        """
+        for attempt in range(self.max_retries + 1):
+            self.requests += 1
+            try:
+                response = self.session.post(url, json=json, headers=headers,
+                                             stream=stream, timeout=self.timeout)
+            except requests.Timeout as e:
+                if not isinstance(e, requests.ConnectTimeout) or attempt == self.max_retries:
+                    self.errors += 1
+                    raise
+                delay = self._backoff(attempt)
+                print(f"\n⚠️  {self.name}: connection timed out, retrying in {delay:.1f}s")
+            except requests.ConnectionError:
+                if attempt == self.max_retries:
+                    self.errors += 1
+                    raise
+                delay = self._backoff(attempt)
+                print(f"\n⚠️  {self.name}: connection failed, retrying in {delay:.1f}s")
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    if response.status_code >= 400:
+                        self.errors += 1
+                    return response
+                delay = self._backoff(attempt, response)
+                response.close()
+                print(f"\n⚠️  {self.name}: HTTP {response.status_code}, retrying in {delay:.1f}s")
+            self.retries += 1
+            time.sleep(delay)
+
+    def connections_opened(self) -> int:
+        return sum(pool.num_connections for pool in self._adapter.pools.values())
+
+    def stats(self) -> Dict:
+        """Requests sent, connections opened and reused, retries and failed requests."""
+        opened = self.connections_opened()
+        return {
+            'requests': self.requests,
+            'connections_opened': opened,
+            'connections_reused': max(self.requests - opened, 0),
+            'retries': self.retries,
+            'errors': self.errors,
+        }
+
+    def close(self):
+        self.session.close()
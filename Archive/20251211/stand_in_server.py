@@ -0,0 +1,272 @@
+"""
+Local stand-in for the Ollama and Anthropic streaming endpoints.
+
+Lets the chatbot and benchmark.py run without Ollama or an API key:
+
+    POST /api/generate   Ollama: one JSON object per line ("stream": true)
+                         or a single JSON object
+    POST /v1/messages    Anthropic Messages API: server-sent events
+                         ("stream": true) or a single JSON object
+
+Replies are canned text streamed word by word with a configurable time to
+first token and per-token delay. prompt_ms_per_token adds prompt evaluation
+time for every input token (one token per word here). Like Ollama, the
+generate endpoint returns `context` (the prompt and reply tokens) and treats
+a `context` sent back as already evaluated, so only the new prompt is
+costed; there is no other prompt cache. handshake_ms is slept once per new
+connection, before its first response, to stand in for the TCP/TLS
+handshake round trips of a remote endpoint (a loopback connect alone costs
+almost nothing). fail_next() makes the next requests fail with 429/5xx to
+exercise the client's retries.
+
+Usage:
+    python stand_in_server.py [--port 8765] [--handshake-ms 0]
+    OLLAMA_URL=http://127.0.0.1:8765/api/generate python ChatBot_V2.py
+"""
+
+import argparse
+import json
+import threading
+import time
+import zlib
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+REPLY_TEXT = ("This is a stand-in reply from the local test server. It streams one word "
+              "at a time so the client can be timed without a real model. ")
+
+
+def _tokens(text: str) -> List[int]:
+    """Stand-in tokenizer: one id per word."""
+    return [zlib.crc32(word.encode("utf-8")) & 0x7FFFFFFF for word in text.split()]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, chunked streaming
+    disable_nagle_algorithm = True  # send each streamed token at once, as Ollama and the API do
+
+    def setup(self):
+        super().setup()
+        stand_in = self.server.stand_in
+        with stand_in.lock:
+            stand_in.connections += 1
+        time.sleep(stand_in.handshake_ms / 1000)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: Dict, headers: Dict = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _start_stream(self, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _write_chunk(self, text: str):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _end_stream(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        stand_in = self.server.stand_in
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            return self._send_json(400, {"error": "invalid JSON"})
+
+        with stand_in.lock:
+            stand_in.requests += 1
+            failure = stand_in.failures.pop(0) if stand_in.failures else None
+        if failure:
+            status, retry_after = failure
+            headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+            return self._send_json(status, {"error": f"injected HTTP {status}"}, headers)
+
+        if self.path == "/api/generate":
+            self._ollama(payload)
+        elif self.path == "/v1/messages":
+            self._anthropic(payload)
+        else:
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+
+    def _ollama(self, payload: Dict):
+        stand_in = self.server.stand_in
+        model = payload.get("model", "stand-in")
+        context = list(payload.get("context") or [])
+        prompt_tokens = _tokens(str(payload.get("system", "")) + " " + str(payload.get("prompt", "")))
+        words = stand_in.reply_words()
+        prompt_eval_ms = stand_in.prompt_ms_per_token * len(prompt_tokens)
+        time.sleep((stand_in.first_token_ms + prompt_eval_ms) / 1000)
+        final = {"model": model, "created_at": datetime.now().isoformat(), "response": "",
+                 "done": True, "done_reason": "stop",
+                 "context": context + prompt_tokens + _tokens("".join(words)),
+                 "prompt_eval_count": len(prompt_tokens),
+                 "prompt_eval_duration": int(prompt_eval_ms * 1e6), "eval_count": len(words)}
+
+        if not payload.get("stream", True):
+            final["response"] = "".join(words)
+            return self._send_json(200, final)
+
+        self._start_stream("application/x-ndjson")
+        for i, word in enumerate(words):
+            if i:
+                time.sleep(stand_in.token_ms / 1000)
+            self._write_chunk(json.dumps({"model": model, "created_at": datetime.now().isoformat(),
+                                          "response": word, "done": False}) + "\n")
+        self._write_chunk(json.dumps(final) + "\n")
+        self._end_stream()
+
+    def _anthropic(self, payload: Dict):
+        stand_in = self.server.stand_in
+        model = payload.get("model", "stand-in")
+        input_tokens = sum(len(str(m.get("content", "")).split()) for m in payload.get("messages", []))
+        input_tokens += len(str(payload.get("system", "")).split())
+        words = stand_in.reply_words()
+        usage = {"input_tokens": input_tokens, "output_tokens": len(words)}
+        time.sleep((stand_in.first_token_ms + stand_in.prompt_ms_per_token * input_tokens) / 1000)
+
+        if not payload.get("stream"):
+            return self._send_json(200, {
+                "id": "msg_stand_in", "type": "message", "role": "assistant", "model": model,
+                "content": [{"type": "text", "text": "".join(words)}],
+                "stop_reason": "end_turn", "usage": usage
+            })
+
+        def event(name: str, data: Dict):
+            self._write_chunk(f"event: {name}\ndata: {json.dumps(data)}\n\n")
+
+        self._start_stream("text/event-stream")
+        event("message_start", {"type": "message_start", "message": {
+            "id": "msg_stand_in", "type": "message", "role": "assistant", "model": model,
+            "content": [], "usage": {"input_tokens": input_tokens, "output_tokens": 1}}})
+        event("content_block_start", {"type": "content_block_start", "index": 0,
+                                      "content_block": {"type": "text", "text": ""}})
+        for i, word in enumerate(words):
+            if i:
+                time.sleep(stand_in.token_ms / 1000)
+            event("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                          "delta": {"type": "text_delta", "text": word}})
+        event("content_block_stop", {"type": "content_block_stop", "index": 0})
+        event("message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn"},
+                                "usage": {"output_tokens": len(words)}})
+        event("message_stop", {"type": "message_stop"})
+        self._end_stream()
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # clients that time out or hang up mid-stream are expected here
+
+
+class StandInServer:
+    """Threaded stand-in provider server on a background thread."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, handshake_ms: float = 0.0,
+                 first_token_ms: float = 20.0, token_ms: float = 1.0, reply_length: int = 40,
+                 prompt_ms_per_token: float = 0.0):
+        """
+        Args:
+            host: Interface to listen on
+            port: Port (0 = any free port)
+            handshake_ms: Delay before the first response on each new connection
+            first_token_ms: Delay before the first streamed token
+            token_ms: Delay between streamed tokens
+            reply_length: Words per reply
+            prompt_ms_per_token: Prompt evaluation time per input token (before the first token)
+        """
+        self.handshake_ms = handshake_ms
+        self.first_token_ms = first_token_ms
+        self.token_ms = token_ms
+        self.reply_length = reply_length
+        self.prompt_ms_per_token = prompt_ms_per_token
+
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.failures: List = []
+
+        self._server = _Server((host, port), _Handler)
+        self._server.stand_in = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def ollama_url(self) -> str:
+        return self.url + "/api/generate"
+
+    @property
+    def claude_url(self) -> str:
+        return self.url + "/v1/messages"
+
+    def reply_words(self) -> List[str]:
+        words = (REPLY_TEXT * (self.reply_length // 20 + 1)).split()[:self.reply_length]
+        return [word if i == 0 else " " + word for i, word in enumerate(words)]
+
+    def fail_next(self, count: int = 1, status: int = 503, retry_after: float = None):
+        """Answer the next `count` requests with `status` (and a Retry-After header if given)."""
+        with self.lock:
+            self.failures.extend([(status, retry_after)] * count)
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in Ollama/Anthropic streaming server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--handshake-ms", type=float, default=0.0,
+                        help="delay per new connection (simulated TCP/TLS handshake)")
+    parser.add_argument("--first-token-ms", type=float, default=20.0)
+    parser.add_argument("--token-ms", type=float, default=1.0)
+    parser.add_argument("--prompt-ms-per-token", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = StandInServer(args.host, args.port, args.handshake_ms, args.first_token_ms, args.token_ms,
+                           prompt_ms_per_token=args.prompt_ms_per_token)
+    print(f"🧪 Stand-in server on {server.url}")
+    print(f"   OLLAMA_URL={server.ollama_url}")
+    print(f"   CLAUDE_URL={server.claude_url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
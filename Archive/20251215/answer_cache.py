@@ -0,0 +1,159 @@
+"""
+Two-level cache of LLM answers for the Document Q&A System.
+
+The chain runs at temperature=0, so the same question over the same chunks
+with the same model gives the same answer. Keys combine:
+
+- the normalized question (lowercased, punctuation and stop words removed)
+- the retrieved chunks (document, chunk id and a hash of the content)
+- the model name
+
+Level 1 is an in-memory LRU with a TTL; level 2 is an optional SQLite file
+that survives restarts. Entries remember which documents they were built from
+so they can be dropped when those documents change or are cleared.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from retrieval import STOP_WORDS, tokenize
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, strip punctuation and drop stop words."""
+    return " ".join(word for word in tokenize(question) if word not in STOP_WORDS)
+
+
+def content_hash(text: str) -> str:
+    """Short, stable hash of chunk content."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+class AnswerCache:
+    """In-memory LRU + optional on-disk tier, both with a time-to-live."""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600,
+                 disk_path: str = None):
+        """
+        Args:
+            max_entries: Entries kept in memory (least recently used evicted)
+            ttl_seconds: Age after which an entry is ignored
+            disk_path: SQLite file for the persistent tier (None = memory only)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        # key -> (created_at, answer, document names)
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._db = None
+        if disk_path:
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                " key TEXT PRIMARY KEY, created_at REAL, answer TEXT, documents TEXT)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(question: str, chunks: List[Dict], model: str) -> str:
+        """
+        Build the cache key for a question answered from `chunks`.
+
+        Args:
+            question: User's question
+            chunks: Retrieved chunks (with 'document_name', 'chunk_id', 'content')
+            model: LLM model name
+        """
+        parts = [model, normalize_question(question)]
+        for chunk in chunks:
+            parts.append(f"{chunk['document_name']}#{chunk['chunk_id']}#"
+                         f"{content_hash(chunk['content'])}")
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def _expired(self, created_at: float) -> bool:
+        return time.time() - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up an answer, memory first, then disk.
+
+        Returns:
+            The cached answer, or None on a miss
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and self._expired(entry[0]):
+                del self._memory[key]
+                entry = None
+
+            if entry is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT created_at, answer, documents FROM answers WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and not self._expired(row[0]):
+                    entry = (row[0], row[1], json.loads(row[2]))
+                    self._remember(key, entry)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, answer: str, documents: Iterable[str]):
+        """Store an answer built from the given documents."""
+        entry = (time.time(), answer, sorted(set(documents)))
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?)",
+                    (key, entry[0], answer, json.dumps(entry[2]))
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, entry: tuple):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def invalidate_documents(self, document_names: Iterable[str]):
+        """Drop every entry built from any of the given documents."""
+        names = set(document_names)
+        with self._lock:
+            for key in [k for k, entry in self._memory.items() if names & set(entry[2])]:
+                del self._memory[key]
+            if self._db is not None:
+                rows = self._db.execute("SELECT key, documents FROM answers").fetchall()
+                stale = [(key,) for key, documents in rows if names & set(json.loads(documents))]
+                self._db.executemany("DELETE FROM answers WHERE key = ?", stale)
+                self._db.commit()
+
+    def clear(self):
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM answers")
+                self._db.commit()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self._memory),
+        }
@@ -0,0 +1,798 @@
+"""
+Benchmarks for the Document Q&A System.
+Runs offline against the bundled example documents - no API calls are made.
+
+Usage:
+    python benchmark.py retrieval [--copies 200]
+    python benchmark.py cache [files ...]
+    python benchmark.py ingest [--files 40] [--workers 1 2 4]
+    python benchmark.py memory [--mb 50]
+    python benchmark.py context [--top-k 10] [--budget 3000]
+    python benchmark.py stream [--first-token 0.3] [--per-token 0.02]
+    python benchmark.py batch [--questions 60] [--concurrency 1 4 16] [--latency 0.2]
+    python benchmark.py sparse [--sizes 10000 100000 1000000]
+    python benchmark.py update [--files 500]
+    python benchmark.py chunks [--chunks 1000000]
+    python benchmark.py spans [--questions 300]
+    python benchmark.py splitter [--mb 20]
+    python benchmark.py serve [--requests 200] [--concurrency 1 4 16] [--latency 0.05]
+    python benchmark.py workspaces [--workspaces 12] [--mb 2] [--budget-fraction 0.3]
+    python benchmark.py pruning [--chunks 200000] [--top-k 1 5 10 50 100] [--terms 20]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from chatbot import DocumentQASystem
+from chunk_store import ChunkStore
+from context_packer import ContextPacker, count_tokens, unpacked_context
+from fake_llm import FakeLLM
+from retrieval import InvertedIndex
+
+EXAMPLE_DOCS = ["climate_change.txt", "employee_handbook.txt", "machine_learning.txt"]
+
+QUESTIONS = [
+    "What are the main causes of climate change?",
+    "How many vacation days do employees get?",
+    "What is the difference between supervised and unsupervised learning?",
+    "Which renewable energy sources reduce emissions?",
+    "What is the remote work policy?",
+    "Explain reinforcement learning with examples of game playing",
+]
+
+
+def make_system(copies: int = 1, **kwargs) -> DocumentQASystem:
+    """Create a system loaded with the example docs, replicated `copies` times."""
+    kwargs.setdefault('cache_dir', None)
+    kwargs.setdefault('llm', FakeLLM())
+    qa = DocumentQASystem(**kwargs)
+    for path in EXAMPLE_DOCS:
+        qa.load_document(path)
+    base = list(qa.all_chunks)
+    for copy in range(1, copies):
+        for chunk in base:
+            replica = {**chunk, 'document_name': f"copy{copy}_{chunk['document_name']}"}
+            qa.all_chunks.append(replica)
+            qa.index.add_chunk(replica['content'])
+    return qa
+
+
+def time_queries(search: Callable[[str], List[Dict]], repeat: int = 3) -> Dict:
+    """Run every question `repeat` times and return latency stats in ms."""
+    timings = []
+    for _ in range(repeat):
+        for question in QUESTIONS:
+            start = time.perf_counter()
+            search(question)
+            timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'mean_ms': statistics.mean(timings),
+        'p50_ms': statistics.median(timings),
+        'max_ms': max(timings),
+    }
+
+
+def brute_force_legacy(qa: DocumentQASystem, query: str, top_k: int = 5) -> List[Dict]:
+    """The original linear scan, kept as the reference for the legacy mode."""
+    scored = []
+    for chunk in qa.all_chunks:
+        if chunk is None:  # removed document
+            continue
+        score = qa._calculate_relevance_score(query, chunk['content'])
+        if score > 0:
+            scored.append({**chunk, 'relevance_score': score})
+    scored.sort(key=lambda x: x['relevance_score'], reverse=True)
+    return scored[:top_k]
+
+
+def bench_retrieval(copies: int, top_k: int = 5):
+    """Compare linear scan, indexed legacy scoring and BM25 side by side."""
+    qa = make_system(copies)
+    print(f"\n🔬 Retrieval benchmark: {len(qa.all_chunks)} chunks, top_k={top_k}")
+
+    # Ranking quality: indexed legacy must match the scan; BM25 overlap is informational
+    for question in QUESTIONS:
+        reference = brute_force_legacy(qa, question, top_k)
+        legacy = qa.find_relevant_chunks(question, top_k, scoring="legacy")
+        bm25 = qa.find_relevant_chunks(question, top_k, scoring="bm25")
+        key = lambda c: (c['document_name'], c['chunk_id'])
+        assert [(key(c), c['relevance_score']) for c in reference] == \
+               [(key(c), c['relevance_score']) for c in legacy], question
+        overlap = len({key(c) for c in reference} & {key(c) for c in bm25})
+        print(f"   {question[:55]:<55} bm25∩legacy@{top_k}: {overlap}")
+
+    rows = [
+        ("linear scan", lambda q: brute_force_legacy(qa, q, top_k)),
+        ("index legacy", lambda q: qa.find_relevant_chunks(q, top_k, scoring="legacy")),
+        ("index bm25", lambda q: qa.find_relevant_chunks(q, top_k, scoring="bm25")),
+    ]
+    print(f"\n   {'mode':<14}{'mean ms':>10}{'p50 ms':>10}{'max ms':>10}")
+    for name, search in rows:
+        stats = time_queries(search)
+        print(f"   {name:<14}{stats['mean_ms']:>10.2f}{stats['p50_ms']:>10.2f}{stats['max_ms']:>10.2f}")
+
+
+def bench_cache(files: List[str]):
+    """Cold load (parse + split) vs warm load from the chunk cache."""
+    files = files or EXAMPLE_DOCS
+    with tempfile.TemporaryDirectory() as cache_dir:
+        timings = {}
+        for label in ("cold", "warm"):
+            qa = DocumentQASystem(llm=FakeLLM(), cache_dir=cache_dir)
+            start = time.perf_counter()
+            qa.load_multiple_documents(files)
+            timings[label] = (time.perf_counter() - start) * 1000
+
+    print(f"\n🔬 Chunk cache: {len(files)} files, {len(qa.all_chunks)} chunks")
+    print(f"   cold load: {timings['cold']:.1f} ms")
+    print(f"   warm load: {timings['warm']:.1f} ms")
+
+
+def write_corpus(directory: str, n_files: int, repeats: int = 20) -> List[str]:
+    """Write n_files text files, each the example docs repeated `repeats` times."""
+    base = "\n\n".join(Path(path).read_text(encoding="utf-8") for path in EXAMPLE_DOCS)
+    paths = []
+    for i in range(n_files):
+        path = Path(directory) / f"doc_{i:04d}.txt"
+        path.write_text(f"Document {i}\n\n" + "\n\n".join([base] * repeats), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def bench_ingest(n_files: int, worker_counts: List[int]):
+    """Ingestion throughput of load_multiple_documents against worker count."""
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        paths = write_corpus(corpus_dir, n_files)
+        total_mb = sum(os.path.getsize(path) for path in paths) / 1e6
+
+        rows = []
+        reference = None
+        for workers in worker_counts:
+            qa = DocumentQASystem(llm=FakeLLM(), cache_dir=None)
+            start = time.perf_counter()
+            qa.load_multiple_documents(paths, workers=workers)
+            elapsed = time.perf_counter() - start
+
+            # Parallel loading must produce exactly the sequential chunk list
+            chunks = [(c['document_name'], c['chunk_id'], c['content']) for c in qa.all_chunks]
+            reference = reference or chunks
+            assert chunks == reference, f"chunk order differs with {workers} workers"
+            rows.append((workers, elapsed))
+
+    print(f"\n🔬 Ingestion: {n_files} files, {total_mb:.1f} MB, {len(reference)} chunks "
+          f"({os.cpu_count()} CPUs)")
+    print(f"   {'workers':>8}{'seconds':>10}{'MB/s':>10}{'speedup':>10}")
+    for workers, elapsed in rows:
+        print(f"   {workers:>8}{elapsed:>10.2f}{total_mb / elapsed:>10.1f}"
+              f"{rows[0][1] / elapsed:>9.2f}x")
+
+
+def bench_memory(target_mb: int):
+    """Python heap held after loading a corpus: in-memory vs streaming ingestion."""
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        one_file_mb = os.path.getsize(write_corpus(corpus_dir, 1)[0]) / 1e6
+        paths = write_corpus(corpus_dir, max(1, round(target_mb / one_file_mb)))
+        total_mb = sum(os.path.getsize(path) for path in paths) / 1e6
+
+        rows = []
+        for label, kwargs in (("in-memory", {}), ("streaming", {'streaming': True})):
+            tracemalloc.start()
+            qa = DocumentQASystem(llm=FakeLLM(), cache_dir=None, **kwargs)
+            qa.load_multiple_documents(paths)
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            rows.append((label, current / 1e6, peak / 1e6))
+            del qa
+
+    print(f"\n🔬 Memory: {len(paths)} files, {total_mb:.1f} MB of text")
+    print(f"   {'mode':<12}{'held MB':>10}{'peak MB':>10}")
+    for label, held, peak in rows:
+        print(f"   {label:<12}{held:>10.1f}{peak:>10.1f}")
+
+
+def bench_context(top_k: int, budget: int):
+    """Context tokens per question: verbatim concatenation vs packed."""
+    qa = make_system()
+    packer = ContextPacker(budget, qa.chunk_overlap)
+    print(f"\n🔬 Context packing: top_k={top_k}, budget={budget} tokens")
+    print(f"   {'question':<45}{'verbatim':>10}{'packed':>10}{'chunks':>8}")
+    totals = [0, 0]
+    for question in QUESTIONS:
+        chunks = qa.find_relevant_chunks(question, top_k)
+        verbatim = count_tokens(unpacked_context(chunks))
+        context, used = packer.pack(chunks)
+        packed = count_tokens(context)
+        totals[0] += verbatim
+        totals[1] += packed
+        print(f"   {question[:43]:<45}{verbatim:>10}{packed:>10}{len(used):>5}/{len(chunks)}")
+    print(f"   {'total':<45}{totals[0]:>10}{totals[1]:>10}"
+          f"   ({1 - totals[1] / totals[0]:.0%} fewer input tokens)")
+
+
+def bench_stream(first_token: float, per_token: float, answer_words: int = 60):
+    """Perceived latency: blocking ask_question vs time to first streamed token."""
+    llm = FakeLLM(first_token_latency=first_token, token_latency=per_token,
+                  answer_words=answer_words)
+    qa = make_system(llm=llm, answer_cache_size=0)
+
+    blocking, first_tokens, totals = [], [], []
+    for question in QUESTIONS:
+        start = time.perf_counter()
+        qa.ask_question(question)
+        blocking.append((time.perf_counter() - start) * 1000)
+
+        for event in qa.ask_question_stream(question):
+            if event['type'] == 'final':
+                first_tokens.append(event['response']['timings']['time_to_first_token_ms'])
+                totals.append(event['response']['timings']['total_ms'])
+
+    print(f"\n🔬 Streaming: fake LLM, {first_token * 1000:.0f} ms to first token, "
+          f"{per_token * 1000:.0f} ms/token, {answer_words} tokens")
+    print(f"   blocking answer shown after:   {statistics.mean(blocking):8.1f} ms")
+    print(f"   streaming first token after:   {statistics.mean(first_tokens):8.1f} ms")
+    print(f"   streaming complete after:      {statistics.mean(totals):8.1f} ms")
+
+
+def bench_batch(n_questions: int, concurrency_levels: List[int], latency: float,
+                rate_limit: float = None):
+    """ask_many throughput against concurrency, with a fixed-latency fake LLM."""
+    qa = make_system(llm=FakeLLM(first_token_latency=latency), answer_cache_size=0)
+    questions = [QUESTIONS[i % len(QUESTIONS)] for i in range(n_questions)]
+
+    rows = []
+    for concurrency in concurrency_levels:
+        start = time.perf_counter()
+        results = qa.ask_many(questions, concurrency=concurrency, rate_limit=rate_limit)
+        elapsed = time.perf_counter() - start
+        assert [r['question'] for r in results] == questions, "results out of order"
+        total = statistics.median(r['timings']['total_ms'] for r in results)
+        queue = statistics.median(r['timings']['queue_ms'] for r in results)
+        rows.append((concurrency, elapsed, total, queue))
+
+    print(f"\n🔬 Batch answering: {n_questions} questions, fake LLM {latency * 1000:.0f} ms/call"
+          + (f", rate limit {rate_limit}/s" if rate_limit else ""))
+    print(f"   {'concurrency':>12}{'seconds':>10}{'q/s':>8}{'p50 total ms':>14}{'p50 queue ms':>14}")
+    for concurrency, elapsed, total, queue in rows:
+        print(f"   {concurrency:>12}{elapsed:>10.2f}{n_questions / elapsed:>8.1f}"
+              f"{total:>14.0f}{queue:>14.0f}")
+
+
+def synthetic_chunk_terms(n_chunks: int, vocab_size: int = 50000,
+                          words_per_chunk: int = 40, seed: int = 0):
+    """Yield (term_freqs, length) for chunks with Zipf-distributed words."""
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    words = [f"word{i}" for i in range(vocab_size)]
+    batch = 10000
+    for start in range(0, n_chunks, batch):
+        ids = rng.zipf(1.3, size=(min(batch, n_chunks - start), words_per_chunk)) % vocab_size
+        for row in ids.tolist():
+            yield {words[i]: freq for i, freq in Counter(row).items()}, words_per_chunk
+
+
+def bench_sparse(sizes: List[int], top_k: int = 5, compare_max: int = 100000):
+    """Sparse TF-IDF matvec + argpartition vs the BM25 inverted index."""
+    from sparse_retrieval import SparseTfidfIndex
+    queries = [" ".join(f"word{i}" for i in range(q, q + 60, 12)) for q in range(5, 200, 13)]
+
+    rows = []
+    for size in sizes:
+        engines = [("sparse tfidf", SparseTfidfIndex())]
+        if size <= compare_max:
+            engines.append(("bm25 index", InvertedIndex()))
+        for name, index in engines:
+            start = time.perf_counter()
+            for term_freqs, length in synthetic_chunk_terms(size):
+                index.add_chunk_terms(term_freqs, length)
+            index.search(queries[0], top_k, scoring=index.scoring_modes[0])  # build / warm up
+            build_s = time.perf_counter() - start
+
+            timings = []
+            for query in queries:
+                start = time.perf_counter()
+                index.search(query, top_k, scoring=index.scoring_modes[0])
+                timings.append((time.perf_counter() - start) * 1000)
+
+            # A load after the index is built: the new rows are appended, not rebuilt
+            start = time.perf_counter()
+            for term_freqs, length in synthetic_chunk_terms(100):
+                index.add_chunk_terms(term_freqs, length)
+            index.search(queries[0], top_k, scoring=index.scoring_modes[0])
+            update_ms = (time.perf_counter() - start) * 1000
+            rows.append((size, name, build_s, statistics.median(timings), max(timings), update_ms))
+            del index
+
+    print(f"\n🔬 Sparse TF-IDF retrieval: synthetic Zipf chunks, top_k={top_k}")
+    print(f"   {'chunks':>9}  {'engine':<14}{'build s':>9}{'p50 ms':>9}{'max ms':>9}{'+100 ms':>9}")
+    for size, name, build_s, p50, worst, update_ms in rows:
+        print(f"   {size:>9,}  {name:<14}{build_s:>9.1f}{p50:>9.2f}{worst:>9.2f}{update_ms:>9.1f}")
+    print("   +100 ms: add 100 chunks to the built index, then the first query")
+
+
+def bench_update(n_files: int, top_k: int = 5):
+    """Cost of reloading one changed file in a loaded corpus vs a full rebuild."""
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        paths = write_corpus(corpus_dir, n_files, repeats=1)
+        qa = DocumentQASystem(llm=FakeLLM(), cache_dir=None)
+        start = time.perf_counter()
+        qa.load_multiple_documents(paths)
+        full_load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        qa.reload_document(paths[0])
+        unchanged = time.perf_counter() - start
+
+        Path(paths[0]).write_text("Document 0 was rewritten: employees now get "
+                                  "thirty vacation days.\n", encoding="utf-8")
+        start = time.perf_counter()
+        qa.reload_document(paths[0])
+        changed = time.perf_counter() - start
+
+        # The incrementally updated index must rank like one built from scratch
+        fresh = DocumentQASystem(llm=FakeLLM(), cache_dir=None)
+        fresh.load_multiple_documents(paths)
+        key = lambda c: (c['document_name'], c['chunk_id'], round(c['relevance_score'], 9))
+        for question in QUESTIONS + ["How many vacation days were rewritten?"]:
+            assert sorted(map(key, qa.find_relevant_chunks(question, top_k))) == \
+                   sorted(map(key, fresh.find_relevant_chunks(question, top_k))), question
+
+    print(f"\n🔬 Incremental update: {n_files} files, {qa.chunk_count} chunks")
+    print(f"   full load:            {full_load * 1000:>10.1f} ms")
+    print(f"   reload unchanged:     {unchanged * 1000:>10.1f} ms")
+    print(f"   reload changed file:  {changed * 1000:>10.1f} ms")
+
+
+def bench_chunks(n_chunks: int):
+    """Memory held by chunk metadata: one dict per chunk vs the columnar ChunkStore."""
+    n_documents = max(1, n_chunks // 1000)
+    names = [f"policy_document_{i:05d}.pdf" for i in range(n_documents)]
+
+    def chunk_rows():
+        # Streamed-chunk metadata; the text itself lives in the text store either way
+        for i in range(n_chunks):
+            yield {
+                'chunk_id': i % 1000,
+                'document_name': names[i // 1000 % n_documents],
+                'char_count': 1400 + i % 100,
+                'word_count': 230 + i % 40,
+                'text_offset': i * 1500,
+                'text_length': 1450 + i % 50,
+            }
+
+    rows = []
+    for label in ("dicts", "ChunkStore"):
+        tracemalloc.start()
+        start = time.perf_counter()
+        if label == "dicts":
+            # The old layout: each chunk holds its own copy of the document name
+            store = [{**row, 'document_name': "".join(row['document_name'])} for row in chunk_rows()]
+        else:
+            store = ChunkStore()
+            for row in chunk_rows():
+                store.append(row)
+        build_s = time.perf_counter() - start
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for i in range(0, n_chunks, max(1, n_chunks // 10000)):
+            chunk = store[i]
+        lookup_us = (time.perf_counter() - start) / min(n_chunks, 10000) * 1e6
+        rows.append((label, held / 1e6, held / n_chunks, build_s, lookup_us))
+        del store
+
+    print(f"\n🔬 Chunk metadata: {n_chunks:,} chunks in {n_documents:,} documents")
+    print(f"   {'layout':<12}{'held MB':>10}{'B/chunk':>10}{'build s':>10}{'get µs':>10}")
+    for label, held_mb, per_chunk, build_s, lookup_us in rows:
+        print(f"   {label:<12}{held_mb:>10.1f}{per_chunk:>10.0f}{build_s:>10.2f}{lookup_us:>10.2f}")
+
+
+def bench_spans(n_questions: int):
+    """Cost of latency instrumentation: questions with spans off vs on."""
+    from latency import NULL_TRACE
+
+    rows = []
+    for label, kwargs in (("off", {}), ("on", {'instrument': True})):
+        qa = make_system(answer_cache_size=0, **kwargs)
+        for question in QUESTIONS:  # warm up the token-count caches
+            qa.ask_question(question)
+        start = time.perf_counter()
+        for i in range(n_questions):
+            qa.ask_question(QUESTIONS[i % len(QUESTIONS)])
+        rows.append((label, (time.perf_counter() - start) / n_questions * 1000))
+
+    start = time.perf_counter()
+    for _ in range(100000):
+        with NULL_TRACE.span("score"):
+            pass
+    null_ns = (time.perf_counter() - start) / 100000 * 1e9
+
+    print(f"\n🔬 Latency spans: {n_questions} questions (fake LLM)")
+    for label, mean_ms in rows:
+        print(f"   instrumentation {label:<4} {mean_ms:>8.2f} ms/question")
+    print(f"   disabled span cost: {null_ns:.0f} ns per stage")
+    print("   (enabled mode streams the LLM call to time the first token, which costs"
+          " LangChain a little extra per answer)")
+
+
+def bench_splitter(target_mb: int):
+    """Native splitter vs RecursiveCharacterTextSplitter: identical chunks, throughput.
+
+    A quick check only: test_native_splitter.py holds the equivalence tests.
+    """
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+    from native_splitter import StreamingTextSplitter
+
+    qa = DocumentQASystem(llm=FakeLLM(), cache_dir=None)
+    native = StreamingTextSplitter(qa.chunk_size, qa.chunk_overlap, qa.separators)
+    langchain = RecursiveCharacterTextSplitter(
+        chunk_size=qa.chunk_size, chunk_overlap=qa.chunk_overlap, length_function=len,
+        separators=qa.separators, is_separator_regex=False
+    )
+
+    # Same chunks for every example doc, whole or fed in as "pages" of any size
+    for path in EXAMPLE_DOCS:
+        text = Path(path).read_text(encoding="utf-8")
+        expected = langchain.split_text(text)
+        assert native.split_text(text) == expected, path
+        for page_size in (1, 7, 100, 1499, 4096):
+            pages = (text[i:i + page_size] for i in range(0, len(text), page_size))
+            assert list(native.split_pieces(pages)) == expected, (path, page_size)
+        print(f"   ✅ {path}: {len(expected)} chunks match langchain")
+
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        one_file_mb = os.path.getsize(write_corpus(corpus_dir, 1)[0]) / 1e6
+        paths = write_corpus(corpus_dir, max(1, round(target_mb / one_file_mb)))
+        texts = [Path(path).read_text(encoding="utf-8") for path in paths]
+    total_mb = sum(len(text) for text in texts) / 1e6
+
+    rows = []
+    reference = None
+    for name, split in (("langchain", langchain.split_text), ("native", native.split_text),
+                        ("native pages", lambda text: list(native.split_pieces(
+                            text[i:i + 3000] for i in range(0, len(text), 3000))))):
+        start = time.perf_counter()
+        chunks = [chunk for text in texts for chunk in split(text)]
+        elapsed = time.perf_counter() - start
+        reference = reference or chunks
+        assert chunks == reference, f"{name} chunks differ from langchain"
+        rows.append((name, elapsed))
+
+    print(f"\n🔬 Splitter: {len(texts)} texts, {total_mb:.1f} MB, {len(reference):,} chunks")
+    print(f"   {'splitter':<14}{'seconds':>10}{'MB/s':>10}{'speedup':>10}")
+    for name, elapsed in rows:
+        print(f"   {name:<14}{elapsed:>10.2f}{total_mb / elapsed:>10.1f}{rows[0][1] / elapsed:>9.2f}x")
+
+
+def http_load(client_factory, n_requests: int, concurrency: int,
+              until: threading.Event = None) -> List[tuple]:
+    """
+    POST questions to /ask from `concurrency` threads, each with its own client.
+
+    Sends n_requests in total, or keeps sending until `until` is set.
+
+    Returns:
+        (status, latency ms) per request
+    """
+    results = []
+    results_lock = threading.Lock()
+    counter = iter(range(n_requests if until is None else 10 ** 9))
+    counter_lock = threading.Lock()
+
+    def worker():
+        client = client_factory()
+        while True:
+            with counter_lock:
+                i = next(counter, None)
+            if i is None or (until is not None and until.is_set()):
+                return
+            start = time.perf_counter()
+            reply = client.post("/ask", json={'question': QUESTIONS[i % len(QUESTIONS)]})
+            elapsed = (time.perf_counter() - start) * 1000
+            with results_lock:
+                results.append((reply.status_code, elapsed))
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def bench_serve(n_requests: int, concurrency_levels: List[int], latency: float,
+                reload_files: int):
+    """HTTP /ask throughput and latency (werkzeug test client, fake LLM), also during /load."""
+    from latency import percentile
+    from qa_server import create_app
+
+    qa = make_system(llm=FakeLLM(first_token_latency=latency), answer_cache_size=0)
+    app = create_app(qa)
+
+    rows = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for concurrency in concurrency_levels:
+            start = time.perf_counter()
+            results = http_load(app.test_client, n_requests, concurrency)
+            elapsed = time.perf_counter() - start
+            assert all(status == 200 for status, _ in results), "failed /ask requests"
+            rows.append((concurrency, elapsed, sorted(ms for _, ms in results)))
+
+    print(f"\n🔬 HTTP serving: {n_requests} requests to /ask, fake LLM {latency * 1000:.0f} ms/call")
+    print(f"   {'concurrency':>12}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for concurrency, elapsed, ordered in rows:
+        print(f"   {concurrency:>12}{n_requests / elapsed:>9.1f}{percentile(ordered, 50):>9.1f}"
+              f"{percentile(ordered, 95):>9.1f}{percentile(ordered, 99):>9.1f}")
+
+    # Readers keep being answered while a batch of documents is indexed
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        paths = write_corpus(corpus_dir, reload_files)
+        done = threading.Event()
+        with contextlib.redirect_stdout(io.StringIO()):
+            client = app.test_client()
+            start = time.perf_counter()
+            job = client.post("/load", json={'paths': paths}).get_json()['job']
+
+            def wait_for_load():
+                while client.get(f"/load/{job}").get_json()['status'] != 'done':
+                    time.sleep(0.01)
+                done.set()
+
+            waiter = threading.Thread(target=wait_for_load)
+            waiter.start()
+            results = http_load(app.test_client, 0, max(concurrency_levels), until=done)
+            waiter.join()
+            load_seconds = time.perf_counter() - start
+        assert all(status == 200 for status, _ in results), "failed /ask requests during /load"
+        assert qa.chunk_count > 0 and len(qa.documents) == len(EXAMPLE_DOCS) + reload_files
+
+    ordered = sorted(ms for _, ms in results)
+    print(f"\n   During /load of {reload_files} files ({load_seconds:.2f} s, "
+          f"concurrency {max(concurrency_levels)}):")
+    if ordered:
+        print(f"   {len(ordered)} questions answered, p50 {percentile(ordered, 50):.1f} ms, "
+              f"p99 {percentile(ordered, 99):.1f} ms, max {ordered[-1]:.1f} ms")
+    app.extensions['qa_loader'].shutdown(wait=True)
+
+
+def bench_workspaces(n_workspaces: int, workspace_mb: float, budget_fraction: float,
+                     n_questions: int = 200):
+    """Many corpora under a memory budget: spills, fault-ins and question latency."""
+    import json
+    import random
+    from create_example_docs import generate_corpus
+    from latency import percentile
+    from workspaces import WorkspaceManager
+
+    with tempfile.TemporaryDirectory() as root:
+        corpora = {}
+        for k in range(n_workspaces):
+            folder = Path(root) / f"corpus_{k:02d}"
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_corpus(str(folder), int(workspace_mb * 1e6), file_bytes=256 * 1024,
+                                vocab_size=20000, n_questions=20, seed=k)
+            questions = json.loads((folder / "questions.json").read_text(encoding="utf-8"))
+            corpora[f"corpus_{k:02d}"] = (sorted(folder.glob("*.txt")), questions)
+
+        # Reference answers with everything resident (no budget pressure)
+        with contextlib.redirect_stdout(io.StringIO()):
+            unlimited = WorkspaceManager(10 ** 6, spill_dir=str(Path(root) / "unlimited"),
+                                         llm=FakeLLM(), cache_dir=None, answer_cache_size=0)
+            for name, (paths, _) in corpora.items():
+                for path in paths:
+                    unlimited.load_document(name, str(path))
+            total_mb = unlimited.resident_bytes() / 1e6
+            expected = {(name, q): unlimited.ask_question(name, q)['sources']
+                        for name, (_, questions) in corpora.items() for q in questions}
+            unlimited.close()
+
+        budget_mb = total_mb * budget_fraction
+        rng = random.Random(0)
+        warm, faulted = [], []
+        peak = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager = WorkspaceManager(budget_mb, spill_dir=str(Path(root) / "spill"),
+                                       llm=FakeLLM(), cache_dir=None, answer_cache_size=0)
+            for name, (paths, _) in corpora.items():
+                for path in paths:
+                    manager.load_document(name, str(path))
+                peak = max(peak, manager.resident_bytes())
+            for _ in range(n_questions):
+                name = rng.choice(list(corpora))
+                question = rng.choice(corpora[name][1])
+                faults = manager.faults
+                start = time.perf_counter()
+                sources = manager.ask_question(name, question)['sources']
+                elapsed = (time.perf_counter() - start) * 1000
+                (faulted if manager.faults > faults else warm).append(elapsed)
+                peak = max(peak, manager.resident_bytes())
+                # Retrieval stays within the workspace and matches the all-resident run
+                assert sources == expected[(name, question)], f"{name}: answer changed after spilling"
+            spills = manager.spills
+            manager.close()
+
+        # Names that differ only in punctuation spill to separate files
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager = WorkspaceManager(0, spill_dir=str(Path(root) / "names"),
+                                       llm=FakeLLM(), cache_dir=None, answer_cache_size=0)
+            names = {"a b": "climate_change.txt", "a_b": "employee_handbook.txt",
+                     "a/b": "machine_learning.txt"}
+            here = Path(__file__).resolve().parent
+            for name, file_name in names.items():
+                manager.load_document(name, str(here / file_name))
+            assert len(set(manager._spill_path(name) for name in names)) == len(names)
+            for name, file_name in names.items():
+                with manager.use(name, create=False) as qa:
+                    assert [doc['file_name'] for doc in qa.documents] == [file_name], name
+            manager.close()
+
+    print(f"\n🔬 Workspaces: {n_workspaces} corpora of ~{workspace_mb:g} MB text, "
+          f"{total_mb:.0f} MB resident if all loaded")
+    print(f"   budget {budget_mb:.0f} MB, peak resident {peak / 1e6:.0f} MB, "
+          f"{spills} spills, {len(faulted)} fault-ins over {n_questions} questions")
+    if warm:
+        print(f"   question, workspace resident: p50 {statistics.median(warm):8.1f} ms")
+    if faulted:
+        ordered = sorted(faulted)
+        print(f"   question, faulted in:         p50 {statistics.median(ordered):8.1f} ms, "
+              f"p95 {percentile(ordered, 95):.1f} ms")
+    print("   ✅ answers identical to the all-resident run; 'a b', 'a_b' and 'a/b' spill and restore separately")
+
+
+def bench_pruning(n_chunks: int, top_ks: List[int], n_terms: int, n_queries: int = 30):
+    """BM25 top_k: MaxScore pruning vs exhaustive scoring (postings read, latency)."""
+    import numpy as np
+    index = InvertedIndex()
+    for term_freqs, length in synthetic_chunk_terms(n_chunks):
+        index.add_chunk_terms(term_freqs, length)
+
+    # Long natural-language questions: a few common words, mostly rarer ones
+    rng = np.random.default_rng(1)
+    queries = [" ".join(f"word{i}" for i in rng.zipf(1.3, n_terms) % 50000)
+               for _ in range(n_queries)]
+
+    rows = []
+    for top_k in top_ks:
+        exhaustive_ms, pruned_ms, read, scored, total_postings = [], [], [], [], []
+        for query in queries:
+            start = time.perf_counter()
+            expected = index.search(query, top_k, pruning=False)
+            exhaustive_ms.append((time.perf_counter() - start) * 1000)
+
+            stats = {}
+            start = time.perf_counter()
+            results = index.search_bm25_pruned(query, top_k, stats)
+            pruned_ms.append((time.perf_counter() - start) * 1000)
+            assert results == expected, f"pruned top_{top_k} differs for {query!r}"
+
+            terms = set(query.split())
+            total_postings.append(sum(len(index.postings.get(term, ())) for term in terms))
+            read.append(stats['postings'])
+            scored.append(stats['scored'])
+        rows.append((top_k, sum(total_postings), sum(read), sum(scored),
+                     statistics.median(exhaustive_ms), statistics.median(pruned_ms)))
+
+    print(f"\n🔬 BM25 dynamic pruning (MaxScore): {n_chunks:,} chunks, "
+          f"{n_queries} queries of {n_terms} terms")
+    print(f"   {'top_k':>6}{'postings':>12}{'read':>12}{'read %':>8}{'scored':>10}"
+          f"{'exhaustive ms':>15}{'pruned ms':>11}{'speedup':>9}")
+    for top_k, total, visited, full, exhaustive, pruned in rows:
+        print(f"   {top_k:>6}{total:>12,}{visited:>12,}{100 * visited / total:>7.1f}%{full:>10,}"
+              f"{exhaustive:>15.2f}{pruned:>11.2f}{exhaustive / pruned:>8.2f}x")
+    print("   ✅ pruned results identical to exhaustive scoring")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Document Q&A benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    retrieval = sub.add_parser("retrieval", help="linear scan vs inverted index")
+    retrieval.add_argument("--copies", type=int, default=200,
+                           help="replicate the example docs this many times")
+    retrieval.add_argument("--top-k", type=int, default=5)
+
+    cache = sub.add_parser("cache", help="cold parse vs warm chunk-cache load")
+    cache.add_argument("files", nargs="*", help="documents to load (default: example docs)")
+
+    ingest = sub.add_parser("ingest", help="ingestion throughput vs worker count")
+    ingest.add_argument("--files", type=int, default=40)
+    ingest.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+
+    memory = sub.add_parser("memory", help="heap held by in-memory vs streaming ingestion")
+    memory.add_argument("--mb", type=int, default=50, help="approximate corpus size")
+
+    context = sub.add_parser("context", help="context tokens: verbatim vs packed")
+    context.add_argument("--top-k", type=int, default=10)
+    context.add_argument("--budget", type=int, default=3000)
+
+    stream = sub.add_parser("stream", help="time to first token vs blocking answer")
+    stream.add_argument("--first-token", type=float, default=0.3, help="fake LLM seconds")
+    stream.add_argument("--per-token", type=float, default=0.02, help="fake LLM seconds")
+
+    batch = sub.add_parser("batch", help="ask_many throughput vs concurrency")
+    batch.add_argument("--questions", type=int, default=60)
+    batch.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    batch.add_argument("--latency", type=float, default=0.2, help="fake LLM seconds per call")
+    batch.add_argument("--rate-limit", type=float, default=None, help="LLM calls per second")
+
+    sparse = sub.add_parser("sparse", help="sparse TF-IDF backend at scale")
+    sparse.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    sparse.add_argument("--compare-max", type=int, default=100000,
+                        help="largest size also run through the BM25 inverted index")
+
+    update = sub.add_parser("update", help="reload one changed file vs full rebuild")
+    update.add_argument("--files", type=int, default=500)
+
+    chunks = sub.add_parser("chunks", help="memory of chunk dicts vs the columnar ChunkStore")
+    chunks.add_argument("--chunks", type=int, default=1000000)
+
+    spans = sub.add_parser("spans", help="overhead of latency instrumentation")
+    spans.add_argument("--questions", type=int, default=300)
+
+    splitter = sub.add_parser("splitter", help="native splitter vs langchain: output and speed")
+    splitter.add_argument("--mb", type=int, default=20, help="approximate corpus size")
+
+    serve = sub.add_parser("serve", help="HTTP /ask throughput and latency, also during /load")
+    serve.add_argument("--requests", type=int, default=200)
+    serve.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    serve.add_argument("--latency", type=float, default=0.05, help="fake LLM seconds per call")
+    serve.add_argument("--reload-files", type=int, default=20,
+                       help="files loaded while questions are being answered")
+
+    workspaces = sub.add_parser("workspaces", help="many corpora under a memory budget")
+    workspaces.add_argument("--workspaces", type=int, default=12)
+    workspaces.add_argument("--mb", type=float, default=2, help="text per workspace")
+    workspaces.add_argument("--budget-fraction", type=float, default=0.3,
+                            help="memory budget as a fraction of all workspaces' size")
+    workspaces.add_argument("--questions", type=int, default=200)
+
+    pruning = sub.add_parser("pruning", help="BM25 MaxScore pruning vs exhaustive scoring")
+    pruning.add_argument("--chunks", type=int, default=200000)
+    pruning.add_argument("--top-k", type=int, nargs="+", default=[1, 5, 10, 50, 100])
+    pruning.add_argument("--terms", type=int, default=20, help="terms per query")
+
+    args = parser.parse_args()
+    if args.command == "retrieval":
+        bench_retrieval(args.copies, args.top_k)
+    elif args.command == "cache":
+        bench_cache(args.files)
+    elif args.command == "ingest":
+        bench_ingest(args.files, args.workers)
+    elif args.command == "memory":
+        bench_memory(args.mb)
+    elif args.command == "context":
+        bench_context(args.top_k, args.budget)
+    elif args.command == "stream":
+        bench_stream(args.first_token, args.per_token)
+    elif args.command == "batch":
+        bench_batch(args.questions, args.concurrency, args.latency, args.rate_limit)
+    elif args.command == "sparse":
+        bench_sparse(args.sizes, compare_max=args.compare_max)
+    elif args.command == "update":
+        bench_update(args.files)
+    elif args.command == "chunks":
+        bench_chunks(args.chunks)
+    elif args.command == "spans":
+        bench_spans(args.questions)
+    elif args.command == "splitter":
+        bench_splitter(args.mb)
+    elif args.command == "serve":
+        bench_serve(args.requests, args.concurrency, args.latency, args.reload_files)
+    elif args.command == "workspaces":
+        bench_workspaces(args.workspaces, args.mb, args.budget_fraction, args.questions)
+    elif args.command == "pruning":
+        bench_pruning(args.chunks, args.top_k, args.terms)
+
+
+if __name__ == "__main__":
+    main()
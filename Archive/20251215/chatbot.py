@@ -5,33 +5,123 @@ No embeddings required - uses context injection with smart chunking
 Modified to use Google's FREE Gemini API
 """
 
+import argparse
 import os
+import pickle
 import sys
-from typing import List, Dict, Tuple
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterator, List, Dict, Tuple
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Document processing
-#from langchain.text_splitters import RecursiveCharacterTextSplitter
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
-from langchain_community.document_loaders import (
-    PyPDFLoader,
-    Docx2txtLoader,
-    TextLoader
-)
-
-# LLM and chains - CHANGED TO GOOGLE
-from langchain_google_genai import ChatGoogleGenerativeAI
-# from langchain.prompts import ChatPromptTemplate
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
+# Document loaders, the Gemini client and the prompt chain (langchain) are
+# imported on first use - see get_loader, DocumentQASystem.llm and
+# _build_chain - so startup does not wait for them (--profile-startup)
 
 # Utilities
 import re
+import time
 from collections import Counter
 from datetime import datetime
 
+from answer_cache import AnswerCache
+from chunk_cache import ChunkCache, file_sha256
+from chunk_store import ChunkStore
+from context_packer import ContextPacker, count_tokens
+from latency import NULL_TRACE, LatencyRecorder, Trace
+from native_splitter import StreamingTextSplitter
+from rate_limiter import RateLimiter
+from text_store import TextStore
+from retrieval import HIGH_CONFIDENCE_SCORES, SCORING_MODES, chunk_terms, make_index
+
+
+def get_loader(file_path: Path):
+    """Choose a document loader based on file extension."""
+    suffix = file_path.suffix.lower()
+    
+    if suffix == '.pdf':
+        from langchain_community.document_loaders import PyPDFLoader
+        return PyPDFLoader(str(file_path))
+    elif suffix == '.docx':
+        from langchain_community.document_loaders import Docx2txtLoader
+        return Docx2txtLoader(str(file_path))
+    elif suffix == '.txt':
+        from langchain_community.document_loaders import TextLoader
+        return TextLoader(str(file_path), encoding='utf-8')
+    else:
+        raise ValueError(f"Unsupported file type: {suffix}")
+
+
+def parse_document(file_path: Path, text_splitter) -> Dict:
+    """
+    Extract and chunk a document (the expensive, cacheable part of loading).
+    Module-level so it can run in a worker process.
+    
+    Args:
+        file_path: Path to the document
+        text_splitter: Splitter used to create chunks (native or langchain)
+        
+    Returns:
+        Dictionary with the full text, chunk texts, word counts, index terms
+        and the time spent loading and splitting
+    """
+    start = time.perf_counter()
+    
+    if file_path.suffix.lower() == '.txt':
+        # Plain text is read directly - the same text TextLoader returns,
+        # without importing langchain's loaders
+        with open(file_path, encoding='utf-8') as f:
+            full_text = f.read()
+    else:
+        loader = get_loader(file_path)
+        
+        # Load document
+        raw_docs = loader.load()
+        
+        # Combine all pages/sections into one text
+        full_text = "\n\n".join([doc.page_content for doc in raw_docs])
+    loaded = time.perf_counter()
+    
+    # Create smart chunks
+    chunks = text_splitter.split_text(full_text)
+    
+    return {
+        'full_text': full_text,
+        'total_words': len(full_text.split()),
+        'chunks': chunks,
+        'word_counts': [len(chunk.split()) for chunk in chunks],
+        'chunk_terms': [chunk_terms(chunk) for chunk in chunks],
+        'timings': {
+            'load_ms': (loaded - start) * 1000,
+            'split_ms': (time.perf_counter() - loaded) * 1000
+        }
+    }
+
+
+def iter_document_text(file_path: Path, block_size: int = 1 << 20) -> Iterator[str]:
+    """
+    Yield a document's text piece by piece; the pieces concatenate to the
+    same text parse_document joins. TXT files are read in blocks of whole
+    lines, PDF/DOCX page by page.
+    
+    Args:
+        file_path: Path to the document
+        block_size: Approximate characters per TXT block
+    """
+    if file_path.suffix.lower() == '.txt':
+        with open(file_path, encoding='utf-8') as f:
+            while True:
+                lines = f.readlines(block_size)
+                if not lines:
+                    break
+                yield "".join(lines)
+        return
+    
+    loader = get_loader(file_path)
+    for page_number, page in enumerate(loader.lazy_load()):
+        yield page.page_content if page_number == 0 else "\n\n" + page.page_content
+
 
 class DocumentQASystem:
     """
@@ -39,53 +129,152 @@ class DocumentQASystem:
     Uses smart chunking and context injection with FREE Google Gemini API.
     """
     
-    def __init__(self, api_key: str = None, model: str = "gemini-pro"):
+    def __init__(self, api_key: str = None, model: str = "gemini-pro",
+                 scoring: str = "bm25", cache_dir: str = ".qa_cache",
+                 streaming: bool = False, text_store_path: str = None,
+                 use_mmap: bool = True, answer_cache_size: int = 256,
+                 answer_cache_ttl: float = 3600, answer_cache_path: str = None,
+                 context_token_budget: int = 3000, llm=None,
+                 instrument: bool = False, latency_log_path: str = None,
+                 splitter: str = "native"):
         """
         Initialize the Q&A system with Google Gemini (FREE).
         
         Args:
             api_key: Google API key (or set GOOGLE_API_KEY env variable)
             model: Gemini model to use (gemini-pro is free and capable)
+            scoring: Chunk scoring - "bm25", "legacy" for the original
+                     keyword scores, or "tfidf" for the vectorized sparse
+                     TF-IDF backend (needs numpy and scipy)
+            cache_dir: Directory for the parsed-chunk cache (None disables it)
+            streaming: Split documents page by page and keep chunk text in an
+                       on-disk text store instead of memory
+            text_store_path: File for the streaming text store (default: temp file)
+            use_mmap: Read streamed chunk text through a memory map
+            answer_cache_size: Answers kept in memory (0 disables the answer cache)
+            answer_cache_ttl: Seconds before a cached answer expires
+            answer_cache_path: SQLite file for a persistent answer cache tier
+            context_token_budget: Maximum tokens of document context per question
+            llm: Chat model to use instead of Gemini (e.g. fake_llm.FakeLLM
+                 for offline runs); no API key is needed then
+            instrument: Time every pipeline stage (see latency.py) and add
+                        the timings to responses as 'spans'
+            latency_log_path: Also append each question's/load's timings to
+                              this JSON-lines file (implies instrument)
+            splitter: "native" (single-pass StreamingTextSplitter) or
+                      "langchain" (RecursiveCharacterTextSplitter); both
+                      produce the same chunks
         """
+        if scoring not in SCORING_MODES:
+            raise ValueError(f"Unknown scoring mode: {scoring} (choose from {SCORING_MODES})")
+        if splitter not in ("native", "langchain"):
+            raise ValueError(f"Unknown splitter: {splitter} (choose native or langchain)")
+
         load_dotenv()
         self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
-        if not self.api_key:
+        if not self.api_key and llm is None:
             raise ValueError(
                 "API key required! Set GOOGLE_API_KEY environment variable "
                 "or pass api_key parameter.\n"
                 "Get your FREE API key at: https://makersuite.google.com/app/apikey"
             )
         
-        self.model = model
-        self.llm = ChatGoogleGenerativeAI(
-            model=self.model,
-            google_api_key=self.api_key,
-            temperature=0
-        )
+        if llm is not None:
+            self.model = getattr(llm, "model_name", None) or getattr(llm, "model", None) or model
+        else:
+            self.model = model
+        # The Gemini client is created at the first question (see the llm property)
+        self._llm = llm
+        self._llm_lock = threading.Lock()
         
         # Smart text splitter - recursive with semantic awareness
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1500,  # Optimal size for context
-            chunk_overlap=300,  # Overlap to maintain context
-            length_function=len,
-            separators=[
-                "\n\n",  # Paragraphs first
-                "\n",    # Then lines
-                ". ",    # Then sentences
-                ", ",    # Then clauses
-                " ",     # Then words
-                ""       # Finally characters
-            ],
-            is_separator_regex=False
+        self.chunk_size = 1500  # Optimal size for context
+        self.chunk_overlap = 300  # Overlap to maintain context
+        self.separators = [
+            "\n\n",  # Paragraphs first
+            "\n",    # Then lines
+            ". ",    # Then sentences
+            ", ",    # Then clauses
+            " ",     # Then words
+            ""       # Finally characters
+        ]
+        if splitter == "native":
+            self.text_splitter = StreamingTextSplitter(
+                self.chunk_size, self.chunk_overlap, self.separators
+            )
+        else:
+            from langchain_text_splitters import RecursiveCharacterTextSplitter
+            self.text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=self.chunk_size,
+                chunk_overlap=self.chunk_overlap,
+                length_function=len,
+                separators=self.separators,
+                is_separator_regex=False
+            )
+        # Streaming ingestion always splits pages with split_pieces, which yields
+        # exactly the chunks of a whole-text split (the langchain splitter can
+        # only re-split buffered windows, which shifts chunk boundaries)
+        self.stream_splitter = self.text_splitter if splitter == "native" else StreamingTextSplitter(
+            self.chunk_size, self.chunk_overlap, self.separators
         )
         
+        # Parsed chunks keyed by file content hash + splitter settings
+        self.chunk_cache = ChunkCache(
+            cache_dir, self.chunk_size, self.chunk_overlap, self.separators
+        ) if cache_dir else None
+        
+        # Streaming mode: chunk text lives once, on disk
+        self.text_store = TextStore(text_store_path, use_mmap=use_mmap) if streaming else None
+        
+        # Merges overlapping neighbour chunks and fills the token budget by relevance
+        self.context_packer = ContextPacker(context_token_budget, self.chunk_overlap)
+        
+        # Answers keyed by normalized question + retrieved chunks + model
+        self.answer_cache = AnswerCache(
+            answer_cache_size, answer_cache_ttl, answer_cache_path
+        ) if answer_cache_size > 0 else None
+        
+        # Content hash and parse (if running) per file, from load_multiple_documents' process pool
+        self._prefetched: Dict[Path, Tuple[str, Future]] = {}
+        
+        # Per-stage timings; None keeps the pipeline on the no-op NULL_TRACE
+        self.latency = LatencyRecorder(log_path=latency_log_path) \
+            if instrument or latency_log_path else None
+        
+        # Slots of all_chunks emptied by remove_document (None entries)
+        self._removed_chunks = 0
+        
+        # Held while documents/all_chunks/index change and while they are searched,
+        # so a background loader never exposes a half-indexed document
+        self._index_lock = threading.RLock()
+        
         # Store loaded documents
         self.documents: List[Dict] = []
-        self.all_chunks: List[Dict] = []
+        # Chunk metadata in columns; all_chunks[i] builds a chunk dict on demand
+        self.all_chunks = ChunkStore(self.text_store)
+        
+        # Retrieval index over all_chunks, built once per chunk at load time
+        self.scoring = scoring
+        self.index = make_index(scoring)
         
         print(f"✅ DocumentQA System initialized with FREE Google Gemini: {self.model}")
     
     
+    @property
+    def llm(self):
+        """Chat model; the Gemini client is imported and created on first use."""
+        if self._llm is None:
+            with self._llm_lock:
+                if self._llm is None:
+                    from langchain_google_genai import ChatGoogleGenerativeAI
+                    self._llm = ChatGoogleGenerativeAI(
+                        model=self.model,
+                        google_api_key=self.api_key,
+                        temperature=0
+                    )
+        return self._llm
+    
+    
     def load_document(self, file_path: str) -> Dict:
         """
         Load a document from file path.
@@ -102,61 +291,81 @@ class DocumentQASystem:
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
         
+        content_hash, future = self._prefetched.pop(file_path, (None, None))
+        content_hash = content_hash or file_sha256(file_path)
+        
+        # Loading a file that is already loaded reloads it - only if it changed
+        existing = self._find_document(str(file_path), by_name=False)
+        if existing is not None and existing['content_hash'] == content_hash:
+            print(f"\n⏭️  {file_path.name} is unchanged - skipping reload")
+            if future is not None:
+                future.cancel()
+            return existing
+        
         print(f"\n📄 Loading: {file_path.name}")
+        trace = self._trace("load")
         
         try:
-            # Choose loader based on file extension
-            suffix = file_path.suffix.lower()
-            
-            if suffix == '.pdf':
-                loader = PyPDFLoader(str(file_path))
-            elif suffix == '.docx':
-                loader = Docx2txtLoader(str(file_path))
-            elif suffix == '.txt':
-                loader = TextLoader(str(file_path), encoding='utf-8')
+            if self.text_store is not None:
+                # Reading and splitting are interleaved, so both count as "load"
+                with trace.span("load"):
+                    doc_info, terms_per_chunk = self._stream_document(file_path)
             else:
-                raise ValueError(f"Unsupported file type: {suffix}")
-            
-            # Load document
-            raw_docs = loader.load()
-            
-            # Combine all pages/sections into one text
-            full_text = "\n\n".join([doc.page_content for doc in raw_docs])
-            
-            # Create smart chunks
-            chunks = self.text_splitter.create_documents([full_text])
-            
-            # Add metadata to chunks
-            chunk_dicts = []
-            for idx, chunk in enumerate(chunks):
-                chunk_dict = {
-                    'content': chunk.page_content,
-                    'chunk_id': idx,
-                    'document_name': file_path.name,
-                    'char_count': len(chunk.page_content),
-                    'word_count': len(chunk.page_content.split())
+                parsed = self._read_document(file_path, content_hash, future, trace)
+                full_text = parsed['full_text']
+                
+                # Add metadata to chunks
+                chunk_dicts = []
+                chunk_rows = zip(parsed['chunks'], parsed['word_counts'])
+                for idx, (content, word_count) in enumerate(chunk_rows):
+                    chunk_dict = {
+                        'content': content,
+                        'chunk_id': idx,
+                        'document_name': file_path.name,
+                        'char_count': len(content),
+                        'word_count': word_count
+                    }
+                    chunk_dicts.append(chunk_dict)
+                terms_per_chunk = parsed['chunk_terms']
+                
+                # Store document info
+                doc_info = {
+                    'file_name': file_path.name,
+                    'file_path': str(file_path),
+                    'loaded_at': datetime.now().isoformat(),
+                    'full_text': full_text,
+                    'chunks': chunk_dicts,
+                    'total_chunks': len(chunk_dicts),
+                    'total_chars': len(full_text),
+                    'total_words': parsed['total_words']
                 }
-                chunk_dicts.append(chunk_dict)
-                self.all_chunks.append(chunk_dict)
-            
-            # Store document info
-            doc_info = {
-                'file_name': file_path.name,
-                'file_path': str(file_path),
-                'loaded_at': datetime.now().isoformat(),
-                'full_text': full_text,
-                'chunks': chunk_dicts,
-                'total_chunks': len(chunk_dicts),
-                'total_chars': len(full_text),
-                'total_words': len(full_text.split())
-            }
             
-            self.documents.append(doc_info)
+            doc_info['content_hash'] = content_hash
+            
+            # Parsing happened above without the lock; swapping the new version
+            # in is quick, and queries see the old document or the new one
+            index_start = time.perf_counter()
+            with self._index_lock:
+                existing = self._find_document(str(file_path), by_name=False)
+                if existing is not None:
+                    self.remove_document(existing['file_path'])
+                first_chunk_index = len(self.all_chunks)
+                for chunk_dict, terms in zip(doc_info['chunks'], terms_per_chunk):
+                    self.all_chunks.append(chunk_dict)
+                    self.index.add_chunk_terms(*terms)
+                # The per-chunk dicts are dropped; the document reads them back from the store
+                doc_info['first_chunk_index'] = first_chunk_index
+                doc_info['chunks'] = self.all_chunks.view(first_chunk_index, doc_info['total_chunks'])
+                self.documents.append(doc_info)
+            trace.since("index", index_start)
+            
+            if trace.enabled:
+                doc_info['spans'] = self.latency.finish(trace, document=file_path.name)
             
             print(f"✅ Loaded successfully!")
-            print(f"   📊 Stats: {len(chunk_dicts)} chunks, "
-                  f"{len(full_text.split())} words, "
-                  f"{len(full_text):,} characters")
+            print(f"   📊 Stats: {doc_info['total_chunks']} chunks, "
+                  f"{doc_info['total_words']} words, "
+                  f"{doc_info['total_chars']:,} characters")
             
             return doc_info
             
@@ -165,16 +374,307 @@ class DocumentQASystem:
             raise
     
     
-    def load_multiple_documents(self, file_paths: List[str]) -> List[Dict]:
+    def _stream_document(self, file_path: Path) -> Dict:
+        """
+        Load a document without holding its text in memory.
+        
+        Pages are split as they are read; each chunk's text goes to the text
+        store once and the chunk keeps only its offset and length. The full
+        text is never built, so doc_info['full_text'] is None. Streaming
+        bypasses the chunk cache, whose entries hold the whole text.
+        
+        Args:
+            file_path: Path to the document
+            
+        Returns:
+            (document info, index terms of each chunk) - the caller adds the
+            chunks to the index
+        """
+        chunk_dicts = []
+        terms_per_chunk = []
+        totals = {'chars': 0, 'words': 0}
+        
+        def counted_pieces():
+            for piece in iter_document_text(file_path):
+                totals['chars'] += len(piece)
+                totals['words'] += len(piece.split())
+                yield piece
+        
+        for idx, content in enumerate(self.stream_splitter.split_pieces(counted_pieces())):
+            offset, length = self.text_store.append(content)
+            chunk_dict = {
+                'chunk_id': idx,
+                'document_name': file_path.name,
+                'char_count': len(content),
+                'word_count': len(content.split()),
+                'text_offset': offset,
+                'text_length': length
+            }
+            chunk_dicts.append(chunk_dict)
+            terms_per_chunk.append(chunk_terms(content))
+        
+        doc_info = {
+            'file_name': file_path.name,
+            'file_path': str(file_path),
+            'loaded_at': datetime.now().isoformat(),
+            'full_text': None,
+            'chunks': chunk_dicts,
+            'total_chunks': len(chunk_dicts),
+            'total_chars': totals['chars'],
+            'total_words': totals['words']
+        }
+        return doc_info, terms_per_chunk
+    
+    
+    def _read_document(self, file_path: Path, content_hash: str,
+                       future: Future = None, trace: Trace = NULL_TRACE) -> Dict:
+        """
+        Get a document's parsed chunks from the chunk cache, a prefetch
+        worker, or by parsing it now - in that order.
+        
+        Args:
+            file_path: Path to the document
+            content_hash: SHA-256 of the file contents
+            future: Parse already running in a worker process, if any
+            trace: Receives "cache", "load" and "split" timings
+            
+        Returns:
+            Parsed document dictionary (see parse_document)
+        """
+        if self.chunk_cache:
+            cache_key = self.chunk_cache.key_for(file_path, content_hash)
+            if future is None:
+                with trace.span("cache"):
+                    parsed = self.chunk_cache.get(cache_key)
+                if parsed is not None:
+                    print("⚡ Using cached chunks (file unchanged)")
+                    return parsed
+        
+        if future is not None:
+            parsed = future.result()
+        else:
+            parsed = parse_document(file_path, self.text_splitter)
+        # Measured where the parse ran (possibly a worker process)
+        trace.add("load", parsed['timings']['load_ms'])
+        trace.add("split", parsed['timings']['split_ms'])
+        
+        if self.chunk_cache:
+            self.chunk_cache.put(cache_key, parsed)
+        return parsed
+    
+    
+    def _find_document(self, name_or_path: str, by_name: bool = True) -> Dict:
+        """
+        Loaded document matching a file path, or else a bare file name (None if absent).
+        
+        Loading passes by_name=False: notes.txt in the current folder is a
+        different file from an already loaded a/notes.txt.
+        """
+        target = Path(name_or_path).resolve()
+        for doc in self.documents:
+            if Path(doc['file_path']).resolve() == target:
+                return doc
+        if not by_name or Path(name_or_path).name != name_or_path:
+            return None  # a path that is not loaded - don't fall back to its name
+        for doc in self.documents:
+            if doc['file_name'] == name_or_path:
+                return doc
+        return None
+    
+    
+    def has_document(self, name_or_path: str) -> bool:
+        """Whether a document with this file path (or file name) is loaded."""
+        return self._find_document(name_or_path) is not None
+    
+    
+    def remove_document(self, name_or_path: str) -> bool:
+        """
+        Remove one loaded document and its chunks.
+        
+        The document's chunks are taken out of the index one by one, so
+        document frequencies and lengths stay correct without a rebuild.
+        Their slots in all_chunks read as None until the next compaction.
+        
+        Args:
+            name_or_path: File path or file name of a loaded document
+            
+        Returns:
+            True if a document was removed
+        """
+        with self._index_lock:
+            doc = self._find_document(name_or_path)
+            if doc is None:
+                print(f"⚠️  Not loaded: {name_or_path}")
+                return False
+            
+            start = doc['first_chunk_index']
+            for slot in range(start, start + doc['total_chunks']):
+                self.index.remove_chunk(slot, self.all_chunks.content(slot))
+                self.all_chunks.remove(slot)
+            self._removed_chunks += doc['total_chunks']
+            self.documents.remove(doc)
+            
+            # Rebuild once removed slots outnumber live ones, so holes stay bounded
+            if self._removed_chunks > self.chunk_count:
+                self._compact()
+        
+        if self.answer_cache is not None:
+            self.answer_cache.invalidate_documents([doc['file_name']])
+        
+        print(f"🗑️  Removed {doc['file_name']} ({doc['total_chunks']} chunks)")
+        return True
+    
+    
+    def reload_document(self, file_path: str) -> Dict:
+        """
+        Re-read a document if its content changed since it was loaded.
+        
+        An unchanged file (same content hash) is skipped; a changed one is
+        removed and indexed again, which costs about as much as loading it.
+        
+        Args:
+            file_path: Path to the document
+            
+        Returns:
+            Dictionary with document info
+        """
+        return self.load_document(file_path)
+    
+    
+    @property
+    def chunk_count(self) -> int:
+        """Number of chunks of the loaded documents."""
+        return len(self.all_chunks) - self._removed_chunks
+    
+    
+    def _trace(self, kind: str) -> Trace:
+        """A new Trace when instrumentation is on, else the shared no-op one."""
+        return self.latency.start(kind) if self.latency is not None else NULL_TRACE
+    
+    
+    def latency_report(self) -> str:
+        """Per-stage latency percentiles and histograms (the 'stats' command)."""
+        if self.latency is None:
+            return "📈 Latency instrumentation is off (start with --instrument)"
+        return self.latency.report()
+    
+    
+    def close(self):
+        """Close the streaming text store and the latency log (if any)."""
+        if self.text_store is not None:
+            self.text_store.close()
+        if self.latency is not None:
+            self.latency.close()
+    
+    
+    def _compact(self):
+        """Drop removed slots from all_chunks and rebuild the index to match."""
+        old_chunks = self.all_chunks
+        self.all_chunks = ChunkStore(self.text_store)
+        self.index = make_index(self.scoring)
+        for doc in self.documents:
+            start = len(self.all_chunks)
+            for slot in range(doc['first_chunk_index'], doc['first_chunk_index'] + doc['total_chunks']):
+                position = self.all_chunks.copy_from(old_chunks, slot)
+                self.index.add_chunk(self.all_chunks.content(position))
+            doc['first_chunk_index'] = start
+            doc['chunks'] = self.all_chunks.view(start, doc['total_chunks'])
+        self._removed_chunks = 0
+    
+    
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the loaded documents, chunk store and index."""
+        with self._index_lock:
+            text = sum(sys.getsizeof(doc['full_text']) for doc in self.documents
+                       if doc['full_text'] is not None)
+            return text + self.all_chunks.memory_bytes() + self.index.memory_bytes()
+    
+    
+    def spill(self, path: str):
+        """
+        Write the loaded documents, chunks and index to a file and drop them
+        from memory (see workspaces.py); restore() brings them back.
+        
+        Args:
+            path: File to write (pickle, like the chunk cache)
+        """
+        with self._index_lock:
+            state = {
+                'documents': self.documents,
+                'all_chunks': self.all_chunks,
+                'index': self.index,
+                'removed_chunks': self._removed_chunks
+            }
+            with open(path, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            self.documents = []
+            self.all_chunks = ChunkStore(self.text_store)
+            self.index = make_index(self.scoring)
+            self._removed_chunks = 0
+    
+    
+    def restore(self, path: str):
+        """
+        Replace the loaded documents with those saved by spill().
+        
+        Args:
+            path: File written by spill()
+        """
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        state['all_chunks'].text_store = self.text_store
+        with self._index_lock:
+            self.documents = state['documents']
+            self.all_chunks = state['all_chunks']
+            self.index = state['index']
+            self._removed_chunks = state['removed_chunks']
+    
+    
+    def load_multiple_documents(self, file_paths: List[str],
+                                workers: int = 1) -> List[Dict]:
         """
         Load multiple documents at once.
         
+        With workers > 1, files missing from the chunk cache are parsed and
+        split in a process pool. Results are still added in the order given,
+        so chunk ordering and ids match sequential loading. Streaming loads
+        stay sequential: workers would build each file's full text and chunks
+        and send them back, which is what streaming avoids.
+        
         Args:
             file_paths: List of file paths
+            workers: Number of worker processes for parsing (1 = sequential)
             
         Returns:
             List of document info dictionaries
         """
+        if workers <= 1 or len(file_paths) < 2 or self.text_store is not None:
+            return self._load_in_order(file_paths)
+        
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for path in file_paths:
+                file_path = Path(path)
+                if file_path in self._prefetched or not file_path.is_file():
+                    continue  # load_document reports missing files
+                try:
+                    content_hash = file_sha256(file_path)
+                except OSError:
+                    continue
+                if self.chunk_cache and self.chunk_cache.contains(
+                        self.chunk_cache.key_for(file_path, content_hash)):
+                    self._prefetched[file_path] = (content_hash, None)
+                    continue
+                future = pool.submit(parse_document, file_path, self.text_splitter)
+                self._prefetched[file_path] = (content_hash, future)
+            
+            try:
+                return self._load_in_order(file_paths)
+            finally:
+                self._prefetched.clear()
+    
+    
+    def _load_in_order(self, file_paths: List[str]) -> List[Dict]:
+        """Load files one by one, skipping (and reporting) failures."""
         results = []
         for path in file_paths:
             try:
@@ -238,34 +738,39 @@ class DocumentQASystem:
         return min(score, 1.0)  # Cap at 1.0
     
     
-    def find_relevant_chunks(self, query: str, top_k: int = 5) -> List[Dict]:
+    def find_relevant_chunks(self, query: str, top_k: int = 5,
+                             scoring: str = None) -> List[Dict]:
         """
         Find most relevant chunks for a query using keyword matching.
         
+        Only the index postings for the query terms are scored; chunks
+        that share no term with the query are never touched.
+        
         Args:
             query: User's question
             top_k: Number of top chunks to return
+            scoring: Override the scoring mode for this call
+                     ("legacy" reproduces _calculate_relevance_score)
             
         Returns:
             List of relevant chunks with scores
         """
-        if not self.all_chunks:
-            raise ValueError("No documents loaded! Load documents first.")
-        
-        # Score all chunks
-        scored_chunks = []
-        for chunk in self.all_chunks:
-            score = self._calculate_relevance_score(query, chunk['content'])
-            if score > 0:  # Only include chunks with some relevance
-                scored_chunks.append({
-                    **chunk,
+        # Documents being added or removed concurrently are never seen half-indexed
+        with self._index_lock:
+            if not self.chunk_count:
+                raise ValueError("No documents loaded! Load documents first.")
+            
+            results = self.index.search(query, top_k=top_k, scoring=scoring or self.scoring)
+            
+            # Only the returned chunks are materialized as dicts
+            return [
+                {
+                    **self.all_chunks[chunk_idx],
+                    'content': self.all_chunks.content(chunk_idx),
                     'relevance_score': score
-                })
-        
-        # Sort by score and return top_k
-        scored_chunks.sort(key=lambda x: x['relevance_score'], reverse=True)
-        
-        return scored_chunks[:top_k]
+                }
+                for chunk_idx, score in results
+            ]
     
     
     def ask_question(self, question: str, top_k: int = 5, 
@@ -279,36 +784,304 @@ class DocumentQASystem:
             show_sources: Whether to return source chunks
             
         Returns:
-            Dictionary with answer and metadata
+            Dictionary with answer and metadata ('spans' holds per-stage
+            milliseconds when instrumentation is on)
+        """
+        trace = self._trace("question")
+        prepared = self._prepare_question(question, top_k, trace)
+        if prepared is None:
+            response = self._no_answer_response(question)
+        else:
+            answer = prepared['cached_answer']
+            if answer is None:
+                answer = self._generate_answer(question, prepared['context'], trace)
+                self._remember_answer(prepared, answer)
+            response = self._build_response(prepared, answer, show_sources)
+        
+        if trace.enabled:
+            response['spans'] = self.latency.finish(trace, question=question)
+        return response
+    
+    
+    def ask_question_stream(self, question: str, top_k: int = 5,
+                            show_sources: bool = True) -> Iterator[Dict]:
+        """
+        Ask a question and stream the answer as it is generated.
+        
+        Yields {'type': 'token', 'text': ...} events as the LLM produces
+        text, then one {'type': 'final', 'response': ...} event holding the
+        same dictionary ask_question returns plus 'timings' (milliseconds
+        for retrieval, time to first token and total).
+        
+        Args:
+            question: The question to ask
+            top_k: Number of relevant chunks to use
+            show_sources: Whether to return source chunks
+        """
+        trace = self._trace("question")
+        start = time.perf_counter()
+        prepared = self._prepare_question(question, top_k, trace)
+        retrieved = time.perf_counter()
+        
+        first_token_at = None
+        parts = []
+        if prepared is None:
+            response = self._no_answer_response(question)
+            first_token_at = time.perf_counter()
+            yield {'type': 'token', 'text': response['answer']}
+        else:
+            if prepared['cached_answer'] is not None:
+                token_stream = [prepared['cached_answer']]
+            else:
+                print("💭 Streaming answer with FREE Gemini API...")
+                token_stream = self._build_chain().stream(
+                    {"context": prepared['context'], "question": question}
+                )
+            
+            for text in token_stream:
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                    if prepared['cached_answer'] is None:
+                        trace.since("llm_first_token", retrieved)
+                parts.append(text)
+                yield {'type': 'token', 'text': text}
+            if prepared['cached_answer'] is None:
+                trace.since("llm_total", retrieved)
+            
+            answer = "".join(parts)
+            if prepared['cached_answer'] is None:
+                self._remember_answer(prepared, answer)
+            response = self._build_response(prepared, answer, show_sources)
+        
+        end = time.perf_counter()
+        response['timings'] = {
+            'retrieval_ms': (retrieved - start) * 1000,
+            'time_to_first_token_ms': ((first_token_at or end) - retrieved) * 1000,
+            'total_ms': (end - start) * 1000
+        }
+        if trace.enabled:
+            response['spans'] = self.latency.finish(trace, question=question)
+        yield {'type': 'final', 'response': response}
+    
+    
+    def ask_many(self, questions: List[str], top_k: int = 5, concurrency: int = 4,
+                 rate_limit: float = None, show_sources: bool = True) -> List[Dict]:
+        """
+        Answer a batch of questions, running the LLM calls concurrently.
+        
+        Retrieval and context packing run in this thread, one question at a
+        time; the LLM calls go to a thread pool. Results come back in the
+        order of `questions`, each with 'timings' in milliseconds (retrieval,
+        queue wait, LLM call, total). A question whose LLM call fails gets
+        'answer': None and an 'error' message instead of aborting the batch.
+        
+        Args:
+            questions: Questions to ask
+            top_k: Number of relevant chunks to use per question
+            concurrency: Maximum LLM calls in flight
+            rate_limit: Maximum LLM calls started per second (None = unlimited)
+            show_sources: Whether to return source chunks
+            
+        Returns:
+            List of response dictionaries, one per question
+        """
+        limiter = RateLimiter(rate_limit) if rate_limit else None
+        chain = self._build_chain()
+        
+        def call_llm(prepared: Dict) -> Tuple[str, float, float]:
+            if limiter is not None:
+                limiter.acquire()
+            started = time.perf_counter()
+            answer = chain.invoke({"context": prepared['context'],
+                                   "question": prepared['question']})
+            return answer, started, time.perf_counter()
+        
+        results: List[Dict] = [None] * len(questions)
+        pending = []
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for i, question in enumerate(questions):
+                trace = self._trace("question")
+                submitted = time.perf_counter()
+                prepared = self._prepare_question(question, top_k, trace)
+                retrieval_ms = (time.perf_counter() - submitted) * 1000
+                
+                if prepared is None:
+                    results[i] = self._no_answer_response(question)
+                elif prepared['cached_answer'] is not None:
+                    results[i] = self._build_response(prepared, prepared['cached_answer'],
+                                                      show_sources)
+                else:
+                    future = pool.submit(call_llm, prepared)
+                    pending.append((i, future, prepared, submitted, retrieval_ms, trace))
+                    continue
+                results[i]['timings'] = {'retrieval_ms': retrieval_ms, 'queue_ms': 0.0,
+                                         'llm_ms': 0.0, 'total_ms': retrieval_ms}
+                if trace.enabled:
+                    results[i]['spans'] = self.latency.finish(trace, question=question)
+            
+            for i, future, prepared, submitted, retrieval_ms, trace in pending:
+                try:
+                    answer, started, finished = future.result()
+                except Exception as e:
+                    results[i] = {'question': prepared['question'], 'answer': None,
+                                  'error': str(e), 'confidence': 'low', 'sources': []}
+                    finished = started = time.perf_counter()
+                else:
+                    self._remember_answer(prepared, answer)
+                    results[i] = self._build_response(prepared, answer, show_sources)
+                
+                llm_submitted = submitted + retrieval_ms / 1000
+                results[i]['timings'] = {
+                    'retrieval_ms': retrieval_ms,
+                    'queue_ms': max(started - llm_submitted, 0.0) * 1000,
+                    'llm_ms': (finished - started) * 1000,
+                    'total_ms': (finished - submitted) * 1000
+                }
+                if trace.enabled:
+                    # Blocking calls have no first token; only the LLM total is known
+                    trace.add("llm_total", (finished - started) * 1000)
+                    results[i]['spans'] = self.latency.finish(trace, question=prepared['question'])
+        
+        return results
+    
+    
+    def _prepare_question(self, question: str, top_k: int,
+                          trace: Trace = NULL_TRACE) -> Dict:
+        """
+        Retrieve and pack context for a question and check the answer cache.
+        
+        Args:
+            question: The question to ask
+            top_k: Number of relevant chunks to use
+            trace: Receives "score" and "context" timings
+            
+        Returns:
+            Dictionary with the chunks, packed context and any cached answer,
+            or None if no chunk is relevant
         """
         if not self.documents:
             raise ValueError("No documents loaded! Load documents first using load_document()")
         
         print(f"\n🤔 Question: {question}")
-        print(f"🔍 Searching through {len(self.all_chunks)} chunks...")
+        print(f"🔍 Searching through {self.chunk_count} chunks...")
         
         # Find relevant chunks
-        relevant_chunks = self.find_relevant_chunks(question, top_k=top_k)
+        with trace.span("score"):
+            relevant_chunks = self.find_relevant_chunks(question, top_k=top_k)
         
         if not relevant_chunks:
-            return {
-                'answer': "I couldn't find relevant information in the documents to answer this question.",
-                'confidence': 'low',
-                'sources': [],
-                'question': question
-            }
+            return None
         
         print(f"✅ Found {len(relevant_chunks)} relevant chunks")
         
-        # Prepare context from chunks
-        context_parts = []
-        for i, chunk in enumerate(relevant_chunks):
-            context_parts.append(
-                f"[Document: {chunk['document_name']}, Chunk {chunk['chunk_id']}]\n"
-                f"{chunk['content']}\n"
-            )
+        # Pack chunks into the context under the token budget
+        with trace.span("context"):
+            context, packed_chunks = self.context_packer.pack(relevant_chunks)
+            context_tokens = count_tokens(context)
+        print(f"📦 Context: {len(packed_chunks)} chunks, {context_tokens} tokens")
+        
+        # Reuse the answer if this question was already asked over the same context
+        cache_key = None
+        cached_answer = None
+        if self.answer_cache is not None:
+            cache_key = AnswerCache.make_key(question, packed_chunks, self.model)
+            cached_answer = self.answer_cache.get(cache_key)
+            if cached_answer is not None:
+                print("⚡ Answer served from cache")
+        
+        return {
+            'question': question,
+            'relevant_chunks': relevant_chunks,
+            'packed_chunks': packed_chunks,
+            'context': context,
+            'context_tokens': context_tokens,
+            'cache_key': cache_key,
+            'cached_answer': cached_answer
+        }
+    
+    
+    def _remember_answer(self, prepared: Dict, answer: str):
+        """Store a freshly generated answer in the answer cache."""
+        if self.answer_cache is not None:
+            self.answer_cache.put(prepared['cache_key'], answer,
+                                  [chunk['document_name'] for chunk in prepared['packed_chunks']])
+    
+    
+    @staticmethod
+    def _no_answer_response(question: str) -> Dict:
+        """Response when no chunk is relevant to the question."""
+        return {
+            'answer': "I couldn't find relevant information in the documents to answer this question.",
+            'confidence': 'low',
+            'sources': [],
+            'question': question
+        }
+    
+    
+    def _build_response(self, prepared: Dict, answer: str, show_sources: bool) -> Dict:
+        """Assemble the response dictionary returned by ask_question."""
+        relevant_chunks = prepared['relevant_chunks']
+        packed_chunks = prepared['packed_chunks']
         
-        context = "\n---\n".join(context_parts)
+        response = {
+            'answer': answer,
+            'question': prepared['question'],
+            'chunks_used': len(packed_chunks),
+            'documents_searched': len(self.documents),
+            'confidence': ('high' if relevant_chunks[0]['relevance_score'] > HIGH_CONFIDENCE_SCORES[self.scoring]
+                           else 'medium'),
+            'cached': prepared['cached_answer'] is not None,
+            'context_tokens': prepared['context_tokens']
+        }
+        
+        if show_sources:
+            response['sources'] = [
+                {
+                    'document': chunk['document_name'],
+                    'chunk_id': chunk['chunk_id'],
+                    'relevance_score': round(chunk['relevance_score'], 3),
+                    'preview': chunk['content'][:200] + "..." if len(chunk['content']) > 200 else chunk['content']
+                }
+                for chunk in packed_chunks
+            ]
+        
+        return response
+    
+    
+    def _generate_answer(self, question: str, context: str,
+                         trace: Trace = NULL_TRACE) -> str:
+        """
+        Ask the LLM to answer from the given context.
+        
+        Args:
+            question: The question to ask
+            context: Packed document excerpts with citations
+            trace: Receives "llm_first_token" and "llm_total" timings
+            
+        Returns:
+            The answer text
+        """
+        print("💭 Generating answer with FREE Gemini API...")
+        chain = self._build_chain()
+        inputs = {"context": context, "question": question}
+        if not trace.enabled:
+            return chain.invoke(inputs)
+        
+        # Streaming gives the same text and shows when the first token arrived
+        start = time.perf_counter()
+        parts = []
+        for text in chain.stream(inputs):
+            if not parts:
+                trace.since("llm_first_token", start)
+            parts.append(text)
+        trace.since("llm_total", start)
+        return "".join(parts)
+    
+    
+    def _build_chain(self):
+        """Prompt -> LLM -> text chain used for every answer."""
+        from langchain_core.output_parsers import StrOutputParser
+        from langchain_core.prompts import ChatPromptTemplate
         
         # Create prompt
         prompt = ChatPromptTemplate.from_messages([
@@ -336,32 +1109,8 @@ Answer the question based on the context above. Be specific and helpful.""")
             | StrOutputParser()
         )
         
-        # Get answer
-        print("💭 Generating answer with FREE Gemini API...")
-        answer = chain.invoke({"context": context, "question": question})
+        return chain
         
-        # Prepare response
-        response = {
-            'answer': answer,
-            'question': question,
-            'chunks_used': len(relevant_chunks),
-            'documents_searched': len(self.documents),
-            'confidence': 'high' if relevant_chunks[0]['relevance_score'] > 0.5 else 'medium'
-        }
-        
-        if show_sources:
-            response['sources'] = [
-                {
-                    'document': chunk['document_name'],
-                    'chunk_id': chunk['chunk_id'],
-                    'relevance_score': round(chunk['relevance_score'], 3),
-                    'preview': chunk['content'][:200] + "..." if len(chunk['content']) > 200 else chunk['content']
-                }
-                for chunk in relevant_chunks
-            ]
-        
-        return response
-    
     
     def get_document_summary(self) -> str:
         """
@@ -382,15 +1131,31 @@ Answer the question based on the context above. Be specific and helpful.""")
             summary += f"   • Characters: {doc['total_chars']:,}\n"
             summary += f"   • Loaded: {doc['loaded_at']}\n"
         
-        summary += f"\n📊 TOTAL: {len(self.documents)} documents, {len(self.all_chunks)} chunks\n"
+        summary += f"\n📊 TOTAL: {len(self.documents)} documents, {self.chunk_count} chunks\n"
+        
+        if self.chunk_cache:
+            stats = self.chunk_cache.stats()
+            summary += (f"💾 Chunk cache: {stats['hits']} hits, {stats['misses']} misses "
+                        f"({stats['hit_rate']:.0%} hit rate, {stats['entries']} entries)\n")
+        if self.answer_cache is not None:
+            stats = self.answer_cache.stats()
+            summary += (f"💾 Answer cache: {stats['hits']} hits, {stats['misses']} misses "
+                        f"({stats['hit_rate']:.0%} hit rate, {stats['entries']} entries)\n")
         
         return summary
     
     
     def clear_documents(self):
         """Clear all loaded documents."""
-        self.documents = []
-        self.all_chunks = []
+        with self._index_lock:
+            self.documents = []
+            self.all_chunks = ChunkStore(self.text_store)
+            self._removed_chunks = 0
+            self.index.clear()
+            if self.text_store is not None:
+                self.text_store.clear()
+        if self.answer_cache is not None:
+            self.answer_cache.clear()
         print("🗑️  All documents cleared")
 
 
@@ -409,20 +1174,28 @@ def print_banner():
     print(banner)
 
 
-def interactive_mode(qa_system: DocumentQASystem):
+def interactive_mode(qa_system: DocumentQASystem, workspaces=None, workspace: str = None):
     """
     Run interactive Q&A session.
     
     Args:
         qa_system: Initialized DocumentQASystem instance
+        workspaces: WorkspaceManager, enables the 'workspace' commands
+        workspace: Name of qa_system's workspace (pinned by the caller)
     """
     print("\n💬 INTERACTIVE MODE")
     print("="*60)
     print("Commands:")
     print("  - Type your question and press Enter")
     print("  - Type 'load <file_path>' to load a new document")
+    print("  - Type 'reload <file_path>' to re-read a changed document")
+    print("  - Type 'remove <file_name>' to unload one document")
     print("  - Type 'summary' to see loaded documents")
+    print("  - Type 'stats' to see per-stage latency percentiles")
     print("  - Type 'clear' to clear all documents")
+    if workspaces is not None:
+        print("  - Type 'workspace <name>' to switch to (or create) a workspace")
+        print("  - Type 'workspaces' to list workspaces and their memory")
     print("  - Type 'quit' or 'exit' to quit")
     print("="*60)
     
@@ -441,12 +1214,40 @@ def interactive_mode(qa_system: DocumentQASystem):
             elif user_input.lower() == 'summary':
                 print(qa_system.get_document_summary())
             
+            elif user_input.lower() == 'stats':
+                print(qa_system.latency_report())
+            
             elif user_input.lower() == 'clear':
                 qa_system.clear_documents()
+                if workspaces is not None:
+                    workspaces.update_size(workspace)
             
             elif user_input.lower().startswith('load '):
                 file_path = user_input[5:].strip()
                 qa_system.load_document(file_path)
+                if workspaces is not None:
+                    workspaces.update_size(workspace)
+            
+            elif user_input.lower().startswith('reload '):
+                qa_system.reload_document(user_input[7:].strip())
+                if workspaces is not None:
+                    workspaces.update_size(workspace)
+            
+            elif user_input.lower().startswith('remove '):
+                qa_system.remove_document(user_input[7:].strip())
+                if workspaces is not None:
+                    workspaces.update_size(workspace)
+            
+            elif workspaces is not None and user_input.lower() == 'workspaces':
+                print(workspaces.summary())
+            
+            elif workspaces is not None and user_input.lower().startswith('workspace '):
+                # Only the current workspace is pinned; the others may be spilled
+                name = user_input[10:].strip()
+                new_system = workspaces.pin(name)
+                workspaces.unpin(workspace)
+                qa_system, workspace = new_system, name
+                print(f"🗂️  Now in workspace '{workspace}' ({len(qa_system.documents)} documents)")
             
             else:
                 # Treat as question
@@ -454,12 +1255,21 @@ def interactive_mode(qa_system: DocumentQASystem):
                     print("⚠️  No documents loaded! Use 'load <file_path>' first.")
                     continue
                 
-                result = qa_system.ask_question(user_input)
-                
-                print(f"\n🤖 Answer ({result['confidence']} confidence):")
-                print("-" * 60)
-                print(result['answer'])
+                # Render the answer as it streams in
+                answer_started = False
+                for event in qa_system.ask_question_stream(user_input):
+                    if event['type'] == 'token':
+                        if not answer_started:
+                            answer_started = True
+                            print("\n🤖 Answer:")
+                            print("-" * 60)
+                        print(event['text'], end="", flush=True)
+                    else:
+                        result = event['response']
+                print()
                 print("-" * 60)
+                print(f"({result['confidence']} confidence, first token after "
+                      f"{result['timings']['time_to_first_token_ms']:.0f} ms)")
                 
                 if 'sources' in result and result['sources']:
                     print(f"\n📚 Sources ({result['chunks_used']} chunks):")
@@ -475,8 +1285,47 @@ def interactive_mode(qa_system: DocumentQASystem):
             print(f"\n❌ Error: {str(e)}")
 
 
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Document Q&A System (Google Gemini)")
+    parser.add_argument("files", nargs="*", help="documents to load (PDF, DOCX, TXT)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes for parsing documents (default: 1; ignored with --streaming)")
+    parser.add_argument("--streaming", action="store_true",
+                        help="low-memory ingestion: keep chunk text on disk")
+    parser.add_argument("--watch", metavar="FOLDER",
+                        help="load documents from a folder and keep loading new or changed ones")
+    parser.add_argument("--debounce", type=float, default=1.0,
+                        help="seconds a watched file must be unchanged before loading (default: 1)")
+    parser.add_argument("--splitter", choices=["native", "langchain"], default="native",
+                        help="chunking implementation (same chunks; native is faster)")
+    parser.add_argument("--instrument", action="store_true",
+                        help="time each pipeline stage (see the 'stats' command)")
+    parser.add_argument("--latency-log", metavar="FILE",
+                        help="append per-question/per-load timings to a JSON-lines file")
+    parser.add_argument("--workspace", metavar="NAME",
+                        help="keep corpora in named workspaces; start in this one")
+    parser.add_argument("--memory-budget", type=float, default=1024, metavar="MB",
+                        help="with --workspace, memory for resident workspaces (default: 1024)")
+    parser.add_argument("--serve", action="store_true",
+                        help="answer questions over HTTP (Flask) instead of the interactive prompt")
+    parser.add_argument("--host", default="127.0.0.1", help="address to serve on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=5000, help="port to serve on (default: 5000)")
+    parser.add_argument("--docs-root", metavar="FOLDER",
+                        help="with --serve, only allow POST /load for files inside this folder")
+    parser.add_argument("--profile-startup", nargs="?", const="", metavar="JSON_FILE",
+                        help="report import times (optionally save them as JSON) and exit")
+    return parser.parse_args(argv)
+
+
 def main():
     """Main function - demonstrates usage."""
+    args = parse_args()
+    if args.profile_startup is not None:
+        import startup_profile
+        startup_profile.run(args.profile_startup or None)
+        return
+    
     print_banner()
     
     print("\n🆓 This system uses Google's FREE Gemini API!")
@@ -496,20 +1345,54 @@ def main():
         sys.exit(1)
     
     try:
-        # Initialize system
-        qa_system = DocumentQASystem()
+        # Initialize system (one per workspace with --workspace)
+        system_kwargs = dict(streaming=args.streaming, instrument=args.instrument,
+                             latency_log_path=args.latency_log, splitter=args.splitter)
+        workspaces = None
+        if args.workspace:
+            from workspaces import WorkspaceManager
+            workspaces = WorkspaceManager(args.memory_budget, **system_kwargs)
+            qa_system = workspaces.pin(args.workspace)
+        else:
+            qa_system = DocumentQASystem(**system_kwargs)
         
         # Check for command line arguments
-        if len(sys.argv) > 1:
+        if args.files:
             print("\n📂 Loading documents from command line...")
-            files = sys.argv[1:]
-            qa_system.load_multiple_documents(files)
-        else:
+            qa_system.load_multiple_documents(args.files, workers=args.workers)
+            if workspaces is not None:
+                workspaces.update_size(args.workspace)
+        elif not args.watch:
             print("\n💡 TIP: You can pass file paths as arguments:")
             print("   python document_qa.py doc1.pdf doc2.txt doc3.docx")
+            print("   python document_qa.py --workers 4 docs/*.pdf   # parallel parsing")
+            print("   python document_qa.py --watch docs/            # load new files as they arrive")
+            print("   python document_qa.py --serve docs/*.pdf       # answer questions over HTTP")
+        
+        # Index the watched folder in the background while questions are answered
+        watcher = None
+        if args.watch:
+            from folder_watcher import FolderWatcher
+            on_change = None
+            if workspaces is not None:
+                workspaces.pin(args.workspace)  # the watcher keeps loading into it
+                on_change = lambda: workspaces.update_size(args.workspace)
+            watcher = FolderWatcher(qa_system, args.watch, debounce_seconds=args.debounce,
+                                    on_change=on_change)
+            watcher.start()
         
-        # Start interactive mode
-        interactive_mode(qa_system)
+        # Start interactive mode (or the HTTP service)
+        try:
+            if args.serve:
+                from qa_server import serve
+                serve(qa_system, host=args.host, port=args.port, docs_root=args.docs_root)
+            else:
+                interactive_mode(qa_system, workspaces, args.workspace)
+        finally:
+            if watcher is not None:
+                watcher.stop()
+            if workspaces is not None:
+                workspaces.close()
     
     except Exception as e:
         print(f"\n❌ Fatal error: {str(e)}")
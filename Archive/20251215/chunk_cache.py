@@ -0,0 +1,122 @@
+"""
+On-disk cache of parsed and chunked documents.
+
+Entries are keyed by the SHA-256 of the file bytes plus the splitter settings,
+so an edited file (or a changed chunk_size/overlap/separators) misses the cache
+and is re-parsed. Each entry is one pickle holding the extracted text, the
+chunk texts and their pre-tokenized index terms.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Bump when the entry layout changes so stale entries are ignored
+CACHE_VERSION = 1
+
+
+def file_sha256(file_path: Path, block_size: int = 1 << 20) -> str:
+    """Hash a file's contents without reading it into memory at once."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ChunkCache:
+    """Directory of cached chunk lists, one file per (content, splitter settings)."""
+
+    def __init__(self, cache_dir: str, chunk_size: int, chunk_overlap: int,
+                 separators: List[str]):
+        """
+        Args:
+            cache_dir: Directory for cache entries (created on first write)
+            chunk_size: Splitter chunk size
+            chunk_overlap: Splitter chunk overlap
+            separators: Splitter separators, in priority order
+        """
+        self.cache_dir = Path(cache_dir)
+        settings = json.dumps({
+            'version': CACHE_VERSION,
+            'chunk_size': chunk_size,
+            'chunk_overlap': chunk_overlap,
+            'separators': separators,
+        }, sort_keys=True)
+        self.settings_hash = hashlib.sha256(settings.encode("utf-8")).hexdigest()[:16]
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, file_path: Path, content_hash: str = None) -> str:
+        """Cache key for a file under the current splitter settings."""
+        content_hash = content_hash or file_sha256(file_path)
+        return f"{content_hash}-{self.settings_hash}"
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pkl"
+
+    def contains(self, key: str) -> bool:
+        """Whether an entry exists for the key (does not count as a hit)."""
+        return self._entry_path(key).exists()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Load a cached entry.
+
+        Returns:
+            The entry dictionary, or None on a miss or unreadable entry
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            print(f"⚠️  Ignoring corrupt cache entry {path.name}: {e}")
+            self.misses += 1
+            return None
+
+        if entry.get('version') != CACHE_VERSION:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: Dict):
+        """Write an entry atomically so a crash never leaves a half-written file."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(key)
+        # A unique temp file per write: two threads may store the same key at once
+        with tempfile.NamedTemporaryFile(dir=self.cache_dir, prefix=f"{key}.", suffix=".tmp",
+                                         delete=False) as f:
+            try:
+                pickle.dump({**entry, 'version': CACHE_VERSION}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            except BaseException:
+                f.close()
+                os.unlink(f.name)
+                raise
+        os.replace(f.name, path)
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and number of entries on disk."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(list(self.cache_dir.glob("*.pkl"))) if self.cache_dir.exists() else 0,
+        }
+
+    def clear(self):
+        """Delete every cache entry."""
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob("*.pkl"):
+                path.unlink()
@@ -0,0 +1,181 @@
+"""
+Columnar chunk storage for the Document Q&A System.
+
+A chunk used to be a dict of five or six fields, with its document name
+repeated as a separate string in every chunk. At millions of chunks the dict
+and string overhead outweighs the metadata itself, so ChunkStore keeps one
+typed array per field and an interned table of document names:
+
+    document ids, chunk ids, char/word counts   array('i')
+    text offsets/lengths (streaming mode)       array('q')
+    chunk text (in-memory mode)                 list of str
+
+Chunks are addressed by position, like the retrieval index. Indexing the
+store (store[i]) builds the old dict shape on demand, so callers that need
+dicts - find_relevant_chunks results, the context packer - still get them,
+but only for the chunks they actually touch.
+"""
+
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence
+
+# Document id of a removed chunk
+REMOVED = -1
+
+
+class ChunkStore:
+    """Chunk metadata in parallel arrays, addressed by position."""
+
+    def __init__(self, text_store=None):
+        """
+        Args:
+            text_store: TextStore holding the text of streamed chunks
+        """
+        self.text_store = text_store
+        self.document_names: List[str] = []
+        self._document_ids: Dict[str, int] = {}
+        self._document = array('i')
+        self._chunk_id = array('i')
+        self._char_count = array('i')
+        self._word_count = array('i')
+        # In-memory chunks keep their text here; streamed chunks keep None
+        # and are located in the text store by offset and length
+        self._content: List[Optional[str]] = []
+        self._text_offset = array('q')
+        self._text_length = array('q')
+
+    def __len__(self) -> int:
+        return len(self._chunk_id)
+
+    def _intern(self, document_name: str) -> int:
+        document_id = self._document_ids.get(document_name)
+        if document_id is None:
+            document_id = self._document_ids[document_name] = len(self.document_names)
+            self.document_names.append(document_name)
+        return document_id
+
+    def add(self, document_name: str, chunk_id: int, char_count: int, word_count: int,
+            content: str = None, text_offset: int = 0, text_length: int = 0) -> int:
+        """
+        Append one chunk.
+
+        Args:
+            document_name: File name of the chunk's document
+            chunk_id: Position of the chunk within its document
+            char_count: Characters in the chunk
+            word_count: Words in the chunk
+            content: Chunk text (None for streamed chunks)
+            text_offset: Byte offset of the text in the text store (streamed chunks)
+            text_length: Byte length of the text in the text store (streamed chunks)
+
+        Returns:
+            Position assigned to the chunk
+        """
+        position = len(self)
+        self._document.append(self._intern(document_name))
+        self._chunk_id.append(chunk_id)
+        self._char_count.append(char_count)
+        self._word_count.append(word_count)
+        self._content.append(content)
+        self._text_offset.append(text_offset)
+        self._text_length.append(text_length)
+        return position
+
+    def append(self, chunk: Dict) -> int:
+        """Append a chunk given in the dict shape returned by store[i]."""
+        return self.add(chunk['document_name'], chunk['chunk_id'], chunk['char_count'],
+                        chunk['word_count'], chunk.get('content'),
+                        chunk.get('text_offset', 0), chunk.get('text_length', 0))
+
+    def copy_from(self, other: "ChunkStore", position: int) -> int:
+        """Append a chunk of another store (used when compacting)."""
+        return self.add(other.document_names[other._document[position]],
+                        other._chunk_id[position], other._char_count[position],
+                        other._word_count[position], other._content[position],
+                        other._text_offset[position], other._text_length[position])
+
+    def remove(self, position: int):
+        """Mark a chunk as removed; its position is not reused."""
+        self._document[position] = REMOVED
+        self._content[position] = None
+
+    def is_removed(self, position: int) -> bool:
+        return self._document[position] == REMOVED
+
+    def content(self, position: int) -> str:
+        """A chunk's text, read from the text store for streamed chunks."""
+        text = self._content[position]
+        if text is not None:
+            return text
+        return self.text_store.read(self._text_offset[position], self._text_length[position])
+
+    def document_name(self, position: int) -> str:
+        return self.document_names[self._document[position]]
+
+    def __getitem__(self, position: int) -> Optional[Dict]:
+        """
+        The chunk as a dict (None if removed).
+
+        In-memory chunks have 'content'; streamed chunks have 'text_offset'
+        and 'text_length' instead, exactly like the dicts they replace.
+        """
+        document = self._document[position]
+        if document == REMOVED:
+            return None
+        chunk = {}
+        content = self._content[position]
+        if content is not None:
+            chunk['content'] = content
+        chunk['chunk_id'] = self._chunk_id[position]
+        chunk['document_name'] = self.document_names[document]
+        chunk['char_count'] = self._char_count[position]
+        chunk['word_count'] = self._word_count[position]
+        if content is None:
+            chunk['text_offset'] = self._text_offset[position]
+            chunk['text_length'] = self._text_length[position]
+        return chunk
+
+    def __iter__(self) -> Iterator[Optional[Dict]]:
+        for position in range(len(self)):
+            yield self[position]
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the columns and in-memory chunk text."""
+        columns = (self._document, self._chunk_id, self._char_count, self._word_count,
+                   self._text_offset, self._text_length)
+        total = sum(column.itemsize * len(column) for column in columns)
+        total += sys.getsizeof(self._content)
+        total += sum(sys.getsizeof(text) for text in self._content if text is not None)
+        return total
+
+    def __getstate__(self) -> Dict:
+        # The text store is an open file; whoever unpickles re-attaches it
+        state = self.__dict__.copy()
+        state['text_store'] = None
+        return state
+
+    def view(self, start: int, count: int) -> "ChunkView":
+        """Read-only sequence of `count` chunks starting at `start`."""
+        return ChunkView(self, start, count)
+
+
+class ChunkView(Sequence):
+    """A document's chunks inside a ChunkStore, materialized as dicts on access."""
+
+    def __init__(self, store: ChunkStore, start: int, count: int):
+        self.store = store
+        self.start = start
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("chunk index out of range")
+        return self.store[self.start + index]
@@ -0,0 +1,142 @@
+"""
+Token-budgeted context packing for the Document Q&A System.
+
+Retrieved chunks are packed into the prompt context greedily by relevance
+until a token budget is reached. Chunks from the same document with
+consecutive chunk ids are merged into one section and the text they share
+(the splitter's chunk_overlap) is kept only once.
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# Shortest suffix/prefix match treated as real splitter overlap when merging
+MIN_OVERLAP_CHARS = 10
+
+SECTION_SEPARATOR = "\n---\n"
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """tiktoken's cl100k_base encoding, or None if tiktoken is unavailable."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=8192)
+def count_tokens(text: str) -> int:
+    """
+    Count tokens in text (cached).
+    Falls back to the 1 token ≈ 4 characters rule without tiktoken.
+    """
+    encoding = _get_encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text down to at most max_tokens tokens."""
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[:max_tokens * 4]
+    return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+
+
+def merge_overlapping(first: str, second: str, max_overlap: int) -> str:
+    """
+    Join two consecutive chunks, keeping their shared text once.
+
+    Args:
+        first: Earlier chunk
+        second: Following chunk
+        max_overlap: Longest overlap to look for (in characters)
+    """
+    longest = min(len(first), len(second), max_overlap)
+    for size in range(longest, MIN_OVERLAP_CHARS - 1, -1):
+        if first.endswith(second[:size]):
+            return first + second[size:]
+    return first + "\n" + second
+
+
+def format_section(document_name: str, chunks: List[Dict], max_overlap: int) -> str:
+    """Render a run of consecutive chunks from one document with its citation."""
+    first_id, last_id = chunks[0]['chunk_id'], chunks[-1]['chunk_id']
+    label = f"Chunk {first_id}" if first_id == last_id else f"Chunk {first_id}-{last_id}"
+    text = chunks[0]['content']
+    for chunk in chunks[1:]:
+        text = merge_overlapping(text, chunk['content'], max_overlap)
+    return f"[Document: {document_name}, {label}]\n{text}\n"
+
+
+class ContextPacker:
+    """Packs ranked chunks into a context string under a token budget."""
+
+    def __init__(self, token_budget: int = 3000, chunk_overlap: int = 300):
+        """
+        Args:
+            token_budget: Maximum tokens of context sent to the LLM
+            chunk_overlap: Splitter overlap (bounds the duplicate search)
+        """
+        self.token_budget = token_budget
+        # Stripped whitespace can shift the boundary a little past chunk_overlap
+        self.max_overlap = chunk_overlap + 50
+
+    def _build(self, selected: List[Dict]) -> List[str]:
+        """Group selected chunks into merged sections, best section first."""
+        runs: List[List[Dict]] = []
+        ordered = sorted(selected, key=lambda c: (c['document_name'], c['chunk_id']))
+        for chunk in ordered:
+            previous = runs[-1][-1] if runs else None
+            if (previous is not None
+                    and previous['document_name'] == chunk['document_name']
+                    and previous['chunk_id'] + 1 == chunk['chunk_id']):
+                runs[-1].append(chunk)
+            else:
+                runs.append([chunk])
+
+        rank = {id(chunk): position for position, chunk in enumerate(selected)}
+        runs.sort(key=lambda run: min(rank[id(chunk)] for chunk in run))
+        return [format_section(run[0]['document_name'], run, self.max_overlap) for run in runs]
+
+    @staticmethod
+    def _cost(sections: List[str]) -> int:
+        # Counted per section so unchanged sections hit the token-count cache
+        separators = max(len(sections) - 1, 0) * count_tokens(SECTION_SEPARATOR)
+        return sum(count_tokens(section) for section in sections) + separators
+
+    def pack(self, ranked_chunks: List[Dict]) -> Tuple[str, List[Dict]]:
+        """
+        Pack chunks (best first) into a context string.
+
+        Each chunk is added if the merged context still fits the budget;
+        chunks that do not fit are skipped and smaller ones may still be added.
+        If even the best chunk is over budget, it is truncated to fit.
+
+        Returns:
+            (context, chunks included in it, in relevance order)
+        """
+        selected: List[Dict] = []
+        for chunk in ranked_chunks:
+            candidate = selected + [chunk]
+            if self._cost(self._build(candidate)) <= self.token_budget:
+                selected = candidate
+
+        if not selected and ranked_chunks:
+            best = ranked_chunks[0]
+            header = format_section(best['document_name'], [{**best, 'content': ''}], 0)
+            room = max(self.token_budget - count_tokens(header), 1)
+            selected = [{**best, 'content': truncate_to_tokens(best['content'], room)}]
+
+        return SECTION_SEPARATOR.join(self._build(selected)), selected
+
+
+def unpacked_context(chunks: List[Dict]) -> str:
+    """The original verbatim concatenation, for comparing token counts."""
+    return SECTION_SEPARATOR.join(
+        f"[Document: {chunk['document_name']}, Chunk {chunk['chunk_id']}]\n{chunk['content']}\n"
+        for chunk in chunks
+    )
@@ -1,8 +1,50 @@
 """
 Run this script to create example documents for testing.
 Usage: python create_example_docs.py
+
+It also generates synthetic corpora for scale testing and benchmarks the
+Q&A system on them (offline, with a fake LLM):
+
+    python create_example_docs.py corpus --size 100MB --out corpus/
+    python create_example_docs.py bench --sizes 1MB 10MB 100MB --output bench.json
+    python create_example_docs.py bench --sizes 10MB --baseline bench.json
+
+Synthetic text is drawn from a made-up vocabulary with a Zipf (or uniform)
+word distribution, split into sentences and paragraphs. Everything is
+seeded, so the same arguments always produce the same files and questions.
 """
 
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource  # peak RSS (not available on Windows)
+except ImportError:
+    resource = None
+
+SIZE_UNITS = {'KB': 1 << 10, 'MB': 1 << 20, 'GB': 1 << 30}
+SYLLABLES = [c + v for c in "bdfgklmnprstvz" for v in "aeiou"]
+QUESTION_TEMPLATES = [
+    "What does the document say about {0} and {1}?",
+    "How is {0} related to {1}?",
+    "Explain the role of {0} in {1} and {2}.",
+    "What are the main points about {0}?",
+    "Which sections describe {0}, {1} or {2}?",
+]
+
+
 def create_example_documents():
     """Create sample documents for testing the Q&A system."""
     
@@ -278,5 +320,352 @@ We hope you have a rewarding career at TechCorp. Welcome aboard!"""
     print("   Example: python document_qa.py climate_change.txt")
 
 
+def parse_size(text: str) -> int:
+    """Parse a size like '500KB', '10MB' or '1GB' into bytes."""
+    text = text.strip().upper()
+    for unit, factor in SIZE_UNITS.items():
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * factor)
+    return int(text)
+
+
+def format_size(n_bytes: int) -> str:
+    """Inverse of parse_size, for labels."""
+    for unit in ('GB', 'MB', 'KB'):
+        if n_bytes >= SIZE_UNITS[unit] and n_bytes % SIZE_UNITS[unit] == 0:
+            return f"{n_bytes // SIZE_UNITS[unit]}{unit}"
+    return f"{n_bytes}B"
+
+
+def make_vocabulary(size: int, seed: int) -> List[str]:
+    """Distinct pronounceable made-up words (never stop words)."""
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    words, seen = [], set()
+    while len(words) < size:
+        n_syllables = int(rng.integers(2, 5))
+        word = "".join(SYLLABLES[i] for i in rng.integers(0, len(SYLLABLES), n_syllables))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+def word_probabilities(vocab_size: int, distribution: str, zipf_exponent: float):
+    """Probability of each vocabulary rank (rank 0 is the most frequent word)."""
+    import numpy as np
+    if distribution == "uniform":
+        weights = np.ones(vocab_size)
+    elif distribution == "zipf":
+        weights = 1.0 / np.arange(1, vocab_size + 1) ** zipf_exponent
+    else:
+        raise ValueError(f"Unknown distribution: {distribution} (choose zipf or uniform)")
+    return weights / weights.sum()
+
+
+def generate_corpus(out_dir: str, total_bytes: int, file_bytes: int = 1 << 20,
+                    vocab_size: int = 50000, distribution: str = "zipf",
+                    zipf_exponent: float = 1.1, n_questions: int = 200,
+                    seed: int = 42) -> Dict:
+    """
+    Write a synthetic corpus of .txt files plus a questions.json next to them.
+    
+    Args:
+        out_dir: Folder for the corpus (created if missing)
+        total_bytes: Approximate corpus size
+        file_bytes: Approximate size of each file
+        vocab_size: Number of distinct words
+        distribution: "zipf" or "uniform" word frequencies
+        zipf_exponent: Zipf exponent (1.0-1.2 is typical for natural text)
+        n_questions: Questions to generate
+        seed: Random seed (same seed = same corpus and questions)
+        
+    Returns:
+        Corpus manifest (also written to manifest.json)
+    """
+    import numpy as np
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    
+    vocabulary = np.array(make_vocabulary(vocab_size, seed), dtype=object)
+    cumulative = np.cumsum(word_probabilities(vocab_size, distribution, zipf_exponent))
+    
+    files = []
+    written = 0
+    while written < total_bytes:
+        target = min(file_bytes, total_bytes - written)
+        path = out / f"synthetic_{len(files):05d}.txt"
+        size = 0
+        with open(path, "w", encoding="utf-8") as f:
+            size += f.write(f"Document {len(files)}\n\n")
+            while size < target:
+                # One paragraph of 3-8 sentences of 6-24 words
+                lengths = rng.integers(6, 25, int(rng.integers(3, 9)))
+                ranks = np.searchsorted(cumulative, rng.random(int(lengths.sum())))
+                words = vocabulary[np.minimum(ranks, vocab_size - 1)]
+                ends = np.cumsum(lengths)
+                sentences = [" ".join(words[end - length:end])
+                             for end, length in zip(ends, lengths)]
+                size += f.write(". ".join(sentences) + ".\n\n")
+        files.append(path.name)
+        written += size
+    
+    # Questions use words past the most frequent ones, drawn with the same
+    # distribution, so they look like real queries rather than stop words
+    questions = []
+    skip = min(10, vocab_size - 3)
+    tail = np.cumsum(word_probabilities(vocab_size, distribution, zipf_exponent)[skip:])
+    tail /= tail[-1]
+    for _ in range(n_questions):
+        template = QUESTION_TEMPLATES[int(rng.integers(len(QUESTION_TEMPLATES)))]
+        ranks = skip + np.searchsorted(tail, rng.random(3))
+        questions.append(template.format(*vocabulary[np.minimum(ranks, vocab_size - 1)]))
+    
+    manifest = {
+        'size': format_size(total_bytes),
+        'total_bytes': written,
+        'files': files,
+        'vocab_size': vocab_size,
+        'distribution': distribution,
+        'zipf_exponent': zipf_exponent,
+        'seed': seed,
+    }
+    (out / "questions.json").write_text(json.dumps(questions, indent=2), encoding="utf-8")
+    (out / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (None if unknown)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / (1 << 10)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+def measure_corpus(corpus_dir: str, scoring_modes: List[str], top_k: int = 5,
+                   repeat: int = 3, streaming: bool = False, workers: int = 1) -> Dict:
+    """
+    Load a generated corpus and time retrieval over its questions.
+    Runs in a fresh process per corpus (see run_benchmarks) so peak RSS
+    belongs to this corpus alone.
+    """
+    from chatbot import DocumentQASystem
+    from fake_llm import FakeLLM
+    
+    corpus = Path(corpus_dir)
+    manifest = json.loads((corpus / "manifest.json").read_text(encoding="utf-8"))
+    questions = json.loads((corpus / "questions.json").read_text(encoding="utf-8"))
+    paths = [str(corpus / name) for name in manifest['files']]
+    baseline_rss = peak_rss_mb()
+    
+    with tempfile.TemporaryDirectory() as store_dir:
+        # Per-file progress output would dominate the timing at 1000+ files
+        with contextlib.redirect_stdout(io.StringIO()):
+            qa = DocumentQASystem(llm=FakeLLM(), cache_dir=None, scoring=scoring_modes[0],
+                                  streaming=streaming,
+                                  text_store_path=str(Path(store_dir) / "chunks.txt"),
+                                  answer_cache_size=0)
+            start = time.perf_counter()
+            qa.load_multiple_documents(paths, workers=workers)
+            load_seconds = time.perf_counter() - start
+        
+        queries = {}
+        for scoring in scoring_modes:
+            if scoring not in qa.index.scoring_modes:
+                continue  # needs another index backend (e.g. tfidf)
+            timings = []
+            for _ in range(repeat):
+                for question in questions:
+                    start = time.perf_counter()
+                    qa.find_relevant_chunks(question, top_k, scoring=scoring)
+                    timings.append((time.perf_counter() - start) * 1000)
+            queries[scoring] = {
+                'mean_ms': statistics.mean(timings),
+                'p50_ms': percentile(timings, 50),
+                'p95_ms': percentile(timings, 95),
+                'p99_ms': percentile(timings, 99),
+            }
+        
+        megabytes = manifest['total_bytes'] / (1 << 20)
+        return {
+            'size': manifest['size'],
+            'bytes': manifest['total_bytes'],
+            'files': len(paths),
+            'documents': len(qa.documents),
+            'chunks': qa.chunk_count,
+            'questions': len(questions),
+            'load_seconds': load_seconds,
+            'load_mb_per_s': megabytes / load_seconds,
+            'chunks_per_s': qa.chunk_count / load_seconds,
+            'queries': queries,
+            'baseline_rss_mb': baseline_rss,
+            'peak_rss_mb': peak_rss_mb(),
+        }
+
+
+def git_commit() -> str:
+    """Current git commit of this checkout (None outside a repository)."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True, cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(args) -> Dict:
+    """Generate (or reuse) a corpus per size, measure each, and collect the results."""
+    results = []
+    with tempfile.TemporaryDirectory() as scratch:
+        root = Path(args.corpus_root or scratch)
+        for size in args.sizes:
+            total_bytes = parse_size(size)
+            corpus_dir = root / f"corpus_{format_size(total_bytes)}_seed{args.seed}"
+            if not (corpus_dir / "manifest.json").exists():
+                print(f"\n🧪 Generating {format_size(total_bytes)} corpus in {corpus_dir} ...")
+                generate_corpus(corpus_dir, total_bytes, parse_size(args.file_size),
+                                args.vocab, args.distribution, args.zipf,
+                                args.questions, args.seed)
+            
+            print(f"⏱️  Measuring {format_size(total_bytes)} ...")
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                result = pool.submit(measure_corpus, str(corpus_dir), args.scoring, args.top_k,
+                                     args.repeat, args.streaming, args.workers).result()
+            results.append(result)
+            print_result(result)
+    
+    return {
+        'commit': git_commit(),
+        'created_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {key: value for key, value in vars(args).items()
+                   if key not in ('command', 'output', 'baseline')},
+        'results': results,
+    }
+
+
+def print_result(result: Dict):
+    rss = f"{result['peak_rss_mb']:.0f} MB" if result['peak_rss_mb'] is not None else "n/a"
+    print(f"   {result['files']} files, {result['chunks']:,} chunks: "
+          f"load {result['load_seconds']:.1f}s ({result['load_mb_per_s']:.1f} MB/s), "
+          f"peak RSS {rss}")
+    for scoring, stats in result['queries'].items():
+        print(f"   {scoring:<7} p50 {stats['p50_ms']:.2f} ms   p95 {stats['p95_ms']:.2f} ms   "
+              f"p99 {stats['p99_ms']:.2f} ms")
+
+
+def compare_with_baseline(report: Dict, baseline: Dict, tolerance: float) -> Optional[List[str]]:
+    """
+    Compare metrics of corpora present in both reports.
+    
+    Runs with different settings (streaming, workers, scoring, ...) measure
+    different things, so they are reported as not comparable instead.
+    
+    Returns:
+        Descriptions of metrics that got worse by more than `tolerance` (0.2 = 20%),
+        or None if the settings differ
+    """
+    print(f"\n📊 Compared with {baseline.get('commit') or 'baseline'}:")
+    config, old_config = report.get('config', {}), baseline.get('config', {})
+    # Which sizes ran and the pass/fail tolerance don't change the measurements
+    ignored = ('sizes', 'corpus_root', 'tolerance')
+    differences = [f"{key} {old_config.get(key)!r} -> {config.get(key)!r}"
+                   for key in sorted(set(config) | set(old_config))
+                   if key not in ignored and config.get(key) != old_config.get(key)]
+    if differences:
+        print("   ⚠️  Settings differ, not comparing: " + ", ".join(differences))
+        return None
+    
+    previous = {result['size']: result for result in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        old = previous.get(result['size'])
+        if old is None:
+            continue
+        # (label, old value, new value, True if higher is better)
+        metrics = [("load MB/s", old['load_mb_per_s'], result['load_mb_per_s'], True)]
+        if old.get('peak_rss_mb') and result.get('peak_rss_mb'):
+            metrics.append(("peak RSS MB", old['peak_rss_mb'], result['peak_rss_mb'], False))
+        for scoring, stats in result['queries'].items():
+            if scoring in old['queries']:
+                for pct in ('p50_ms', 'p95_ms', 'p99_ms'):
+                    metrics.append((f"{scoring} {pct}", old['queries'][scoring][pct],
+                                    stats[pct], False))
+        for label, before, after, higher_is_better in metrics:
+            change = (after - before) / before if before else 0.0
+            worse = -change if higher_is_better else change
+            flag = "❌" if worse > tolerance else "  "
+            print(f"   {flag} {result['size']:>6} {label:<16}{before:>10.2f} -> {after:>10.2f} "
+                  f"({change:+.0%})")
+            if worse > tolerance:
+                regressions.append(f"{result['size']} {label} {change:+.0%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Example documents, synthetic corpora and benchmarks")
+    sub = parser.add_subparsers(dest="command")
+    
+    def add_corpus_options(command):
+        command.add_argument("--file-size", default="1MB", help="size of each generated file")
+        command.add_argument("--vocab", type=int, default=50000, help="distinct words")
+        command.add_argument("--distribution", choices=["zipf", "uniform"], default="zipf")
+        command.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent")
+        command.add_argument("--questions", type=int, default=200, help="questions to generate")
+        command.add_argument("--seed", type=int, default=42)
+    
+    corpus = sub.add_parser("corpus", help="write one synthetic corpus")
+    corpus.add_argument("--size", default="10MB", help="total size, e.g. 1MB, 100MB, 1GB")
+    corpus.add_argument("--out", required=True, help="output folder")
+    add_corpus_options(corpus)
+    
+    bench = sub.add_parser("bench", help="benchmark loading and retrieval per corpus size")
+    bench.add_argument("--sizes", nargs="+", default=["1MB", "10MB", "100MB"])
+    bench.add_argument("--corpus-root", help="keep generated corpora here and reuse them")
+    bench.add_argument("--scoring", nargs="+", default=["bm25"],
+                       help="scoring modes to time (the first picks the index backend)")
+    bench.add_argument("--top-k", type=int, default=5)
+    bench.add_argument("--repeat", type=int, default=3, help="passes over the question set")
+    bench.add_argument("--streaming", action="store_true", help="load with streaming=True")
+    bench.add_argument("--workers", type=int, default=1, help="parsing processes (ignored with --streaming)")
+    bench.add_argument("--output", default="bench_results.json", help="JSON results file")
+    bench.add_argument("--baseline", help="earlier results file to compare against")
+    bench.add_argument("--tolerance", type=float, default=0.2,
+                       help="relative slowdown reported as a regression (default: 0.2)")
+    add_corpus_options(bench)
+    
+    args = parser.parse_args()
+    if args.command is None:
+        create_example_documents()
+    elif args.command == "corpus":
+        manifest = generate_corpus(args.out, parse_size(args.size), parse_size(args.file_size),
+                                   args.vocab, args.distribution, args.zipf,
+                                   args.questions, args.seed)
+        print(f"✅ Wrote {len(manifest['files'])} files "
+              f"({manifest['total_bytes'] / (1 << 20):.1f} MB) to {args.out}")
+    elif args.command == "bench":
+        report = run_benchmarks(args)
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\n💾 Results written to {args.output}")
+        if args.baseline:
+            baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+            regressions = compare_with_baseline(report, baseline, args.tolerance)
+            if regressions is None:
+                return
+            if regressions:
+                print(f"\n❌ {len(regressions)} regression(s): " + ", ".join(regressions))
+                sys.exit(1)
+            print("\n✅ No regressions")
+
+
 if __name__ == "__main__":
-    create_example_documents()
\ No newline at end of file
+    main()
\ No newline at end of file
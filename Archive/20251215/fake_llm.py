@@ -0,0 +1,53 @@
+"""
+Local stand-in chat model for offline tests and benchmarks.
+
+Behaves like a LangChain chat model (invoke and stream both work through the
+LCEL chain in DocumentQASystem) but answers instantly from the prompt text,
+with configurable latency to imitate a remote LLM:
+
+    qa = DocumentQASystem(llm=FakeLLM(first_token_latency=0.4, token_latency=0.02))
+"""
+
+import time
+from typing import Any, Iterator, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+class FakeLLM(BaseChatModel):
+    """Deterministic chat model that streams words from the prompt it was given."""
+
+    first_token_latency: float = 0.0
+    """Seconds before the first token (prompt processing + network)."""
+    token_latency: float = 0.0
+    """Seconds between tokens."""
+    answer_words: int = 40
+    """Length of the generated answer in words."""
+    model_name: str = "fake-llm"
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-llm"
+
+    def _answer_tokens(self, messages: List[BaseMessage]) -> List[str]:
+        """Answer = the first words of the last message, one token per word."""
+        words = str(messages[-1].content).split()[:self.answer_words]
+        return [word if i == 0 else " " + word for i, word in enumerate(words)] or ["(empty)"]
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        tokens = self._answer_tokens(messages)
+        time.sleep(self.first_token_latency + self.token_latency * (len(tokens) - 1))
+        message = AIMessage(content="".join(tokens))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        for i, token in enumerate(self._answer_tokens(messages)):
+            time.sleep(self.first_token_latency if i == 0 else self.token_latency)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
@@ -0,0 +1,169 @@
+"""
+Watched-folder ingestion for the Document Q&A System.
+
+A watchdog observer reports files created, modified, moved or deleted in a
+folder, and one background worker thread loads, reloads or removes them
+through DocumentQASystem. Parsing runs outside the system's index lock and
+each document is swapped in under it, so questions asked meanwhile are
+answered from a complete snapshot (old or new version, never half a file).
+
+Events are debounced per file: a file is only processed once no event for it
+has arrived for `debounce_seconds`, so a PDF that is still being copied in
+is parsed once, after the copy finishes. Unchanged files are skipped by
+their content hash (see DocumentQASystem.load_document).
+
+Requires the watchdog package (only imported when a folder is watched).
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: no cover - optional dependency
+    FileSystemEventHandler = object
+    Observer = None
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+
+def is_document(path: Path) -> bool:
+    """Supported document, ignoring hidden files and Office lock files (~$...)."""
+    return (path.suffix.lower() in SUPPORTED_EXTENSIONS
+            and not path.name.startswith(('.', '~$')))
+
+
+class _EventHandler(FileSystemEventHandler):
+    """Forwards every file event to the watcher's pending queue."""
+
+    def __init__(self, watcher: "FolderWatcher"):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type in ("opened", "closed_no_write"):
+            return
+        self.watcher.notify(event.src_path)
+        dest_path = getattr(event, 'dest_path', None)
+        if dest_path:
+            self.watcher.notify(dest_path)
+
+
+class FolderWatcher:
+    """Keeps a DocumentQASystem in sync with the documents in a folder."""
+
+    def __init__(self, qa_system, folder: str, debounce_seconds: float = 1.0,
+                 recursive: bool = False, on_change: Callable[[], None] = None):
+        """
+        Args:
+            qa_system: DocumentQASystem to load documents into
+            folder: Folder to watch
+            debounce_seconds: Quiet time required after a file's last event
+            recursive: Also watch subfolders
+            on_change: Called after each document is loaded, reloaded or removed
+                (e.g. to re-measure a workspace)
+        """
+        if Observer is None:
+            raise ImportError("Watching a folder needs watchdog: pip install watchdog")
+
+        self.qa_system = qa_system
+        self.folder = Path(folder)
+        if not self.folder.is_dir():
+            raise NotADirectoryError(f"Not a folder: {self.folder}")
+        self.debounce_seconds = debounce_seconds
+        self.recursive = recursive
+        self.on_change = on_change
+
+        # path -> time of its latest event; drained by the worker
+        self._pending: Dict[Path, float] = {}
+        self._condition = threading.Condition()
+        self._stopped = False
+        self.processed = 0  # documents loaded, reloaded or removed
+
+        self._observer = Observer()
+        self._observer.schedule(_EventHandler(self), str(self.folder), recursive=recursive)
+        self._worker = threading.Thread(target=self._run, name="folder-watcher", daemon=True)
+
+    def start(self, initial_scan: bool = True):
+        """
+        Start watching.
+
+        Args:
+            initial_scan: Also queue the documents already in the folder
+        """
+        if initial_scan:
+            pattern = "**/*" if self.recursive else "*"
+            for path in sorted(self.folder.glob(pattern)):
+                if path.is_file():
+                    self.notify(path)
+        self._observer.start()
+        self._worker.start()
+        print(f"👀 Watching {self.folder} for new or changed documents")
+
+    def stop(self):
+        """Stop watching; a document being indexed is finished first."""
+        self._observer.stop()
+        self._observer.join()
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._worker.is_alive():
+            self._worker.join()
+
+    def notify(self, path):
+        """Record an event for a path, restarting its debounce timer."""
+        path = Path(path).resolve()
+        if not is_document(path):
+            return
+        with self._condition:
+            self._pending[path] = time.monotonic()
+            self._condition.notify()
+
+    def pending(self) -> int:
+        """Files waiting for their debounce period to pass."""
+        with self._condition:
+            return len(self._pending)
+
+    def _next_batch(self) -> List[Path]:
+        """Block until some files have been quiet long enough (empty list = stopped)."""
+        with self._condition:
+            while not self._stopped:
+                now = time.monotonic()
+                ready = sorted(path for path, last_event in self._pending.items()
+                               if now - last_event >= self.debounce_seconds)
+                if ready:
+                    for path in ready:
+                        del self._pending[path]
+                    return ready
+                timeout = None
+                if self._pending:
+                    oldest = min(self._pending.values())
+                    timeout = oldest + self.debounce_seconds - now
+                self._condition.wait(timeout)
+            return []
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            for path in batch:
+                self._process(path)
+
+    def _process(self, path: Path):
+        """Load/reload a file that exists, remove one that is gone."""
+        try:
+            if path.is_file():
+                self.qa_system.load_document(str(path))
+            elif self.qa_system.has_document(str(path)):
+                self.qa_system.remove_document(str(path))
+            else:
+                return
+            self.processed += 1
+            if self.on_change is not None:
+                self.on_change()
+        except Exception as e:
+            print(f"⚠️  Skipping {path.name}: {str(e)}")
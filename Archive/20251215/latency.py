@@ -0,0 +1,189 @@
+"""
+Per-stage latency spans for the Document Q&A System.
+
+Each question or document load gets a Trace; the pipeline wraps its stages in
+trace.span("name") blocks:
+
+    question: score, context, llm_first_token, llm_total, total
+    load:     cache, load, split, index, total
+
+Finished traces feed a LatencyRecorder, which keeps the last `window`
+samples of every stage for percentiles and histograms (the interactive
+`stats` command) and can append each trace to a JSON-lines file.
+
+When instrumentation is off the pipeline uses NULL_TRACE, whose span() hands
+back one shared no-op context manager - no clock reads, no allocation.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+BUCKETS_MS = (1, 3, 10, 30, 100, 300, 1000, 3000)
+
+
+class Trace:
+    """Stage timings of one request, in milliseconds."""
+
+    enabled = True
+
+    def __init__(self, kind: str):
+        """
+        Args:
+            kind: Request type, "question" or "load"
+        """
+        self.kind = kind
+        self.spans: Dict[str, float] = {}
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def span(self, name: str):
+        """Time the enclosed block (repeated spans of one name add up)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    def add(self, name: str, ms: float):
+        """Record a duration measured elsewhere (e.g. in a worker process)."""
+        self.spans[name] = self.spans.get(name, 0.0) + ms
+
+    def since(self, name: str, start: float):
+        """Record the time from a perf_counter() reading until now."""
+        self.add(name, (time.perf_counter() - start) * 1000)
+
+
+class _NullTrace:
+    """Stand-in used when instrumentation is disabled; records nothing."""
+
+    enabled = False
+    kind = None
+    spans: Dict[str, float] = {}
+
+    def span(self, name: str):
+        return _NULL_SPAN
+
+    def add(self, name: str, ms: float):
+        pass
+
+    def since(self, name: str, start: float):
+        pass
+
+
+_NULL_SPAN = nullcontext()
+NULL_TRACE = _NullTrace()
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+class LatencyRecorder:
+    """Rolling per-stage latency samples, with optional JSON-lines output."""
+
+    def __init__(self, window: int = 1000, log_path: str = None):
+        """
+        Args:
+            window: Samples kept per stage (older ones roll off)
+            log_path: Append every finished trace to this JSON-lines file
+        """
+        self.window = window
+        self.log_path = log_path
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self._log = open(log_path, "a", encoding="utf-8") if log_path else None
+
+    def start(self, kind: str) -> Trace:
+        """Begin timing one request."""
+        return Trace(kind)
+
+    def finish(self, trace: Trace, **fields) -> Dict[str, float]:
+        """
+        Close a trace: add its total, record every stage and log it.
+
+        Args:
+            trace: Trace returned by start()
+            fields: Extra values for the JSON-lines record (e.g. the question)
+
+        Returns:
+            Stage timings as {'<stage>_ms': milliseconds}
+        """
+        trace.since("total", trace.started)
+        spans = {f"{name}_ms": round(ms, 3) for name, ms in trace.spans.items()}
+        with self._lock:
+            for name, ms in trace.spans.items():
+                key = f"{trace.kind}.{name}"
+                if key not in self._samples:
+                    self._samples[key] = deque(maxlen=self.window)
+                self._samples[key].append(ms)
+            if self._log is not None:
+                record = {'time': time.time(), 'kind': trace.kind, **fields, 'spans': spans}
+                self._log.write(json.dumps(record) + "\n")
+                self._log.flush()
+        return spans
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Count, mean and p50/p95/p99/max (ms) per '<kind>.<stage>'."""
+        with self._lock:
+            samples = {key: sorted(values) for key, values in self._samples.items()}
+        return {
+            key: {
+                'count': len(ordered),
+                'mean_ms': sum(ordered) / len(ordered),
+                'p50_ms': percentile(ordered, 50),
+                'p95_ms': percentile(ordered, 95),
+                'p99_ms': percentile(ordered, 99),
+                'max_ms': ordered[-1],
+            }
+            for key, ordered in samples.items() if ordered
+        }
+
+    def histogram(self, key: str) -> List[int]:
+        """Sample counts per BUCKETS_MS bucket (plus one overflow bucket)."""
+        counts = [0] * (len(BUCKETS_MS) + 1)
+        with self._lock:
+            values = list(self._samples.get(key, ()))
+        for ms in values:
+            bucket = 0
+            while bucket < len(BUCKETS_MS) and ms > BUCKETS_MS[bucket]:
+                bucket += 1
+            counts[bucket] += 1
+        return counts
+
+    def report(self) -> str:
+        """Percentile table and histograms of every stage, for printing."""
+        stats = self.stats()
+        if not stats:
+            return "📈 No timings recorded yet - ask a question or load a document first"
+
+        labels = [f"≤{b}ms" if b < 1000 else f"≤{b // 1000}s" for b in BUCKETS_MS]
+        labels.append(f">{BUCKETS_MS[-1] // 1000}s")
+
+        lines = [f"📈 Latency (last {self.window} samples per stage)",
+                 f"   {'stage':<26}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+        for key, row in sorted(stats.items()):
+            lines.append(f"   {key:<26}{row['count']:>6}{row['p50_ms']:>10.1f}"
+                         f"{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['max_ms']:>10.1f}")
+        for key in sorted(stats):
+            counts = self.histogram(key)
+            most = max(counts)
+            lines.append(f"\n   {key}")
+            for label, count in zip(labels, counts):
+                if count:
+                    lines.append(f"   {label:>8} {'█' * max(1, round(20 * count / most)):<20} {count}")
+        if self.log_path:
+            lines.append(f"\n   JSON lines: {self.log_path}")
+        return "\n".join(lines)
+
+    def close(self):
+        """Close the JSON-lines file."""
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
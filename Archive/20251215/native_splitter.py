@@ -0,0 +1,183 @@
+"""
+Single-pass text splitter for the Document Q&A System.
+
+Produces exactly the chunks of langchain's RecursiveCharacterTextSplitter
+(length_function=len, keep_separator=True, strip_whitespace=True, plain
+string separators), without importing langchain:
+
+- a text is cut at every occurrence of the first separator (in priority
+  order) that appears in it; each piece keeps its separator at the start
+- pieces shorter than chunk_size are merged greedily into chunks, and the
+  trailing pieces of a chunk (up to chunk_overlap characters) start the next
+- a piece of chunk_size or more ends the current run of merged pieces (no
+  overlap carries across it) and is split the same way with the remaining
+  separators
+
+Where langchain re-joins and re-slices lists of pieces, this works on the
+text as it arrives: each level cuts its text once with str.split, merged
+runs live in a deque with a running length, and chunks are yielded as soon
+as they are complete. split_pieces() accepts an iterator of pages and only
+buffers the text after the last top-level separator it has seen.
+"""
+
+from collections import deque
+from typing import Iterable, Iterator, List
+
+
+class _Merger:
+    """Greedy merge of small pieces into chunks, with overlap (one merged run)."""
+
+    def __init__(self, chunk_size: int, chunk_overlap: int):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.pieces = deque()
+        self.total = 0
+
+    def add(self, piece: str, out: List[str]):
+        """Add a piece; the current chunk goes to `out` if the piece does not fit in it."""
+        length = len(piece)
+        if self.total + length > self.chunk_size and self.pieces:
+            chunk = "".join(self.pieces).strip()
+            if chunk:
+                out.append(chunk)
+            # Keep at most chunk_overlap characters, and room for the new piece
+            while self.total > self.chunk_overlap or (
+                    self.total + length > self.chunk_size and self.total > 0):
+                self.total -= len(self.pieces.popleft())
+        self.pieces.append(piece)
+        self.total += length
+
+    def flush(self, out: List[str]):
+        """Emit the last chunk of the run to `out` and start a new run."""
+        if self.pieces:
+            chunk = "".join(self.pieces).strip()
+            if chunk:
+                out.append(chunk)
+        self.pieces.clear()
+        self.total = 0
+
+
+def _cut(text: str, separator: str) -> List[str]:
+    """Cut text before every occurrence of separator, dropping empty pieces."""
+    if not separator:
+        return list(text)
+    # str.split finds the same non-overlapping, left-to-right occurrences as re.split
+    parts = text.split(separator)
+    pieces = [separator + part for part in parts]
+    if parts[0]:
+        pieces[0] = parts[0]
+    else:
+        del pieces[0]
+    return pieces
+
+
+class StreamingTextSplitter:
+    """Drop-in for RecursiveCharacterTextSplitter.split_text, plus page streaming."""
+
+    def __init__(self, chunk_size: int = 1500, chunk_overlap: int = 300,
+                 separators: List[str] = None):
+        """
+        Args:
+            chunk_size: Maximum characters per chunk
+            chunk_overlap: Characters repeated from the end of the previous chunk
+            separators: Separators in priority order ("" = single characters)
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be > 0, got {chunk_size}")
+        if not 0 <= chunk_overlap <= chunk_size:
+            raise ValueError(f"chunk_overlap must be between 0 and chunk_size, got {chunk_overlap}")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = list(separators) if separators is not None else ["\n\n", "\n", " ", ""]
+
+    def split_text(self, text: str) -> List[str]:
+        """Split a whole text into chunks."""
+        out: List[str] = []
+        self._split(text, self.separators, out)
+        return out
+
+    def split_pieces(self, pieces: Iterable[str]) -> Iterator[str]:
+        """
+        Split text arriving in pieces (e.g. pages); yields the same chunks
+        split_text would for the concatenated text.
+
+        The top-level separator is the first one, in priority order, that
+        occurs anywhere in the text, so chunks start flowing once the
+        highest-priority separator has been seen (for documents, usually in
+        the first page); until then the text is buffered.
+        """
+        first = self.separators[0] if self.separators else ""
+        if not first:
+            # Character-level splitting only - nothing to stream on
+            yield from self.split_text("".join(pieces))
+            return
+
+        merger = _Merger(self.chunk_size, self.chunk_overlap)
+        rest = self.separators[1:]
+        buffer = ""
+        decided = False
+        scanned = 0      # buffer[:scanned] was searched already
+        search_from = 0  # len(first) once buffer starts with an occurrence
+
+        for piece in pieces:
+            buffer += piece
+            # Occurrences can straddle pieces, so re-check the last len(first) - 1 characters
+            found = buffer.find(first, max(search_from, scanned - len(first) + 1))
+            scanned = len(buffer)
+            if found == -1:
+                continue
+            decided = True
+
+            # buffer starts at the document start or at an occurrence, so cutting
+            # it finds the same occurrences as cutting the whole text; every piece
+            # but the last is complete
+            out: List[str] = []
+            cut = _cut(buffer, first)
+            for complete in cut[:-1]:
+                self._piece(complete, rest, merger, out)
+            buffer = cut[-1]
+            scanned = len(buffer)
+            search_from = len(first)
+            yield from out
+
+        if not decided:
+            # The first separator never occurred - split the whole text normally
+            yield from self.split_text(buffer)
+            return
+        out = []
+        if buffer:
+            self._piece(buffer, rest, merger, out)
+        merger.flush(out)
+        yield from out
+
+    def _piece(self, piece: str, separators: List[str], merger: _Merger, out: List[str]):
+        """Route one piece: merge it if small, else end the run and split it further."""
+        if len(piece) < self.chunk_size:
+            merger.add(piece, out)
+            return
+        merger.flush(out)
+        if separators:
+            self._split(piece, separators, out)
+        else:
+            out.append(piece)  # nothing left to split on - kept whole, like langchain
+
+    def _split(self, text: str, separators: List[str], out: List[str]):
+        """Split text with the first separator it contains, recursing into big pieces."""
+        separator = separators[-1] if separators else ""
+        rest: List[str] = []
+        for i, candidate in enumerate(separators):
+            if not candidate:
+                separator = candidate
+                break
+            if candidate in text:
+                separator = candidate
+                rest = separators[i + 1:]
+                break
+
+        merger = _Merger(self.chunk_size, self.chunk_overlap)
+        for piece in _cut(text, separator):
+            if len(piece) < self.chunk_size:
+                merger.add(piece, out)
+            else:
+                self._piece(piece, rest, merger, out)
+        merger.flush(out)
@@ -0,0 +1,178 @@
+"""
+HTTP service mode for the Document Q&A System (Flask).
+
+One DocumentQASystem is loaded once and kept warm in process memory; Flask's
+threaded server answers requests concurrently:
+
+    GET  /              welcome text
+    GET  /health        document and chunk counts
+    GET  /documents     loaded documents
+    POST /ask           {"question": "...", "top_k": 5, "sources": true}
+    POST /load          {"paths": ["a.pdf", ...]} (or "path"); add ?wait=1 to block
+    GET  /load/<job>    status of a load job
+
+Each /ask retrieves its chunks under the system's index lock, as a
+consistent snapshot (a document is seen fully indexed or not at all), and
+then calls the LLM without holding any lock. /load only queues a job: one
+background thread parses the files without the lock and swaps each
+document in, so questions keep being answered from the previous state
+while documents are being reindexed.
+
+Usage:
+    python chatbot.py --serve [--port 5000] docs/*.pdf
+"""
+
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+from flask import Flask, jsonify, request
+
+
+def _error(message: str, status: int):
+    return jsonify({'error': message}), status
+
+
+def _json_object():
+    """The request's JSON body if it is an object ({} when empty), else None."""
+    payload = request.get_json(silent=True)
+    if payload is None and not request.get_data():
+        return {}
+    return payload if isinstance(payload, dict) else None
+
+
+def create_app(qa_system, docs_root: str = None, max_jobs: int = 1000) -> Flask:
+    """
+    Build the Flask app serving a DocumentQASystem.
+
+    Args:
+        qa_system: Loaded (or empty) DocumentQASystem shared by all requests
+        docs_root: /load only accepts files inside this folder (None = any path)
+        max_jobs: Load jobs remembered for GET /load/<job>; the oldest
+                  finished ones are forgotten beyond this
+
+    Returns:
+        Flask application (run it with threaded=True)
+    """
+    # Initialize the Flask application
+    app = Flask(__name__)
+    root = Path(docs_root).resolve() if docs_root else None
+
+    # One loader thread: loads are applied in the order they were requested
+    loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="qa-load")
+    jobs: Dict[str, Dict] = {}
+    jobs_lock = threading.Lock()
+    app.extensions['qa_loader'] = loader
+
+    def run_load(job_id: str, paths: List[str]):
+        with jobs_lock:
+            jobs[job_id]['status'] = 'running'
+        loaded, errors = [], {}
+        for path in paths:
+            try:
+                doc = qa_system.load_document(path)
+                loaded.append(doc['file_name'])
+            except Exception as e:
+                errors[path] = str(e)
+        with jobs_lock:
+            jobs[job_id].update(status='done', loaded=loaded, errors=errors)
+            # Forget the oldest finished jobs (dicts keep insertion order)
+            excess = len(jobs) - max_jobs
+            for old_id in [i for i, job in jobs.items()
+                           if job['status'] == 'done' and i != job_id][:max(excess, 0)]:
+                del jobs[old_id]
+
+    @app.route("/")
+    def welcome():
+        return "Welcome to the Document Q&A service! POST a question to /ask."
+
+    @app.route("/health")
+    def health():
+        return jsonify({'status': 'ok', 'documents': len(qa_system.documents),
+                        'chunks': qa_system.chunk_count})
+
+    @app.route("/documents")
+    def documents():
+        return jsonify([
+            {'file_name': doc['file_name'], 'chunks': doc['total_chunks'],
+             'words': doc['total_words'], 'loaded_at': doc['loaded_at']}
+            for doc in list(qa_system.documents)
+        ])
+
+    @app.route("/ask", methods=["POST"])
+    def ask():
+        payload = _json_object()
+        if payload is None:
+            return _error("The body must be a JSON object", 400)
+        question = str(payload.get('question', '')).strip()
+        if not question:
+            return _error("Missing 'question'", 400)
+        try:
+            top_k = int(payload.get('top_k', 5))
+        except (TypeError, ValueError):
+            return _error("'top_k' must be an integer", 400)
+        if not 1 <= top_k <= 50:
+            return _error("'top_k' must be between 1 and 50", 400)
+        show_sources = payload.get('sources', True)
+        if not isinstance(show_sources, bool):
+            return _error("'sources' must be true or false", 400)
+        if not qa_system.documents:
+            return _error("No documents loaded - POST them to /load first", 409)
+
+        try:
+            response = qa_system.ask_question(question, top_k=top_k,
+                                              show_sources=show_sources)
+        except ValueError as e:  # every document was removed meanwhile
+            return _error(str(e), 409)
+        except Exception as e:  # the LLM call failed (timeout, auth, ...)
+            return _error(str(e), 502)
+        return jsonify(response)
+
+    @app.route("/load", methods=["POST"])
+    def load():
+        payload = _json_object()
+        if payload is None:
+            return _error("The body must be a JSON object", 400)
+        paths = payload.get('paths') or ([payload['path']] if payload.get('path') else [])
+        if (not isinstance(paths, list) or not paths
+                or not all(isinstance(path, str) for path in paths)):
+            return _error("Give 'path' or a list of 'paths'", 400)
+        for path in paths:
+            resolved = Path(path).resolve()
+            if root is not None and not resolved.is_relative_to(root):
+                return _error(f"Outside the documents folder: {path}", 403)
+            if not resolved.is_file():
+                return _error(f"File not found: {path}", 404)
+
+        job_id = uuid.uuid4().hex[:12]
+        with jobs_lock:
+            jobs[job_id] = {'job': job_id, 'status': 'queued', 'paths': paths}
+        future = loader.submit(run_load, job_id, paths)
+
+        if request.args.get('wait'):
+            future.result()
+            with jobs_lock:
+                return jsonify(dict(jobs[job_id]))
+        return jsonify({'job': job_id, 'status': 'queued'}), 202
+
+    @app.route("/load/<job_id>")
+    def load_status(job_id: str):
+        with jobs_lock:
+            job = jobs.get(job_id)
+            if job is None:
+                return _error(f"Unknown job: {job_id}", 404)
+            return jsonify(dict(job))
+
+    return app
+
+
+def serve(qa_system, host: str = "127.0.0.1", port: int = 5000, docs_root: str = None):
+    """Run the threaded development server until interrupted."""
+    app = create_app(qa_system, docs_root=docs_root)
+    print(f"\n🌐 Serving on http://{host}:{port} (POST /ask, POST /load)")
+    try:
+        app.run(host=host, port=port, threaded=True)
+    finally:
+        app.extensions['qa_loader'].shutdown(wait=True)
@@ -0,0 +1,36 @@
+"""
+Thread-safe rate limiter for outgoing LLM requests.
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Spaces out calls to at most `rate` per second across all threads.
+
+    Each acquire() reserves the next free time slot and sleeps until it,
+    so concurrent callers are released one interval apart.
+    """
+
+    def __init__(self, rate: float):
+        """
+        Args:
+            rate: Maximum calls per second
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.interval = 1.0 / rate
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until the caller may make its request."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
@@ -0,0 +1,471 @@
+"""
+Keyword retrieval for the Document Q&A System.
+
+Builds an inverted index over chunk text once at load time so a question
+only touches the postings of its own terms instead of re-tokenizing every
+chunk. Two scoring modes are available:
+
+- "bm25":   Okapi BM25 over the indexed term frequencies and chunk lengths
+- "legacy": reproduces DocumentQASystem._calculate_relevance_score exactly
+
+A third mode, "tfidf", uses the vectorized backend in sparse_retrieval.py
+(see make_index).
+"""
+
+import heapq
+import math
+import re
+import sys
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+
+WORD_PATTERN = re.compile(r'\b\w+\b')
+
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
+    'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
+    'would', 'could', 'should', 'may', 'might', 'must', 'can',
+    'of', 'at', 'by', 'for', 'with', 'about', 'against', 'between',
+    'into', 'through', 'during', 'before', 'after', 'above', 'below',
+    'to', 'from', 'up', 'down', 'in', 'out', 'on', 'off', 'over', 'under'
+})
+
+SCORING_MODES = ("bm25", "legacy", "tfidf")
+
+# Top score above which an answer is reported with 'high' confidence. Scores
+# are 0-1 in every mode but on different scales: legacy gives most on-topic
+# questions 1.0, BM25 and TF-IDF put them around 0.15-0.45 (off-topic ones
+# stay below 0.1 on the example documents).
+HIGH_CONFIDENCE_SCORES = {"bm25": 0.15, "legacy": 0.5, "tfidf": 0.12}
+
+# Below this many postings for a query, exhaustive BM25 beats MaxScore's bookkeeping
+PRUNING_MIN_POSTINGS = 20000
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase text and split it into word tokens."""
+    return WORD_PATTERN.findall(text.lower())
+
+
+def trigrams(word: str) -> Set[str]:
+    """Distinct character trigrams of a word."""
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+def chunk_terms(text: str) -> Tuple[Dict[str, int], int]:
+    """
+    Tokenize a chunk for indexing.
+
+    Returns:
+        (term -> frequency, number of words)
+    """
+    words = tokenize(text)
+    return dict(Counter(words)), len(words)
+
+
+def extract_query_terms(query: str) -> List[str]:
+    """
+    Extract scoring terms from a question.
+    Drops stop words and words of two characters or fewer; duplicates are kept
+    because the legacy scorer counts them.
+    """
+    return [word for word in tokenize(query)
+            if word not in STOP_WORDS and len(word) > 2]
+
+
+def make_index(scoring: str):
+    """
+    Create the retrieval index for a scoring mode.
+    "tfidf" gets the sparse-matrix backend; the others share InvertedIndex.
+    """
+    if scoring not in SCORING_MODES:
+        raise ValueError(f"Unknown scoring mode: {scoring} (choose from {SCORING_MODES})")
+    if scoring == "tfidf":
+        from sparse_retrieval import SparseTfidfIndex
+        return SparseTfidfIndex()
+    return InvertedIndex()
+
+
+class InvertedIndex:
+    """
+    Inverted index over chunk text with per-chunk term frequencies and lengths.
+
+    Chunks are addressed by their position in DocumentQASystem.all_chunks.
+    """
+
+    scoring_modes = ("bm25", "legacy")
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization strength
+        """
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.doc_lengths: List[int] = []
+        self.total_length = 0
+        # Positions still holding a chunk (removed chunks keep their position)
+        self.live_chunks = 0
+        # Character trigram -> vocabulary words containing it (partial matching);
+        # only the legacy scorer reads it, so it is built on the first legacy query
+        self.trigram_index: Optional[Dict[str, Set[str]]] = None
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add_chunk(self, text: str) -> int:
+        """
+        Index one chunk of text.
+
+        Args:
+            text: Chunk content
+
+        Returns:
+            Position assigned to the chunk
+        """
+        return self.add_chunk_terms(*chunk_terms(text))
+
+    def add_chunk_terms(self, term_freqs: Dict[str, int], length: int) -> int:
+        """
+        Index one chunk that has already been tokenized with chunk_terms().
+
+        Args:
+            term_freqs: Term -> frequency in the chunk
+            length: Number of words in the chunk
+
+        Returns:
+            Position assigned to the chunk
+        """
+        chunk_idx = len(self.doc_lengths)
+        for term, freq in term_freqs.items():
+            if term not in self.postings:
+                self.postings[term] = {}
+                if self.trigram_index is not None:
+                    self._add_trigrams(term)
+            self.postings[term][chunk_idx] = freq
+        self.doc_lengths.append(length)
+        self.total_length += length
+        self.live_chunks += 1
+        return chunk_idx
+
+    def remove_chunk(self, chunk_idx: int, text: str):
+        """
+        Take one chunk out of the index.
+
+        Args:
+            chunk_idx: Position the chunk was indexed at
+            text: Chunk content (re-tokenized to find its postings)
+        """
+        self.remove_chunk_terms(chunk_idx, chunk_terms(text)[0])
+
+    def remove_chunk_terms(self, chunk_idx: int, term_freqs: Dict[str, int]):
+        """
+        Take one tokenized chunk out of the index.
+
+        Only the chunk's own postings are touched, so document frequencies
+        and the average length stay exact without rebuilding the index.
+        The position is not reused.
+
+        Args:
+            chunk_idx: Position the chunk was indexed at
+            term_freqs: Term -> frequency in the chunk (see chunk_terms)
+        """
+        for term in term_freqs:
+            postings = self.postings.get(term)
+            if postings is None or postings.pop(chunk_idx, None) is None:
+                continue
+            if not postings:
+                del self.postings[term]
+                if self.trigram_index is None:
+                    continue
+                for gram in trigrams(term):
+                    words = self.trigram_index[gram]
+                    words.discard(term)
+                    if not words:
+                        del self.trigram_index[gram]
+        self.total_length -= self.doc_lengths[chunk_idx]
+        self.doc_lengths[chunk_idx] = 0
+        self.live_chunks -= 1
+
+    def clear(self):
+        """Drop all indexed chunks."""
+        self.postings = {}
+        self.doc_lengths = []
+        self.total_length = 0
+        self.live_chunks = 0
+        self.trigram_index = None
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by postings, lengths and the trigram index."""
+        total = sys.getsizeof(self.postings) + sys.getsizeof(self.doc_lengths)
+        for term, postings in self.postings.items():
+            # Term string, its postings dict and an int object per chunk id
+            total += sys.getsizeof(term) + sys.getsizeof(postings) + 28 * len(postings)
+        if self.trigram_index is not None:
+            total += sys.getsizeof(self.trigram_index)
+            for gram, words in self.trigram_index.items():
+                total += sys.getsizeof(gram) + sys.getsizeof(words)
+        return total
+
+    def _add_trigrams(self, term: str):
+        for gram in trigrams(term):
+            self.trigram_index.setdefault(gram, set()).add(term)
+
+    def _matching_vocabulary(self, term: str) -> Set[str]:
+        """
+        Indexed words that contain the term or are contained in it.
+
+        Words inside the term are found by looking up each of its substrings;
+        words containing the term must share all of its trigrams, so only the
+        intersection of those trigram sets needs the substring check.
+        """
+        matches = {term[i:j] for i in range(len(term))
+                   for j in range(i + 1, len(term) + 1)}
+        matches.intersection_update(self.postings)
+
+        grams = trigrams(term)
+        if not grams:
+            # Too short for trigrams - fall back to scanning the vocabulary
+            matches.update(word for word in self.postings if term in word)
+            return matches
+
+        if self.trigram_index is None:
+            self.trigram_index = {}
+            for word in self.postings:
+                self._add_trigrams(word)
+        candidate_sets = sorted((self.trigram_index.get(gram, set()) for gram in grams), key=len)
+        candidates = candidate_sets[0].intersection(*candidate_sets[1:])
+        matches.update(word for word in candidates if term in word)
+        return matches
+
+    def score_legacy(self, query: str) -> Dict[int, float]:
+        """
+        Score chunks exactly like DocumentQASystem._calculate_relevance_score.
+
+        Returns:
+            Mapping of chunk position -> score, for chunks scoring above zero
+        """
+        query_terms = extract_query_terms(query)
+        if not query_terms:
+            return {}
+
+        # Resolve each distinct term's partial matches once per query
+        partial_matches = {term: self._matching_vocabulary(term) for term in set(query_terms)}
+
+        raw: Dict[int, float] = {}
+        for term in query_terms:
+            # Exact match: 2 points per occurrence of the whole word
+            for chunk_idx, freq in self.postings.get(term, {}).items():
+                raw[chunk_idx] = raw.get(chunk_idx, 0.0) + freq * 2.0
+
+            # Partial match (for compound words): 0.5 per matching word occurrence
+            for word in partial_matches[term]:
+                for chunk_idx, freq in self.postings[word].items():
+                    raw[chunk_idx] = raw.get(chunk_idx, 0.0) + 0.5 * freq
+
+        scores = {}
+        for chunk_idx, score in raw.items():
+            score = score / (len(query_terms) * (self.doc_lengths[chunk_idx] / 100))
+            score = min(score, 1.0)
+            if score > 0:
+                scores[chunk_idx] = score
+        return scores
+
+    def idf(self, term: str) -> float:
+        """BM25 inverse document frequency (always positive)."""
+        df = len(self.postings.get(term, ()))
+        n = self.live_chunks
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def score_bm25(self, query: str) -> Dict[int, float]:
+        """
+        Score chunks with Okapi BM25.
+
+        Scores are divided by the best score any chunk could reach for the
+        query (sum of idf * (k1 + 1)), so they fall in 0-1 like the legacy ones.
+
+        Returns:
+            Mapping of chunk position -> normalized score, for matching chunks
+        """
+        query_terms = extract_query_terms(query)
+        if not query_terms or not self.live_chunks:
+            return {}
+
+        avg_length = self.total_length / self.live_chunks or 1.0
+        k1, b = self.k1, self.b
+
+        scores: Dict[int, float] = {}
+        max_score = 0.0
+        for term, query_freq in Counter(query_terms).items():
+            idf = self.idf(term)
+            max_score += query_freq * idf * (k1 + 1)
+            for chunk_idx, freq in self.postings.get(term, {}).items():
+                norm = k1 * (1 - b + b * self.doc_lengths[chunk_idx] / avg_length)
+                weight = query_freq * idf * freq * (k1 + 1) / (freq + norm)
+                scores[chunk_idx] = scores.get(chunk_idx, 0.0) + weight
+
+        return {chunk_idx: score / max_score for chunk_idx, score in scores.items()}
+
+    def search_bm25_pruned(self, query: str, top_k: int = 5,
+                           stats: Dict[str, int] = None) -> List[Tuple[int, float]]:
+        """
+        Exact BM25 top_k with MaxScore dynamic pruning.
+
+        No term can add more than its upper bound idf * (k1 + 1) to a chunk's
+        score. Terms are ordered by upper bound; once the top_k are full, the
+        terms whose bounds together cannot lift a chunk past the k-th best
+        score are "non-essential": their postings are no longer walked, only
+        looked up for chunks found through the other terms, and a chunk is
+        dropped as soon as its partial score plus the bounds still unchecked
+        falls short.
+
+        Chunks are visited in position order (postings dicts are filled in
+        position order), so a chunk that only ties the k-th best score is
+        skipped safely: the earlier chunk wins the tie, as in search().
+        Results, scores included, are identical to exhaustive scoring.
+
+        Args:
+            query: User's question
+            top_k: Number of results
+            stats: Filled with 'postings' (postings read) and 'scored' (chunks
+                   whose full score was computed)
+
+        Returns:
+            List of (chunk position, score), best first
+        """
+        stats = stats if stats is not None else {}
+        stats['postings'] = stats['scored'] = 0
+        query_terms = extract_query_terms(query)
+        if top_k <= 0 or not query_terms or not self.live_chunks:
+            return []
+
+        avg_length = self.total_length / self.live_chunks or 1.0
+        k1, b = self.k1, self.b
+        doc_lengths = self.doc_lengths
+
+        # In score_bm25's order, so the final scores are computed identically
+        terms = []
+        max_score = 0.0
+        for term, query_freq in Counter(query_terms).items():
+            idf = self.idf(term)
+            max_score += query_freq * idf * (k1 + 1)
+            postings = self.postings.get(term)
+            if postings:
+                terms.append((query_freq * idf, postings))
+
+        # Cheapest bound first; prefix[i] = sum of the first i bounds
+        by_bound = sorted(terms, key=lambda item: item[0])
+        bounds = [weight * (k1 + 1) for weight, _ in by_bound]
+        prefix = [0.0]
+        for bound in bounds:
+            prefix.append(prefix[-1] + bound)
+        # Partial scores are summed in a different order than the final one
+        slack = 1e-9 * (prefix[-1] or 1.0)
+
+        def weight_of(weight: float, freq: int, chunk_idx: int) -> float:
+            norm = k1 * (1 - b + b * doc_lengths[chunk_idx] / avg_length)
+            return weight * freq * (k1 + 1) / (freq + norm)
+
+        # One cursor per term: (position, term, frequency, remaining postings)
+        cursors = []
+        for i, (_, postings) in enumerate(by_bound):
+            items = iter(postings.items())
+            chunk_idx, freq = next(items)
+            cursors.append((chunk_idx, i, freq, items))
+        heapq.heapify(cursors)
+        essential = 0      # by_bound[:essential] are non-essential
+        threshold = -1.0   # k-th best (unnormalized) score once top_k are found
+        best: List[Tuple[float, int]] = []  # min-heap of (normalized score, -position)
+        postings_read = scored = 0
+
+        while cursors:
+            chunk_idx = cursors[0][0]
+            partial = 0.0
+            # Advance every essential cursor on this chunk; cursors of terms
+            # that became non-essential are dropped (looked up from now on)
+            while cursors and cursors[0][0] == chunk_idx:
+                _, i, freq, items = cursors[0]
+                if i < essential:
+                    heapq.heappop(cursors)
+                    continue
+                postings_read += 1
+                partial += weight_of(by_bound[i][0], freq, chunk_idx)
+                following = next(items, None)
+                if following is None:
+                    heapq.heappop(cursors)
+                else:
+                    heapq.heapreplace(cursors, (following[0], i, following[1], items))
+
+            # Non-essential terms, biggest bound first, while the chunk can still qualify
+            survived = True
+            for i in range(essential - 1, -1, -1):
+                if partial + prefix[i + 1] < threshold - slack:
+                    survived = False
+                    break
+                freq = by_bound[i][1].get(chunk_idx)
+                postings_read += 1
+                if freq:
+                    partial += weight_of(by_bound[i][0], freq, chunk_idx)
+            if not survived or partial < threshold - slack:
+                continue
+
+            # Exact score, summed like score_bm25
+            scored += 1
+            total = 0.0
+            for weight, postings in terms:
+                freq = postings.get(chunk_idx)
+                if freq:
+                    total += weight_of(weight, freq, chunk_idx)
+            entry = (total / max_score, -chunk_idx)
+            if len(best) < top_k:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+            else:
+                continue
+            if len(best) == top_k:
+                threshold = best[0][0] * max_score
+                while essential < len(bounds) and prefix[essential + 1] < threshold - slack:
+                    essential += 1
+
+        stats['postings'] = postings_read
+        stats['scored'] = scored
+        return [(-negative_idx, score) for score, negative_idx in
+                sorted(best, key=lambda entry: (-entry[0], -entry[1]))]
+
+    def search(self, query: str, top_k: int = 5, scoring: str = "bm25",
+               pruning: bool = True) -> List[Tuple[int, float]]:
+        """
+        Return the top_k chunk positions for a query.
+
+        Ties keep load order, matching a stable sort over all chunks.
+
+        Args:
+            query: User's question
+            top_k: Number of results
+            scoring: "bm25" or "legacy"
+            pruning: Use MaxScore pruning for BM25 when the query's terms
+                     have PRUNING_MIN_POSTINGS postings or more (same
+                     results, fewer postings scored; see search_bm25_pruned)
+
+        Returns:
+            List of (chunk position, score), best first
+        """
+        if scoring == "bm25" and pruning:
+            postings = sum(len(self.postings.get(term, ()))
+                           for term in set(extract_query_terms(query)))
+            if postings >= PRUNING_MIN_POSTINGS:
+                return self.search_bm25_pruned(query, top_k)
+        if scoring == "bm25":
+            scores = self.score_bm25(query)
+        elif scoring == "legacy":
+            scores = self.score_legacy(query)
+        else:
+            raise ValueError(f"The inverted index cannot score with '{scoring}' "
+                             f"(choose from {self.scoring_modes})")
+
+        best = heapq.nsmallest(top_k, scores.items(), key=lambda item: (-item[1], item[0]))
+        return best
@@ -0,0 +1,227 @@
+"""
+Vectorized TF-IDF retrieval for the Document Q&A System.
+
+Keeps every chunk as a row of a sparse CSR matrix of term counts. A query is
+scored against all chunks with one sparse matrix-vector product and the
+top_k are picked with numpy.argpartition instead of a full sort.
+
+Weights are (1 + log tf) * idf, with rows L2-normalized, so scores are the
+cosine similarity between a chunk and the query terms (0-1).
+
+The idf changes whenever a chunk is added or removed, so the matrix kept
+between queries holds the idf-free 1 + log tf values (and their squares).
+New chunks are appended to it as rows and removed ones zeroed in place; a
+query then applies the idf to the query vector and divides by row norms
+recomputed with one sparse product. Only a new index (after compaction)
+builds the matrix from scratch.
+
+Requires numpy and scipy (only imported when this backend is used).
+"""
+
+import sys
+from array import array
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from retrieval import extract_query_terms, chunk_terms
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+    sparse = None
+
+
+class SparseTfidfIndex:
+    """
+    CSR TF-IDF matrix over all chunks, with the same add/search interface
+    as retrieval.InvertedIndex.
+    """
+
+    scoring_modes = ("tfidf",)
+
+    def __init__(self):
+        if np is None or sparse is None:
+            raise ImportError(
+                "The tfidf retrieval backend needs numpy and scipy: pip install numpy scipy"
+            )
+        self.clear()
+
+    def clear(self):
+        """Drop all indexed chunks."""
+        self.vocabulary: Dict[str, int] = {}
+        self.doc_freq = array('q')
+        # Raw counts in CSR layout, appended row by row
+        self._indices = array('q')
+        self._counts = array('f')
+        self._indptr = array('q', [0])
+        self._removed_rows = 0
+        # 1 + log tf (and squared) for the first _log_tf.shape[0] rows, extended lazily
+        self._log_tf = None
+        self._log_tf_squared = None
+        self._removed_since_sync: List[int] = []
+        self._idf = None  # idf and row norms, recomputed after any change
+        self._norms = None
+
+    def __len__(self) -> int:
+        return len(self._indptr) - 1
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the raw CSR arrays, vocabulary and weights."""
+        total = sum(column.itemsize * len(column) for column in
+                    (self.doc_freq, self._indices, self._counts, self._indptr))
+        total += sys.getsizeof(self.vocabulary) + sum(sys.getsizeof(term) for term in self.vocabulary)
+        for matrix in (self._log_tf, self._log_tf_squared):
+            if matrix is not None:
+                total += matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+        return total
+
+    def __getstate__(self) -> Dict:
+        # The matrices are derived from the raw counts; rebuilt after unpickling
+        state = self.__dict__.copy()
+        state.update(_log_tf=None, _log_tf_squared=None, _removed_since_sync=[],
+                     _idf=None, _norms=None)
+        return state
+
+    def add_chunk(self, text: str) -> int:
+        """Index one chunk of text; returns its row."""
+        return self.add_chunk_terms(*chunk_terms(text))
+
+    def add_chunk_terms(self, term_freqs: Dict[str, int], length: int = None) -> int:
+        """
+        Append one tokenized chunk as a new matrix row.
+
+        Args:
+            term_freqs: Term -> frequency in the chunk
+            length: Unused (kept for interface compatibility)
+
+        Returns:
+            Row assigned to the chunk
+        """
+        row = len(self)
+        for term, freq in term_freqs.items():
+            column = self.vocabulary.get(term)
+            if column is None:
+                column = self.vocabulary[term] = len(self.vocabulary)
+                self.doc_freq.append(0)
+            self.doc_freq[column] += 1
+            self._indices.append(column)
+            self._counts.append(freq)
+        self._indptr.append(len(self._indices))
+        self._idf = None
+        return row
+
+    def remove_chunk(self, row: int, text: str = None):
+        """
+        Take one chunk out of the index.
+
+        The row's counts are zeroed in place (its columns are read back from
+        the CSR arrays, so the text is not needed) and document frequencies
+        drop by one; the row itself stays so later rows keep their positions.
+
+        Args:
+            row: Row the chunk was indexed at
+            text: Unused (kept for interface compatibility)
+        """
+        for position in range(self._indptr[row], self._indptr[row + 1]):
+            if self._counts[position]:
+                self.doc_freq[self._indices[position]] -= 1
+                self._counts[position] = 0
+        self._removed_rows += 1
+        self._removed_since_sync.append(row)
+        self._idf = None
+
+    def _sync(self):
+        """
+        Bring the log-tf matrix, idf and row norms up to date: append rows
+        added since the last query, zero removed ones, recompute idf/norms.
+        """
+        if self._idf is not None:
+            return
+        n_rows, n_columns = len(self), len(self.vocabulary)
+        synced = self._log_tf.shape[0] if self._log_tf is not None else 0
+        if self._log_tf is None or synced < n_rows or self._log_tf.shape[1] < n_columns:
+            start, end = self._indptr[synced], self._indptr[n_rows]
+            indices = np.frombuffer(self._indices, dtype=np.int64)[start:end] if self._indices else \
+                np.zeros(0, dtype=np.int64)
+            counts = np.frombuffer(self._counts, dtype=np.float32)[start:end] if self._counts else \
+                np.zeros(0, dtype=np.float32)
+            indptr = np.frombuffer(self._indptr, dtype=np.int64)[synced:n_rows + 1] - start
+
+            # Removed chunks have zero counts and get zero weights
+            log_counts = np.zeros_like(counts)
+            np.log(counts, out=log_counts, where=counts > 0)
+            data = np.where(counts > 0, 1.0 + log_counts, 0.0).astype(np.float32)
+            new_rows = sparse.csr_matrix((data, indices.copy(), indptr.copy()),
+                                         shape=(n_rows - synced, n_columns))
+            new_squared = sparse.csr_matrix((data * data, indices.copy(), indptr.copy()),
+                                            shape=(n_rows - synced, n_columns))
+            if self._log_tf is None:
+                self._log_tf, self._log_tf_squared = new_rows, new_squared
+            else:
+                # New terms add columns; only the new rows are converted
+                self._log_tf.resize((synced, n_columns))
+                self._log_tf_squared.resize((synced, n_columns))
+                self._log_tf = sparse.vstack([self._log_tf, new_rows], format="csr")
+                self._log_tf_squared = sparse.vstack([self._log_tf_squared, new_squared], format="csr")
+
+        # Rows removed before this sync were appended with zero counts already
+        for row in self._removed_since_sync:
+            if row < synced:
+                for matrix in (self._log_tf, self._log_tf_squared):
+                    matrix.data[matrix.indptr[row]:matrix.indptr[row + 1]] = 0
+        self._removed_since_sync = []
+
+        df = np.frombuffer(self.doc_freq, dtype=np.int64) if self.doc_freq else \
+            np.zeros(0, dtype=np.int64)
+        live_rows = n_rows - self._removed_rows
+        self._idf = np.log((1 + live_rows) / (1 + df)).astype(np.float32) + 1.0
+        # L2 norm of each weighted row (rows without terms keep a norm of 1)
+        squared = self._log_tf_squared @ (self._idf * self._idf)
+        squared[squared == 0] = 1.0
+        self._norms = np.sqrt(squared).astype(np.float32)
+
+    def search(self, query: str, top_k: int = 5,
+               scoring: str = "tfidf") -> List[Tuple[int, float]]:
+        """
+        Return the top_k chunk rows for a query.
+
+        Args:
+            query: User's question
+            top_k: Number of results
+            scoring: Must be "tfidf"
+
+        Returns:
+            List of (chunk row, score), best first; ties keep load order
+        """
+        if scoring not in self.scoring_modes:
+            raise ValueError(f"The tfidf backend cannot score with '{scoring}'")
+
+        # Terms whose chunks were all removed stay in the vocabulary with df 0
+        query_counts = Counter(term for term in extract_query_terms(query)
+                               if term in self.vocabulary
+                               and self.doc_freq[self.vocabulary[term]])
+        if not query_counts or not len(self):
+            return []
+
+        self._sync()
+        query_vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for term, count in query_counts.items():
+            column = self.vocabulary[term]
+            query_vector[column] = count * self._idf[column]
+        query_vector /= np.linalg.norm(query_vector)
+
+        # Row weights are log_tf * idf / norm: fold the idf into the query side
+        scores = (self._log_tf @ (query_vector * self._idf)) / self._norms
+        matching = np.flatnonzero(scores > 0)
+        if len(matching) > top_k:
+            # argpartition finds the k-th best score without sorting every match;
+            # rows tied with it are taken in load order
+            candidate_scores = scores[matching]
+            kth = candidate_scores[np.argpartition(-candidate_scores, top_k - 1)[top_k - 1]]
+            above = matching[candidate_scores > kth]
+            tied = matching[candidate_scores == kth]
+            matching = np.concatenate([above, tied[:top_k - len(above)]])
+        best = sorted(matching.tolist(), key=lambda row: (-scores[row], row))
+        return [(row, float(scores[row])) for row in best]
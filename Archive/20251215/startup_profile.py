@@ -0,0 +1,120 @@
+"""
+Import-time profile of the Document Q&A CLI (python chatbot.py --profile-startup).
+
+Startup cost is dominated by imports, so this runs `python -X importtime` in
+fresh interpreters (nothing already cached in sys.modules) and reports:
+
+- the time to `import chatbot`, broken down by top-level package
+- what each deferred dependency costs when it is first used (first PDF,
+  first question, ...), which chatbot.py only imports at that point
+
+The report can also be written as JSON to compare runs across commits.
+"""
+
+import json
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Imports chatbot.py defers until first use: label -> import statement
+DEFERRED_IMPORTS = {
+    'PDF loader (first PDF)': "from langchain_community.document_loaders import PyPDFLoader",
+    'DOCX loader (first DOCX)': "from langchain_community.document_loaders import Docx2txtLoader",
+    'Gemini client (first question)': "from langchain_google_genai import ChatGoogleGenerativeAI",
+    'Prompt chain (first question)': "from langchain_core.prompts import ChatPromptTemplate",
+    'langchain splitter (--splitter langchain)':
+        "from langchain_text_splitters import RecursiveCharacterTextSplitter",
+}
+
+
+def _import_times(code: str) -> List[Tuple[int, str, int, int]]:
+    """
+    Run code in a fresh interpreter with -X importtime.
+
+    Returns:
+        (depth, module, self_us, cumulative_us) per imported module, in
+        the order they finished importing
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=Path(__file__).resolve().parent,
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Profiling '{code}' failed:\n{result.stderr.strip()[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        entries.append((depth, name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def profile_startup(repeat: int = 3) -> Dict:
+    """
+    Measure import times (best of `repeat` runs each).
+
+    Returns:
+        Dictionary with 'import_chatbot_ms', 'packages' (self time per
+        top-level package, slowest first) and 'deferred' (first-use cost
+        per deferred dependency)
+    """
+    best = None
+    for _ in range(repeat):
+        entries = _import_times("import chatbot")
+        total = next(cumulative for depth, name, _, cumulative in entries
+                     if depth == 0 and name == "chatbot")
+        if best is None or total < best[0]:
+            best = (total, entries)
+    total_us, entries = best
+
+    # Self time per root package, so every module is counted once
+    packages: Dict[str, int] = defaultdict(int)
+    for _, name, self_us, _ in entries:
+        packages[name.split(".")[0]] += self_us
+
+    deferred = {}
+    for label, statement in DEFERRED_IMPORTS.items():
+        costs = []
+        for _ in range(repeat):
+            entries = _import_times(f"import chatbot\n{statement}")
+            chatbot_at = next(i for i, (depth, name, _, _) in enumerate(entries)
+                              if depth == 0 and name == "chatbot")
+            costs.append(sum(cumulative for depth, _, _, cumulative in entries[chatbot_at + 1:]
+                             if depth == 0))
+        deferred[label] = min(costs) / 1000
+
+    return {
+        'python': sys.version.split()[0],
+        'import_chatbot_ms': total_us / 1000,
+        'packages': {name: us / 1000 for name, us in
+                     sorted(packages.items(), key=lambda item: item[1], reverse=True)},
+        'deferred': deferred,
+    }
+
+
+def print_profile(profile: Dict, top: int = 12):
+    """Print a profile returned by profile_startup()."""
+    print(f"\n⏱️  Startup profile (Python {profile['python']})")
+    print(f"   import chatbot: {profile['import_chatbot_ms']:8.1f} ms")
+    print(f"\n   {'package':<32}{'self ms':>10}")
+    for name, ms in list(profile['packages'].items())[:top]:
+        print(f"   {name:<32}{ms:>10.1f}")
+    print(f"\n   {'deferred until first use':<42}{'ms':>8}")
+    for label, ms in profile['deferred'].items():
+        print(f"   {label:<42}{ms:>8.1f}")
+
+
+def run(output: str = None):
+    """Profile, print, and optionally save the profile as JSON."""
+    profile = profile_startup()
+    print_profile(profile)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(profile, f, indent=2)
+        print(f"\n💾 Saved to {output}")
@@ -0,0 +1,95 @@
+"""
+StreamingTextSplitter must produce exactly the chunks of langchain's
+RecursiveCharacterTextSplitter, for whole texts and for texts fed in as
+pages of any size.
+
+Run with:
+    python -m pytest test_native_splitter.py
+"""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from native_splitter import StreamingTextSplitter
+
+langchain_text_splitters = pytest.importorskip("langchain_text_splitters")
+
+DOCS_DIR = Path(__file__).parent
+EXAMPLE_DOCS = [DOCS_DIR / name for name in
+                ("climate_change.txt", "employee_handbook.txt", "machine_learning.txt")]
+
+# Same settings as DocumentQASystem
+SEPARATORS = ["\n\n", "\n", ". ", ", ", " ", ""]
+
+
+def make_splitters(chunk_size=1500, chunk_overlap=300, separators=SEPARATORS):
+    native = StreamingTextSplitter(chunk_size, chunk_overlap, separators)
+    reference = langchain_text_splitters.RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size, chunk_overlap=chunk_overlap, length_function=len,
+        separators=separators, is_separator_regex=False
+    )
+    return native, reference
+
+
+def pages(text, page_size):
+    return (text[i:i + page_size] for i in range(0, len(text), page_size))
+
+
+def assert_same_chunks(text, chunk_size=1500, chunk_overlap=300, separators=SEPARATORS):
+    native, reference = make_splitters(chunk_size, chunk_overlap, separators)
+    expected = reference.split_text(text)
+    assert native.split_text(text) == expected
+    for page_size in (1, 7, 100, chunk_size - 1, chunk_size, 4096):
+        assert list(native.split_pieces(pages(text, page_size))) == expected, page_size
+    return expected
+
+
+@pytest.mark.parametrize("path", EXAMPLE_DOCS, ids=lambda path: path.name)
+def test_example_docs(path):
+    assert assert_same_chunks(path.read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("text", ["", " ", "\n\n", "\n\n\n\n", " \n \n "])
+def test_empty_and_blank_text(text):
+    assert assert_same_chunks(text) == []
+    native, _ = make_splitters()
+    assert list(native.split_pieces([])) == []
+    assert list(native.split_pieces(["", "", ""])) == []
+
+
+@pytest.mark.parametrize("separator", ["\n\n", "\n", ". ", ", ", " "])
+def test_separator_at_chunk_boundary(separator):
+    # Pieces that fill a chunk exactly, so each separator lands on the boundary
+    for offset in (-2, -1, 0, 1, 2):
+        piece = "x" * (100 - len(separator) + offset)
+        assert_same_chunks(separator.join([piece] * 12), chunk_size=100, chunk_overlap=20)
+        assert_same_chunks(separator + separator.join([piece] * 12) + separator,
+                           chunk_size=100, chunk_overlap=20)
+
+
+def test_pieces_longer_than_chunk_size():
+    # No separator at all: split down to single characters
+    assert_same_chunks("y" * 1000, chunk_size=100, chunk_overlap=30)
+    # Long words between short ones, and a long paragraph between short ones
+    words = ["short", "w" * 250, "tiny", "v" * 99, "u" * 100, "t" * 101, "end"]
+    assert_same_chunks(" ".join(words), chunk_size=100, chunk_overlap=30)
+    assert_same_chunks("intro\n\n" + "long sentence. " * 40 + "\n\noutro",
+                       chunk_size=100, chunk_overlap=30)
+
+
+@pytest.mark.parametrize("chunk_overlap", [0, 1, 50, 100])
+def test_overlap_settings(chunk_overlap):
+    text = "\n\n".join("Paragraph %d. " % i + "Some words, and more words. " * (i % 7)
+                       for i in range(60))
+    assert_same_chunks(text, chunk_size=100, chunk_overlap=chunk_overlap)
+
+
+def test_random_texts():
+    rng = random.Random(16)
+    alphabet = ["a", "bb", "ccc", " ", " ", ", ", ". ", "\n", "\n\n", "z" * 40]
+    for _ in range(200):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 400)))
+        chunk_size = rng.randint(5, 120)
+        assert_same_chunks(text, chunk_size=chunk_size, chunk_overlap=rng.randint(0, chunk_size))
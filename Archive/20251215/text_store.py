@@ -0,0 +1,101 @@
+"""
+Append-only on-disk store for chunk text.
+
+Used by streaming ingestion: each chunk's text is written once and chunks keep
+only its (offset, length) in bytes, so loaded documents do not sit in RAM.
+Reads go through a memory map when enabled, otherwise through seek/read.
+"""
+
+import mmap
+import tempfile
+import threading
+from typing import Tuple
+
+
+class TextStore:
+    """Append-only UTF-8 text file addressed by byte offset and length."""
+
+    def __init__(self, path: str = None, use_mmap: bool = True):
+        """
+        Args:
+            path: File to store text in (default: anonymous temp file,
+                  deleted when the store is closed)
+            use_mmap: Serve reads from a memory map of the file
+        """
+        self.path = path
+        self.use_mmap = use_mmap
+        self._file = open(path, "w+b") if path else tempfile.TemporaryFile()
+        self._size = 0
+        self._dirty = False
+        self._map = None
+        self._mapped_size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """Bytes written so far."""
+        return self._size
+
+    def append(self, text: str) -> Tuple[int, int]:
+        """
+        Append text to the store.
+
+        Returns:
+            (offset, length) in bytes, for read()
+        """
+        data = text.encode("utf-8")
+        with self._lock:
+            offset = self._size
+            self._file.seek(offset)
+            self._file.write(data)
+            self._size += len(data)
+            self._dirty = True
+        return offset, len(data)
+
+    def read(self, offset: int, length: int) -> str:
+        """Read back text written by append()."""
+        if length == 0:
+            return ""
+        with self._lock:
+            if self._dirty:
+                self._file.flush()
+                self._dirty = False
+
+            if not self.use_mmap:
+                self._file.seek(offset)
+                return self._file.read(length).decode("utf-8")
+
+            if offset + length > self._mapped_size:
+                # The file grew since it was mapped - map the new size
+                if self._map is not None:
+                    self._map.close()
+                self._map = mmap.mmap(self._file.fileno(), self._size, access=mmap.ACCESS_READ)
+                self._mapped_size = self._size
+            return self._map[offset:offset + length].decode("utf-8")
+
+    def clear(self):
+        """Drop all stored text."""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+                self._mapped_size = 0
+            self._file.seek(0)
+            self._file.truncate()
+            self._size = 0
+            self._dirty = False
+
+    def close(self):
+        """Close the store (an anonymous temp file is deleted)."""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._file.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
@@ -0,0 +1,225 @@
+"""
+Named workspaces for the Document Q&A System.
+
+A workspace is a separate corpus (an HR handbook, ML notes, climate
+reports, ...) with its own DocumentQASystem - its own chunk store, index and
+answer cache - so retrieval never mixes corpora.
+
+All workspaces share one memory budget. When the resident workspaces grow
+past it, the least recently used ones are spilled to disk (documents, chunk
+store and index pickled by DocumentQASystem.spill) and their memory is
+released. Asking or loading into a spilled workspace faults it back in,
+possibly spilling others; a question is answered exactly as before, only
+the first one after a fault-in pays for reading the file.
+
+Workspaces in use (inside WorkspaceManager.use, or pinned) are never spilled.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List
+
+from chatbot import DocumentQASystem
+
+
+class WorkspaceManager:
+    """Named DocumentQASystem instances under a shared memory budget."""
+
+    def __init__(self, memory_budget_mb: float = 1024, spill_dir: str = ".qa_workspaces",
+                 **system_kwargs):
+        """
+        Args:
+            memory_budget_mb: Resident workspaces are kept under this size
+                              (estimated by DocumentQASystem.memory_bytes)
+            spill_dir: Folder for the on-disk copies of spilled workspaces
+            system_kwargs: Passed to every DocumentQASystem (llm, scoring, ...)
+        """
+        self.memory_budget = int(memory_budget_mb * 1e6)
+        self.spill_dir = Path(spill_dir)
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self.system_kwargs = system_kwargs
+
+        # name -> system, least recently used first
+        self._systems: "OrderedDict[str, DocumentQASystem]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._spilled: Dict[str, Dict] = {}  # name -> counts of the spilled workspace
+        self._pins: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self.spills = 0
+        self.faults = 0
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._systems)
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._systems
+
+    def _spill_path(self, name: str) -> Path:
+        # Readable prefix plus a hash of the exact name, so "a b" and "a_b" never share a file
+        digest = hashlib.sha256(name.encode("utf-8")).hexdigest()[:16]
+        readable = re.sub(r"[^\w.-]", "_", name)[:40]
+        return self.spill_dir / f"{readable}-{digest}.pkl"
+
+    def get(self, name: str, create: bool = True) -> DocumentQASystem:
+        """
+        A workspace's system, faulted in from disk if it was spilled.
+
+        Args:
+            name: Workspace name
+            create: Create the workspace if it does not exist
+
+        Returns:
+            The workspace's DocumentQASystem
+        """
+        with self._lock:
+            qa = self._systems.get(name)
+            if qa is None:
+                if not create:
+                    raise KeyError(f"No workspace named {name!r}")
+                qa = self._systems[name] = DocumentQASystem(**self.system_kwargs)
+                self._sizes[name] = 0
+                print(f"🗂️  Created workspace '{name}'")
+            elif name in self._spilled:
+                path = self._spill_path(name)
+                qa.restore(str(path))
+                path.unlink()
+                del self._spilled[name]
+                self.faults += 1
+                print(f"📥 Loaded workspace '{name}' back from disk")
+            self._systems.move_to_end(name)
+            self._enforce_budget(keep=name)
+            return qa
+
+    @contextmanager
+    def use(self, name: str, create: bool = True):
+        """Get a workspace and keep it resident for the duration of the block."""
+        with self._lock:
+            qa = self.get(name, create)
+            self._pins[name] = self._pins.get(name, 0) + 1
+        try:
+            yield qa
+        finally:
+            with self._lock:
+                self._pins[name] -= 1
+                if not self._pins[name]:
+                    del self._pins[name]
+
+    def pin(self, name: str) -> DocumentQASystem:
+        """Keep a workspace resident until unpin() (e.g. while it is watched or served)."""
+        with self._lock:
+            qa = self.get(name)
+            self._pins[name] = self._pins.get(name, 0) + 1
+            return qa
+
+    def unpin(self, name: str):
+        with self._lock:
+            if self._pins.get(name):
+                self._pins[name] -= 1
+                if not self._pins[name]:
+                    del self._pins[name]
+
+    def update_size(self, name: str):
+        """Re-measure a resident workspace after its documents changed, then enforce the budget."""
+        with self._lock:
+            if name in self._systems and name not in self._spilled:
+                self._sizes[name] = self._systems[name].memory_bytes()
+                self._enforce_budget(keep=name)
+
+    def load_document(self, name: str, file_path: str) -> Dict:
+        """Load a document into a workspace (created if needed)."""
+        with self.use(name) as qa:
+            doc = qa.load_document(file_path)
+        self.update_size(name)
+        return doc
+
+    def remove_document(self, name: str, name_or_path: str) -> bool:
+        """Remove a document from a workspace."""
+        with self.use(name, create=False) as qa:
+            removed = qa.remove_document(name_or_path)
+        self.update_size(name)
+        return removed
+
+    def ask_question(self, name: str, question: str, **kwargs) -> Dict:
+        """Ask a question against one workspace's documents only."""
+        with self.use(name, create=False) as qa:
+            return qa.ask_question(question, **kwargs)
+
+    def drop(self, name: str):
+        """Delete a workspace and its spilled copy."""
+        with self._lock:
+            if self._pins.get(name):
+                raise RuntimeError(f"Workspace '{name}' is in use")
+            qa = self._systems.pop(name, None)
+            if qa is None:
+                raise KeyError(f"No workspace named {name!r}")
+            self._sizes.pop(name, None)
+            if self._spilled.pop(name, None) is not None:
+                self._spill_path(name).unlink(missing_ok=True)
+            print(f"🗑️  Dropped workspace '{name}'")
+
+    def close(self):
+        """Close every workspace and delete the on-disk copies of spilled ones (their documents are gone after this)."""
+        with self._lock:
+            for name in self._spilled:
+                self._spill_path(name).unlink(missing_ok=True)
+            for qa in self._systems.values():
+                qa.close()
+            self._spilled.clear()
+            self._systems.clear()
+            self._sizes.clear()
+
+    def resident_bytes(self) -> int:
+        """Estimated memory of the workspaces currently in memory."""
+        with self._lock:
+            return sum(size for name, size in self._sizes.items() if name not in self._spilled)
+
+    def _enforce_budget(self, keep: str = None):
+        """Spill least recently used workspaces until the resident ones fit the budget."""
+        for name in list(self._systems):
+            if self.resident_bytes() <= self.memory_budget:
+                return
+            if name == keep or name in self._spilled or self._pins.get(name):
+                continue
+            self._spill(name)
+        if self.resident_bytes() > self.memory_budget:
+            print(f"⚠️  Workspaces in use need {self.resident_bytes() / 1e6:.0f} MB, "
+                  f"over the {self.memory_budget / 1e6:.0f} MB budget")
+
+    def _spill(self, name: str):
+        qa = self._systems[name]
+        counts = {'documents': len(qa.documents), 'chunks': qa.chunk_count}
+        qa.spill(str(self._spill_path(name)))
+        self._spilled[name] = counts
+        self.spills += 1
+        print(f"💤 Spilled workspace '{name}' to disk ({self._sizes[name] / 1e6:.1f} MB)")
+
+    def stats(self) -> List[Dict]:
+        """Per workspace: resident or on disk, estimated MB, documents and chunks."""
+        with self._lock:
+            rows = []
+            for name, qa in self._systems.items():
+                spilled = self._spilled.get(name)
+                rows.append({
+                    'name': name,
+                    'resident': spilled is None,
+                    'mb': self._sizes[name] / 1e6,
+                    'documents': spilled['documents'] if spilled else len(qa.documents),
+                    'chunks': spilled['chunks'] if spilled else qa.chunk_count,
+                })
+            return rows
+
+    def summary(self) -> str:
+        """Workspace table for printing (most recently used last)."""
+        lines = [f"🗂️  Workspaces ({self.resident_bytes() / 1e6:.1f} of "
+                 f"{self.memory_budget / 1e6:.0f} MB resident)"]
+        for row in self.stats():
+            where = "memory" if row['resident'] else "disk"
+            lines.append(f"   {row['name']:<20}{where:<8}{row['mb']:>8.1f} MB"
+                         f"{row['documents']:>6} docs{row['chunks']:>8} chunks")
+        return "\n".join(lines)